@@ -2,8 +2,25 @@ import gradio as gr
 import cv2
 import numpy as np
 from PIL import Image
-from ultralytics import YOLO
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Make the shared live pipeline (repo root) importable when run from this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import LIVE_SETTINGS
+from live_pipeline import LivePipeline, ModelCadence, draw_detections, draw_result_ages
+from live_sessions import LiveSessionManager
+from live_stream import browser_camera_html, create_stream_router, launch_with_stream, stream_html
+from health import create_health_router
+from hot_reload import enable_hot_reload
+from model_registry import shared_model
+from cpu_budget import apply_cpu_plan
+from readiness import report, warm_up
+
+# Thread counts (and cores) planned by launch_all.py, set before the models load
+apply_cpu_plan()
+report("started")
 
 # Paths to models (using dynamic path resolution)
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,100 +39,131 @@ def load_models():
         if not os.path.exists(path):
             raise FileNotFoundError(f"❌ Model file not found at {path}")
         try:
-            models[name] = YOLO(path)
+            models[name] = shared_model(path)
             print(f"✅ {name} model loaded successfully!")
         except Exception as e:
             raise RuntimeError(f"❌ Error loading {name} model: {e}")
     return models
 
 models = load_models()
+report("models_loaded")
+warm_up(*models.values())
 
 # Function to run combined predictions
 def predict(image):
+    """Run all models concurrently, yielding the partial overlay as each one finishes"""
     try:
         print("🔄 Running YOLO detections on all models...")
         img_array = np.array(image.convert('RGB'))  # Convert PIL image to numpy array
+        source_array = img_array.copy()  # Models see the clean image, boxes go on img_array
         
         detected_objects = 0
+        model_counts = {}
 
-        for model_name, model in models.items():
-            results = model(img_array)  # Perform inference
+        with ThreadPoolExecutor(max_workers=len(models)) as executor:
+            futures = {executor.submit(model, source_array): model_name for model_name, model in models.items()}
 
-            for result in results:
-                print(f"📸 {model_name} detected {len(result.boxes)} objects")
-                
-                for box in result.boxes:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    confidence = float(box.conf[0]) if box.conf is not None else 0
-                    cls_index = int(box.cls[0]) if box.cls is not None else -1
-
-                    if confidence < 0.4 or cls_index == -1:
-                        print(f"⚠️ Low confidence ({confidence:.2f}) - Skipping detection")
-                        continue
+            for future in as_completed(futures):
+                model_name = futures[future]
+                model = models[model_name]
+                results = future.result()
+                model_counts[model_name] = 0
 
-                    label = model.names[cls_index] if hasattr(model, "names") and cls_index in model.names else f"Class_{cls_index}"
-                    
-                    print(f"✅ {model_name} detected: {label} ({confidence:.2f}) at [{x1}, {y1}, {x2}, {y2}]")
-                    detected_objects += 1
+                for result in results:
+                    print(f"📸 {model_name} detected {len(result.boxes)} objects")
                     
-                    # Draw bounding box & label on image
-                    color = (0, 255, 0) if model_name == "LTV_HTV" else (255, 0, 0) if model_name == "Traffic_Light" else (0, 0, 255)
-                    cv2.rectangle(img_array, (x1, y1), (x2, y2), color, 3)
-                    label_text = f"{label} {confidence:.2f}"
-                    cv2.putText(img_array, label_text, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2, cv2.LINE_AA)
+                    for box in result.boxes:
+                        x1, y1, x2, y2 = map(int, box.xyxy[0])
+                        confidence = float(box.conf[0]) if box.conf is not None else 0
+                        cls_index = int(box.cls[0]) if box.cls is not None else -1
+
+                        if confidence < 0.4 or cls_index == -1:
+                            print(f"⚠️ Low confidence ({confidence:.2f}) - Skipping detection")
+                            continue
+
+                        label = model.names[cls_index] if hasattr(model, "names") and cls_index in model.names else f"Class_{cls_index}"
+                        
+                        print(f"✅ {model_name} detected: {label} ({confidence:.2f}) at [{x1}, {y1}, {x2}, {y2}]")
+                        detected_objects += 1
+                        model_counts[model_name] += 1
+                        
+                        # Draw bounding box & label on image
+                        color = (0, 255, 0) if model_name == "LTV_HTV" else (255, 0, 0) if model_name == "Traffic_Light" else (0, 0, 255)
+                        cv2.rectangle(img_array, (x1, y1), (x2, y2), color, 3)
+                        label_text = f"{label} {confidence:.2f}"
+                        cv2.putText(img_array, label_text, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2, cv2.LINE_AA)
+
+                summary = f"⏳ {len(model_counts)}/{len(models)} models finished\n" if len(model_counts) < len(models) else ""
+                summary += f"✅ Total Detections: {detected_objects}\n"
+                summary += "\n".join(f"{name}: {count}" for name, count in model_counts.items())
+                
+                # Copy so the next model doesn't draw onto an image that is still being sent
+                yield Image.fromarray(img_array.copy()), summary
 
         if detected_objects == 0:
             print("🚫 No objects detected!")
-
-        result_image = Image.fromarray(img_array)
-        return result_image
     except Exception as e:
         print(f"❌ Error during prediction: {e}")
-        return None
-
-# Flag to control camera feed
-stop_camera = False
-
-def process_camera_feed():
-    global stop_camera
-    stop_camera = False
-    cap = cv2.VideoCapture(0)
-    
-    if not cap.isOpened():
-        raise RuntimeError("⚠️ Camera not working!")
-    
-    while not stop_camera:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        for model_name, model in models.items():
-            results = model(frame)
-
-            for result in results:
-                for box in result.boxes:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    confidence = float(box.conf[0]) if box.conf is not None else 0
-                    cls_index = int(box.cls[0]) if box.cls is not None else -1
-
-                    if confidence < 0.7 or cls_index == -1:
-                        continue
-
-                    label = model.names[cls_index] if hasattr(model, "names") and cls_index in model.names else f"Class_{cls_index}"
-                    
-                    color = (0, 255, 0) if model_name == "LTV_HTV" else (255, 0, 0) if model_name == "Traffic_Light" else (0, 0, 255)
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 3)
-                    label_text = f"{label} {confidence:.2f}"
-                    cv2.putText(frame, label_text, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2, cv2.LINE_AA)
-
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        yield Image.fromarray(frame_rgb)
-    
-    cap.release()
-
-def stop_camera_feed():
-    global stop_camera
-    stop_camera = True
+        yield None, f"❌ Error: {e}"
+
+# Live camera sessions: one per browser tab, all reading one shared capture
+live_sessions = LiveSessionManager()
+
+# Live overlay colors per model (BGR, camera frames come straight from OpenCV)
+LIVE_COLORS = {"LTV_HTV": (0, 255, 0), "Traffic_Light": (255, 0, 0)}
+
+def detect_model(model_name, frame):
+    """Run one model on a camera frame and return its confident detections"""
+    model = models[model_name]
+    detections = []
+    for result in model(frame):
+        for box in result.boxes:
+            x1, y1, x2, y2 = map(int, box.xyxy[0])
+            confidence = float(box.conf[0]) if box.conf is not None else 0
+            cls_index = int(box.cls[0]) if box.cls is not None else -1
+
+            if confidence < 0.7 or cls_index == -1:
+                continue
+
+            label = model.names[cls_index] if hasattr(model, "names") and cls_index in model.names else f"Class_{cls_index}"
+            detections.append({"box": [x1, y1, x2, y2], "label": label, "confidence": confidence, "model": model_name})
+    return detections
+
+def render_frame(frame, detections, ages):
+    """Draw detections plus per-model result age on the BGR frame (JPEG-encoded by the live stream)"""
+    draw_detections(frame, detections, (0, 0, 255), colors=LIVE_COLORS)
+    return draw_result_ages(frame, ages, (0, 0, 255), colors=LIVE_COLORS)
+
+def process_camera_feed(session):
+    """Annotated frames for one live session, served as MJPEG by /live/stream.mjpg"""
+    # Each model runs at its own rate; models that aren't due keep their last result
+    cadence = ModelCadence({name: LIVE_SETTINGS["model_cadence"].get(name, 1) for name in models})
+
+    def detect_frame(frame):
+        for model_name in cadence.next_frame():
+            cadence.update(model_name, detect_model(model_name, frame))
+        return cadence.detections()
+
+    # Capture, inference and rendering run as separate stages so the camera never stalls.
+    # The cadence scheduler replaces the all-models keyframe tracker for this feed, and
+    # region-only inference is off because the cadence holds full-frame results.
+    pipeline = LivePipeline(session.open_capture, detect_frame,
+                            lambda frame, detections: render_frame(frame, detections, cadence.ages()),
+                            session=session, tracking=False, motion_regions=False)
+    yield from pipeline.run()
+
+def start_camera_feed(request: gr.Request):
+    # The tab just embeds the MJPEG stream; frames never go through Gradio image updates
+    return stream_html(request.session_hash)
+
+def start_browser_camera(request: gr.Request):
+    # The viewer's own webcam, streamed from the browser to /live/ws
+    return browser_camera_html(request.session_hash)
+
+def stop_camera_feed(request: gr.Request):
+    # Only the caller's own stream stops; other users keep streaming
+    live_sessions.stop(request.session_hash)
+    return ""
 
 # Gradio interface
 with gr.Blocks() as demo:
@@ -123,15 +171,24 @@ with gr.Blocks() as demo:
     with gr.Tab("📷 Upload Image"):
         upload_box = gr.Image(label="Upload Image", type="pil")
         output_image = gr.Image(label="Detection Result", type="pil")
-        upload_box.change(predict, inputs=upload_box, outputs=output_image)
+        output_summary = gr.Textbox(label="Detection Summary", lines=6)
+        upload_box.change(predict, inputs=upload_box, outputs=[output_image, output_summary])
     
     with gr.Tab("📹 Live Camera"):
-        camera_output = gr.Image(label="Live Detection")
+        camera_output = gr.HTML(label="Live Detection")
         start_button = gr.Button("Start Camera")
+        browser_button = gr.Button("Use Browser Camera")
         stop_button = gr.Button("Stop Camera")
         
-        start_button.click(process_camera_feed, outputs=camera_output, show_progress=False)
-        stop_button.click(stop_camera_feed)
-
-# Launch the app
-demo.launch(server_port=7868, share=True)
+        start_button.click(start_camera_feed, outputs=camera_output, show_progress=False)
+        browser_button.click(start_browser_camera, outputs=camera_output, show_progress=False)
+        stop_button.click(stop_camera_feed, outputs=camera_output, show_progress=False)
+    
+    # Closing or reloading the tab ends that user's stream right away
+    demo.unload(stop_camera_feed)
+
+# Launch the app (importing the script, e.g. from benchmark_live.py, only builds it)
+if __name__ == "__main__":
+    launch_with_stream(demo, create_stream_router(live_sessions, process_camera_feed),
+                       create_health_router(models, live_sessions), enable_hot_reload(models),
+                       server_port=7868, share=True)
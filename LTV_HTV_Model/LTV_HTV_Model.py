@@ -2,8 +2,23 @@ import gradio as gr
 import cv2
 import numpy as np
 from PIL import Image
-from ultralytics import YOLO
 import os
+import sys
+
+# Make the shared live pipeline (repo root) importable when run from this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from live_pipeline import LivePipeline, draw_detections
+from live_sessions import LiveSessionManager
+from live_stream import browser_camera_html, create_stream_router, launch_with_stream, stream_html
+from health import create_health_router
+from hot_reload import enable_hot_reload
+from model_registry import shared_model
+from cpu_budget import apply_cpu_plan
+from readiness import report, warm_up
+
+# Thread counts (and cores) planned by launch_all.py, set before the models load
+apply_cpu_plan()
+report("started")
 
 # Load YOLO model
 def load_model():
@@ -15,13 +30,15 @@ def load_model():
         raise FileNotFoundError(f"❌ Model file not found at {model_path}")
     
     try:
-        model = YOLO(model_path)
+        model = shared_model(model_path)
         print("✅ Model loaded successfully!")
         return model
     except Exception as e:
         raise RuntimeError(f"❌ Error loading model: {e}")
 
 model = load_model()
+report("models_loaded")
+warm_up(model)
 
 # Function to perform inference on an image
 def predict(image):
@@ -68,50 +85,51 @@ def predict(image):
         print(f"❌ Error during prediction: {e}")
         return None
 
-# Flag to control camera feed
-stop_camera = False
+# Live camera sessions: one per browser tab, all reading one shared capture
+live_sessions = LiveSessionManager()
 
-def process_camera_feed():
-    global stop_camera
-    stop_camera = False
-    cap = cv2.VideoCapture(0)
-    
-    if not cap.isOpened():
-        raise RuntimeError("⚠️ Camera not working!")
-    
-    while not stop_camera:
-        ret, frame = cap.read()
-        if not ret:
-            break
+def detect_frame(frame):
+    """Run the model on one camera frame and return the confident detections"""
+    detections = []
+    for result in model(frame):
+        for box in result.boxes:
+            x1, y1, x2, y2 = map(int, box.xyxy[0])
+            confidence = float(box.conf[0]) if box.conf is not None else 0
+            cls_index = int(box.cls[0]) if box.cls is not None else -1
 
-        results = model(frame)
-        
-        for result in results:
-            for box in result.boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                confidence = float(box.conf[0]) if box.conf is not None else 0
-                cls_index = int(box.cls[0]) if box.cls is not None else -1
+            if confidence < 0.7 or cls_index == -1:
+                continue
 
-                if confidence < 0.7 or cls_index == -1:
-                    continue
+            if hasattr(model, "names") and cls_index in model.names:
+                label = model.names[cls_index]
+            else:
+                label = f"Class_{cls_index}"
 
-                if hasattr(model, "names") and cls_index in model.names:
-                    label = model.names[cls_index]
-                else:
-                    label = f"Class_{cls_index}"
+            detections.append({"box": [x1, y1, x2, y2], "label": label, "confidence": confidence})
+    return detections
 
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 3)
-                label_text = f"{label} {confidence:.2f}"
-                cv2.putText(frame, label_text, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2, cv2.LINE_AA)
+def render_frame(frame, detections):
+    """Draw detections on the BGR frame (JPEG-encoded by the live stream)"""
+    return draw_detections(frame, detections, (0, 255, 0))
 
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        yield Image.fromarray(frame_rgb)
-    
-    cap.release()
+def process_camera_feed(session):
+    """Annotated frames for one live session, served as MJPEG by /live/stream.mjpg"""
+    # Capture, inference and rendering run as separate stages so the camera never stalls
+    pipeline = LivePipeline(session.open_capture, detect_frame, render_frame, session=session)
+    yield from pipeline.run()
+
+def start_camera_feed(request: gr.Request):
+    # The tab just embeds the MJPEG stream; frames never go through Gradio image updates
+    return stream_html(request.session_hash)
 
-def stop_camera_feed():
-    global stop_camera
-    stop_camera = True
+def start_browser_camera(request: gr.Request):
+    # The viewer's own webcam, streamed from the browser to /live/ws
+    return browser_camera_html(request.session_hash)
+
+def stop_camera_feed(request: gr.Request):
+    # Only the caller's own stream stops; other users keep streaming
+    live_sessions.stop(request.session_hash)
+    return ""
 
 # Gradio interface
 with gr.Blocks() as demo:
@@ -122,12 +140,20 @@ with gr.Blocks() as demo:
         upload_box.change(predict, inputs=upload_box, outputs=output_image)
     
     with gr.Tab("📹 Live Camera"):
-        camera_output = gr.Image(label="Live Detection")
+        camera_output = gr.HTML(label="Live Detection")
         start_button = gr.Button("Start Camera")
+        browser_button = gr.Button("Use Browser Camera")
         stop_button = gr.Button("Stop Camera")
         
-        start_button.click(process_camera_feed, outputs=camera_output, show_progress=False)
-        stop_button.click(stop_camera_feed)
+        start_button.click(start_camera_feed, outputs=camera_output, show_progress=False)
+        browser_button.click(start_browser_camera, outputs=camera_output, show_progress=False)
+        stop_button.click(stop_camera_feed, outputs=camera_output, show_progress=False)
+    
+    # Closing or reloading the tab ends that user's stream right away
+    demo.unload(stop_camera_feed)
 
-# Launch the app
-demo.launch( server_port=7860, share=True)
+# Launch the app (importing the script, e.g. from benchmark_live.py, only builds it)
+if __name__ == "__main__":
+    launch_with_stream(demo, create_stream_router(live_sessions, process_camera_feed),
+                       create_health_router({"LTV_HTV": model}, live_sessions), enable_hot_reload({"LTV_HTV": model}),
+                       server_port=7860, share=True)
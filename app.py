@@ -10,9 +10,30 @@ import gradio as gr
 import cv2
 import numpy as np
 from PIL import Image
-from ultralytics import YOLO
 import os
-from pathlib import Path
+import json
+import time
+import shutil
+import tempfile
+import threading
+import zipfile
+from pathlib import Path, PurePosixPath
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fastapi import FastAPI
+import uvicorn
+
+from config import (API_SETTINGS, MODEL_FILES, MULTI_STREAM_SETTINGS, RESULT_FILES_SETTINGS,
+                    TRAFFIC_SIGN_TRANSLATIONS)
+from inference_api import create_api_router, detect_batch
+from video_processing import VIDEO_COLORS, draw_frame_detections, format_progress, process_video
+from multi_stream import MultiStreamEngine, format_report
+from live_pipeline import LivePipeline
+from live_sessions import LiveSessionManager
+from live_stream import browser_camera_html, create_stream_router
+from health import create_health_router
+from hot_reload import enable_hot_reload
+from model_registry import shared_model
+from readiness import report, warm_up
 
 # ============================================================================
 # MODEL LOADING
@@ -23,19 +44,14 @@ print("🚀 Loading Autopilot Pro models...")
 base_dir = Path(__file__).parent
 
 # Model paths
-MODEL_PATHS = {
-    "LTV_HTV": base_dir / "LTV_HTV_Model" / "LTV_HTV.pt",
-    "Pedestrian": base_dir / "Pedestrian_Model" / "last.pt",
-    "TrafficLight": base_dir / "Traffic_Light_Model" / "epoch70.pt",
-    "TrafficSign": base_dir / "TRAFFIC_SIGN_MODEL" / "trafic.pt",
-}
+MODEL_PATHS = {name: base_dir / path for name, path in MODEL_FILES.items()}
 
 # Load all models
 models = {}
 for name, path in MODEL_PATHS.items():
     if path.exists():
         try:
-            models[name] = YOLO(str(path))
+            models[name] = shared_model(str(path))
             print(f"✅ {name} model loaded")
         except Exception as e:
             print(f"❌ Error loading {name}: {e}")
@@ -44,21 +60,13 @@ for name, path in MODEL_PATHS.items():
         print(f"⚠️  {name} model not found at {path}")
         models[name] = None
 
-# Traffic sign translations
-TRAFFIC_SIGN_TRANSLATIONS = {
-    "20": "Speed Limit 20", "30": "Speed Limit 30",
-    "dur": "Stop", "durak": "Bus Stop",
-    "girisyok": "No Entry", "ilerisag": "Go Straight & Turn Right",
-    "ilerisol": "Go Straight & Turn Left", "kirmizi": "Red Light",
-    "park": "Parking", "parkyasak": "No Parking",
-    "sag": "Right", "sagadonulmez": "No Right Turn",
-    "sari": "Yellow Light", "sol": "Left",
-    "soladonulmez": "No Left Turn", "yesil": "Green Light",
-    "parkyasak2": "No Parking (Variant)", "arac": "Vehicle",
-    "yaya": "Pedestrian", "otobus": "Bus",
-    "bisikletli": "Cyclist", "yapılar": "Buildings",
-    "yayagecidi": "Pedestrian Crossing", "tasitrafiginekapali": "Closed to Vehicle Traffic"
-}
+# One lock per model: the UI tabs and the headless API share the same model objects.
+# It is the model's own (re-entrant) lock, so /readyz sees everyone queued for it
+model_locks = {name: models[name].lock if models[name] is not None else threading.Lock() for name in MODEL_PATHS}
+
+# First inference (lazy init, layer fusion) now rather than on a user's request; also marks the models warm
+report("models_loaded")
+warm_up(*[model for model in models.values() if model is not None])
 
 # ============================================================================
 # INFERENCE FUNCTIONS
@@ -71,7 +79,8 @@ def run_inference(image, model_name, confidence_threshold=0.4, color=(0, 255, 0)
     
     try:
         img_array = np.array(image.convert('RGB'))
-        results = models[model_name](img_array)
+        with model_locks[model_name]:
+            results = models[model_name](img_array)
         
         detected_count = 0
         detection_info = []
@@ -110,67 +119,97 @@ def run_inference(image, model_name, confidence_threshold=0.4, color=(0, 255, 0)
     except Exception as e:
         return image, f"❌ Error: {str(e)}"
 
+# Per-model overlay colors and icons for the combined view
+COMBINED_COLORS = {
+    "LTV_HTV": (0, 255, 0),      # Green
+    "Pedestrian": (255, 0, 0),   # Red
+    "TrafficLight": (0, 165, 255),  # Orange
+    "TrafficSign": (255, 0, 255)  # Magenta
+}
+
+MODEL_ICONS = {"LTV_HTV": "🚙", "Pedestrian": "🚶", "TrafficLight": "🚦", "TrafficSign": "🚸"}
+
+def format_combined_summary(total_detections, detection_summary, finished, pending):
+    """Build the multi-model summary text, including models still running"""
+    if pending:
+        summary_text = f"⏳ {finished}/{finished + len(pending)} models finished\n"
+    elif total_detections == 0:
+        return "No objects detected"
+    else:
+        summary_text = ""
+    
+    summary_text += f"✅ Total Detections: {total_detections}\n\n"
+    for model_name, count in detection_summary.items():
+        summary_text += f"{MODEL_ICONS.get(model_name, '📦')} {model_name}: {count}\n"
+    for model_name in pending:
+        summary_text += f"{MODEL_ICONS.get(model_name, '📦')} {model_name}: running...\n"
+    return summary_text
+
+def locked_predict(model_name, img_array):
+    """Run a model while holding its lock"""
+    with model_locks[model_name]:
+        return models[model_name](img_array)
+
 def run_combined_inference(image, confidence_threshold=0.4):
-    """Run all models on the same image"""
+    """Run all models on the same image, yielding a partial result as each model finishes"""
     if not any(models.values()):
-        return image, "❌ No models loaded"
+        yield image, "❌ No models loaded"
+        return
     
     try:
         img_array = np.array(image.convert('RGB'))
+        # Every model sees the clean frame; boxes are drawn on a separate canvas
+        source_array = img_array.copy()
         total_detections = 0
         detection_summary = {}
         
-        colors = {
-            "LTV_HTV": (0, 255, 0),      # Green
-            "Pedestrian": (255, 0, 0),   # Red
-            "TrafficLight": (0, 165, 255),  # Orange
-            "TrafficSign": (255, 0, 255)  # Magenta
-        }
+        active_models = {name: model for name, model in models.items() if model is not None}
+        pending = list(active_models)
         
-        for model_name, model in models.items():
-            if model is None:
-                continue
-            
-            results = model(img_array)
-            model_detections = []
+        # Run the detectors concurrently so fast models are drawn without waiting on slow ones
+        with ThreadPoolExecutor(max_workers=len(active_models)) as executor:
+            futures = {executor.submit(locked_predict, name, source_array): name for name in active_models}
             
-            for result in results:
-                for box in result.boxes:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    confidence = float(box.conf[0]) if box.conf is not None else 0
-                    cls_index = int(box.cls[0]) if box.cls is not None else -1
-                    
-                    if confidence < confidence_threshold or cls_index == -1:
-                        continue
-                    
-                    label = model.names[cls_index] if hasattr(model, "names") and cls_index in model.names else f"Class_{cls_index}"
-                    
-                    if model_name == "TrafficSign":
-                        label = TRAFFIC_SIGN_TRANSLATIONS.get(label, label)
-                    
-                    total_detections += 1
-                    model_detections.append(label)
-                    
-                    # Draw with model-specific color
-                    color = colors.get(model_name, (0, 255, 0))
-                    cv2.rectangle(img_array, (x1, y1), (x2, y2), color, 3)
-                    cv2.putText(img_array, f"{label} {confidence:.2f}", (x1, y1 - 10),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2, cv2.LINE_AA)
-            
-            if model_detections:
-                detection_summary[model_name] = len(model_detections)
-        
-        result_image = Image.fromarray(img_array)
-        
-        summary_text = f"✅ Total Detections: {total_detections}\n\n"
-        for model_name, count in detection_summary.items():
-            icon = {"LTV_HTV": "🚙", "Pedestrian": "🚶", "TrafficLight": "🚦", "TrafficSign": "🚸"}.get(model_name, "📦")
-            summary_text += f"{icon} {model_name}: {count}\n"
-        
-        return result_image, summary_text if total_detections > 0 else "No objects detected"
+            for future in as_completed(futures):
+                model_name = futures[future]
+                model = active_models[model_name]
+                pending.remove(model_name)
+                model_detections = []
+                
+                for result in future.result():
+                    for box in result.boxes:
+                        x1, y1, x2, y2 = map(int, box.xyxy[0])
+                        confidence = float(box.conf[0]) if box.conf is not None else 0
+                        cls_index = int(box.cls[0]) if box.cls is not None else -1
+                        
+                        if confidence < confidence_threshold or cls_index == -1:
+                            continue
+                        
+                        label = model.names[cls_index] if hasattr(model, "names") and cls_index in model.names else f"Class_{cls_index}"
+                        
+                        if model_name == "TrafficSign":
+                            label = TRAFFIC_SIGN_TRANSLATIONS.get(label, label)
+                        
+                        total_detections += 1
+                        model_detections.append(label)
+                        
+                        # Draw with model-specific color
+                        color = COMBINED_COLORS.get(model_name, (0, 255, 0))
+                        cv2.rectangle(img_array, (x1, y1), (x2, y2), color, 3)
+                        cv2.putText(img_array, f"{label} {confidence:.2f}", (x1, y1 - 10),
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2, cv2.LINE_AA)
+                
+                if model_detections:
+                    detection_summary[model_name] = len(model_detections)
+                
+                finished = len(active_models) - len(pending)
+                # Copy so later models don't draw onto an image Gradio is still sending
+                yield Image.fromarray(img_array.copy()), format_combined_summary(
+                    total_detections, detection_summary, finished, pending
+                )
     
     except Exception as e:
-        return image, f"❌ Error: {str(e)}"
+        yield image, f"❌ Error: {str(e)}"
 
 # ============================================================================
 # INDIVIDUAL MODEL INTERFACES
@@ -189,7 +228,281 @@ def traffic_sign_detect(image, confidence):
     return run_inference(image, "TrafficSign", confidence, (255, 0, 255))
 
 def combined_detect(image, confidence):
-    return run_combined_inference(image, confidence)
+    yield from run_combined_inference(image, confidence)
+
+# ============================================================================
+# BATCH PROCESSING
+# ============================================================================
+
+BATCH_ALL_MODELS = "All Models"
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+# Batch and video runs write under here, one folder per run and tab
+RESULTS_ROOT = Path(tempfile.gettempdir()) / "autopilot_results"
+_active_runs = set()
+_runs_lock = threading.Lock()
+
+def new_run_dir(kind: str) -> Path:
+    """Work folder for a new run; deletes the oldest finished runs beyond keep_runs"""
+    root = RESULTS_ROOT / kind
+    root.mkdir(parents=True, exist_ok=True)
+    with _runs_lock:
+        finished = sorted((path for path in root.iterdir() if path.is_dir() and path not in _active_runs),
+                          key=lambda path: path.stat().st_mtime)
+        for path in finished[:max(len(finished) - RESULT_FILES_SETTINGS["keep_runs"] + 1, 0)]:
+            shutil.rmtree(path, ignore_errors=True)
+        run_dir = Path(tempfile.mkdtemp(dir=root))
+        _active_runs.add(run_dir)
+    return run_dir
+
+def finish_run_dir(run_dir: Path, keep: bool):
+    """Keep a finished run's results for download, or delete a failed / cancelled run"""
+    with _runs_lock:
+        _active_runs.discard(run_dir)
+    if not keep:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+def collect_batch_images(files, work_dir):
+    """Expand uploaded images and zip archives into a sorted list of image paths"""
+    image_paths = []
+    for index, file in enumerate(files or []):
+        path = Path(getattr(file, "name", file))
+        if path.suffix.lower() == ".zip":
+            # Indexed, so two uploads called e.g. photos.zip don't share a folder
+            extract_dir = work_dir / "input" / f"{index}_{path.stem}"
+            with zipfile.ZipFile(path) as archive:
+                for member in archive.infolist():
+                    # Keep the member's folders (a/001.jpg and b/001.jpg are different images),
+                    # minus anything that could escape extract_dir (.., roots, drive letters)
+                    parts = [part for part in PurePosixPath(member.filename.replace("\\", "/")).parts
+                             if part not in ("/", ".", "..") and ":" not in part]
+                    if member.is_dir() or not parts or Path(parts[-1]).suffix.lower() not in IMAGE_EXTENSIONS:
+                        continue
+                    target = extract_dir.joinpath(*parts)
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    with archive.open(member) as src, open(target, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    image_paths.append(target)
+        elif path.suffix.lower() in IMAGE_EXTENSIONS:
+            image_paths.append(path)
+    return sorted(image_paths)
+
+def run_batch_inference(files, model_choice, confidence_threshold=0.4):
+    """Run many images through the batched detection path, streaming progress"""
+    model_names = list(models) if model_choice == BATCH_ALL_MODELS else [model_choice]
+    model_names = [name for name in model_names if models.get(name) is not None]
+    if not model_names:
+        yield [], None, "❌ Model not loaded"
+        return
+    
+    work_dir = new_run_dir("batch")
+    finished = False
+    try:
+        for update in batch_inference_steps(files, model_names, confidence_threshold, work_dir):
+            finished = update[1] is not None      # only the final update carries the archive
+            yield update
+    finally:
+        # The extracted uploads are no longer needed; the annotated images and archive are
+        shutil.rmtree(work_dir / "input", ignore_errors=True)
+        finish_run_dir(work_dir, keep=finished)
+
+def batch_inference_steps(files, model_names, confidence_threshold, work_dir):
+    """run_batch_inference's updates; the last one carries the results archive"""
+    image_paths = collect_batch_images(files, work_dir)
+    if not image_paths:
+        yield [], None, "❌ No images found (supported: jpg, png, bmp, webp or a .zip of them)"
+        return
+    
+    output_dir = work_dir / "annotated"
+    output_dir.mkdir()
+    batch_size = API_SETTINGS["max_batch_size"]
+    gallery = []
+    total_detections = 0
+    start_time = time.perf_counter()
+    
+    with open(output_dir / "detections.jsonl", "w", encoding="utf-8") as log:
+        # Decode one chunk at a time so memory stays flat however many files are uploaded
+        for start in range(0, len(image_paths), batch_size):
+            chunk_paths = image_paths[start:start + batch_size]
+            chunk = [cv2.imread(str(path)) for path in chunk_paths]
+            readable = [(path, img) for path, img in zip(chunk_paths, chunk) if img is not None]
+            images = [img for _, img in readable]
+            per_image = [dict() for _ in readable]
+            
+            for model_name in model_names:
+                translate = (lambda label: TRAFFIC_SIGN_TRANSLATIONS.get(label, label)) if model_name == "TrafficSign" else None
+                with model_locks[model_name]:
+                    batch = detect_batch(models[model_name], images, confidence_threshold,
+                                         translate=translate, batch_size=batch_size)
+                for detections, image_detections in zip(batch, per_image):
+                    image_detections[model_name] = detections
+            
+            for (path, img), image_detections in zip(readable, per_image):
+                for model_name, detections in image_detections.items():
+                    # Images are BGR here, overlay colors are RGB
+                    color = COMBINED_COLORS.get(model_name, (0, 255, 0))[::-1]
+                    for det in detections:
+                        x1, y1, x2, y2 = det["box"]
+                        cv2.rectangle(img, (x1, y1), (x2, y2), color, 3)
+                        cv2.putText(img, f"{det['label']} {det['confidence']:.2f}", (x1, y1 - 10),
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2, cv2.LINE_AA)
+                    total_detections += len(detections)
+                
+                out_path = output_dir / f"{len(gallery):04d}_{path.stem}.jpg"
+                cv2.imwrite(str(out_path), img)
+                gallery.append((str(out_path), path.name))
+                log.write(json.dumps({"image": path.name, "detections": image_detections}) + "\n")
+            
+            done = min(start + batch_size, len(image_paths))
+            elapsed = max(time.perf_counter() - start_time, 1e-6)
+            yield gallery, None, f"⏳ Processed {done}/{len(image_paths)} images ({done / elapsed:.1f} img/s)"
+    
+    elapsed = max(time.perf_counter() - start_time, 1e-6)
+    archive_path = shutil.make_archive(str(work_dir / "autopilot_batch_results"), "zip", output_dir)
+    skipped = len(image_paths) - len(gallery)
+    
+    status = (f"✅ Processed {len(gallery)} images in {elapsed:.1f}s\n"
+              f"⚡ Throughput: {len(gallery) / elapsed:.2f} images/sec\n"
+              f"📦 Total Detections: {total_detections}")
+    if skipped:
+        status += f"\n⚠️ Skipped {skipped} unreadable files"
+    yield gallery, archive_path, status
+
+# ============================================================================
+# VIDEO PROCESSING
+# ============================================================================
+
+def run_video_inference(video, model_choice, confidence_threshold=0.4):
+    """Stream a dash-cam video through the chosen models, reporting progress as it goes"""
+    model_names = list(models) if model_choice == BATCH_ALL_MODELS else [model_choice]
+    selected = {name: models[name] for name in model_names if models.get(name) is not None}
+    if not selected:
+        yield None, None, "❌ Model not loaded"
+        return
+    if not video:
+        yield None, None, "❌ Please upload a video"
+        return
+    
+    output_dir = new_run_dir("video")
+    finished = False
+    try:
+        for update in video_inference_steps(video, selected, confidence_threshold, output_dir):
+            finished = update[0] is not None      # only the final update carries the video
+            yield update
+    finally:
+        finish_run_dir(output_dir, keep=finished)
+
+def video_inference_steps(video, selected, confidence_threshold, output_dir):
+    """run_video_inference's updates; the last one carries the annotated video and log"""
+    try:
+        for report in process_video(video, selected, output_dir, confidence_threshold,
+                                    locks=model_locks, colors=VIDEO_COLORS):
+            if not report["done"]:
+                yield None, None, f"⏳ {format_progress(report)}"
+    except ValueError as e:
+        yield None, None, f"❌ {e}"
+        return
+    
+    status = (f"✅ Processed {report['frames']} frames in {report['elapsed']:.1f}s\n"
+              f"⚡ Throughput: {report['fps']:.2f} frames/sec\n"
+              f"📦 Total Detections: {report['detections']}")
+    yield report["video"], [report["video"], report["log"]], status
+
+# ============================================================================
+# MULTI-CAMERA LIVE
+# ============================================================================
+
+def resolve_multi_source(choice):
+    """Source for a Multi-Camera pick: a configured name, or free text when allow_custom_sources is on"""
+    ui_sources = MULTI_STREAM_SETTINGS["ui_sources"]
+    if choice in ui_sources:
+        source = ui_sources[choice]
+        if isinstance(source, str) and (base_dir / source).exists():
+            source = str(base_dir / source)
+        return source
+    if MULTI_STREAM_SETTINGS["allow_custom_sources"]:
+        return choice
+    raise ValueError(f"❌ Unknown source: {choice!r} (add it to MULTI_STREAM_SETTINGS['ui_sources'])")
+
+def run_multi_stream(source_choices, model_choice, confidence_threshold=0.7):
+    """Watch several sources with one batched engine; yields one image per tile plus stats"""
+    tiles = MULTI_STREAM_SETTINGS["max_streams"]
+    choices = [choice.strip() for choice in source_choices or [] if choice and choice.strip()]
+    model_names = list(models) if model_choice == BATCH_ALL_MODELS else [model_choice]
+    selected = {name: models[name] for name in model_names if models.get(name) is not None}
+    if not selected:
+        yield [None] * tiles + ["❌ Model not loaded"]
+        return
+    if not choices or len(choices) > tiles:
+        yield [None] * tiles + [f"❌ Pick between 1 and {tiles} sources"]
+        return
+    try:
+        sources = [resolve_multi_source(choice) for choice in choices]
+    except ValueError as e:
+        yield [None] * tiles + [str(e)]
+        return
+    
+    engine = MultiStreamEngine(sources, selected, confidence_threshold, locks=model_locks)
+    try:
+        engine.start()
+    except RuntimeError as e:
+        yield [None] * tiles + [str(e)]
+        return
+    
+    last_seen = [None] * len(sources)
+    images = [None] * tiles
+    try:
+        while engine.running():
+            time.sleep(1.0 / MULTI_STREAM_SETTINGS["display_fps"])
+            for stream_id in range(len(sources)):
+                result = engine.latest(stream_id)
+                if result is None or result[2] == last_seen[stream_id]:
+                    continue
+                frame, detections, last_seen[stream_id] = result
+                frame = draw_frame_detections(frame.copy(), detections, VIDEO_COLORS)
+                images[stream_id] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            yield images + [format_report(engine.report())]
+        if engine.error:
+            yield images + [f"❌ Streams stopped: {engine.error}\n\n{format_report(engine.report())}"]
+    finally:
+        engine.stop()
+
+# ============================================================================
+# BROWSER CAMERA
+# ============================================================================
+
+# Sessions of the browser camera tab (frames come from the viewer's webcam over /live/ws)
+live_sessions = LiveSessionManager()
+
+def browser_camera_feed(session):
+    """Annotated frames for one browser camera session; the model and threshold come from the page URL"""
+    model_choice = session.options.get("model", BATCH_ALL_MODELS)
+    confidence_threshold = float(session.options.get("conf", 0.7))
+    model_names = list(models) if model_choice == BATCH_ALL_MODELS else [model_choice]
+    selected = {name: models[name] for name in model_names if models.get(name) is not None}
+    if not selected:
+        raise RuntimeError("❌ Model not loaded")
+    
+    def infer(frame):
+        frame_detections = {}
+        for name, model in selected.items():
+            translate = (lambda label: TRAFFIC_SIGN_TRANSLATIONS.get(label, label)) if name == "TrafficSign" else None
+            with model_locks[name]:
+                frame_detections[name] = detect_batch(model, [frame], confidence_threshold, translate=translate)[0]
+        return frame_detections
+    
+    # Detections are grouped per model, which the tracker and region inference don't handle
+    pipeline = LivePipeline(session.open_capture, infer,
+                            lambda frame, detections: draw_frame_detections(frame, detections, VIDEO_COLORS),
+                            session=session, tracking=False, motion_gate=False)
+    yield from pipeline.run()
+
+def start_browser_camera(model_choice, confidence_threshold, request: gr.Request):
+    return browser_camera_html(request.session_hash, model=model_choice, conf=confidence_threshold)
+
+def stop_browser_camera(request: gr.Request):
+    live_sessions.stop(request.session_hash)
+    return ""
 
 # ============================================================================
 # GRADIO INTERFACE
@@ -1215,20 +1528,223 @@ with gr.Blocks(css=custom_css, title="🚗 Autopilot Pro - AI Detection System")
             
             combined_button.click(combined_detect, inputs=[combined_input, combined_confidence], outputs=[combined_output, combined_info])
             combined_input.change(combined_detect, inputs=[combined_input, combined_confidence], outputs=[combined_output, combined_info])
+        
+        # Tab 6: Batch Processing
+        with gr.Tab("📁 Batch Processing"):
+            with gr.Row():
+                gr.Markdown("""
+                <div style='text-align: center; padding: 32px; background: linear-gradient(135deg, #eef2ff 0%, #e0e7ff 100%); border: 2px solid #6366f1; border-radius: 20px; margin-bottom: 28px; box-shadow: 0 8px 24px rgba(99, 102, 241, 0.15);'>
+                    <h2 style='margin: 0; font-size: 32px; color: #3730a3; font-weight: 800; letter-spacing: -0.5px;'>📁 Batch Image Processing</h2>
+                    <p style='margin: 16px 0 0 0; color: #4f46e5; font-size: 16px; font-weight: 500;'>Run a whole folder of dash-cam stills through any model in one go</p>
+                </div>
+                """)
+            
+            with gr.Row():
+                with gr.Column(scale=1):
+                    with gr.Group():
+                        gr.Markdown("### 📤 Upload & Configure")
+                        batch_files = gr.File(
+                            label="Images or .zip archive",
+                            file_count="multiple",
+                            file_types=["image", ".zip"]
+                        )
+                        
+                        with gr.Accordion("⚙️ Detection Settings", open=True):
+                            batch_model = gr.Dropdown(
+                                choices=[BATCH_ALL_MODELS] + list(MODEL_PATHS),
+                                value=BATCH_ALL_MODELS,
+                                label="🤖 Model"
+                            )
+                            batch_confidence = gr.Slider(
+                                0.1, 1.0, value=0.4, 
+                                label="🎯 Confidence Threshold",
+                                info="Applies to every image in the batch"
+                            )
+                        
+                        batch_button = gr.Button("🚀 Process Batch", variant="primary", size="lg")
+                        
+                        with gr.Accordion("📈 Progress", open=True):
+                            batch_info = gr.Textbox(
+                                label="Batch Report",
+                                lines=5,
+                                placeholder="Upload images and click Process Batch..."
+                            )
+                
+                with gr.Column(scale=1):
+                    with gr.Group():
+                        gr.Markdown("### 📊 Annotated Results")
+                        batch_gallery = gr.Gallery(label="Annotated Images", columns=3, height=420)
+                        batch_archive = gr.File(label="📦 Download annotated images + detections.jsonl")
+            
+            batch_button.click(run_batch_inference, inputs=[batch_files, batch_model, batch_confidence], outputs=[batch_gallery, batch_archive, batch_info])
+
+        # Tab 7: Video Processing
+        with gr.Tab("🎬 Video Processing"):
+            with gr.Row():
+                gr.Markdown("""
+                <div style='text-align: center; padding: 32px; background: linear-gradient(135deg, #eef2ff 0%, #e0e7ff 100%); border: 2px solid #6366f1; border-radius: 20px; margin-bottom: 28px; box-shadow: 0 8px 24px rgba(99, 102, 241, 0.15);'>
+                    <h2 style='margin: 0; font-size: 32px; color: #3730a3; font-weight: 800; letter-spacing: -0.5px;'>🎬 Dash-Cam Video Processing</h2>
+                    <p style='margin: 16px 0 0 0; color: #4f46e5; font-size: 16px; font-weight: 500;'>Annotate a recorded drive frame by frame and export a detection log</p>
+                </div>
+                """)
+            
+            with gr.Row():
+                with gr.Column(scale=1):
+                    with gr.Group():
+                        gr.Markdown("### 📤 Upload & Configure")
+                        video_input = gr.Video(label="Dash-cam video", sources=["upload"])
+                        
+                        with gr.Accordion("⚙️ Detection Settings", open=True):
+                            video_model = gr.Dropdown(
+                                choices=[BATCH_ALL_MODELS] + list(MODEL_PATHS),
+                                value=BATCH_ALL_MODELS,
+                                label="🤖 Model"
+                            )
+                            video_confidence = gr.Slider(
+                                0.1, 1.0, value=0.4, 
+                                label="🎯 Confidence Threshold",
+                                info="Applies to every frame of the video"
+                            )
+                        
+                        video_button = gr.Button("🚀 Process Video", variant="primary", size="lg")
+                        
+                        with gr.Accordion("📈 Progress", open=True):
+                            video_info = gr.Textbox(
+                                label="Video Report",
+                                lines=5,
+                                placeholder="Upload a video and click Process Video..."
+                            )
+                
+                with gr.Column(scale=1):
+                    with gr.Group():
+                        gr.Markdown("### 📊 Annotated Results")
+                        video_output = gr.Video(label="Annotated Video")
+                        video_files = gr.File(label="📦 Download annotated video + detections.jsonl", file_count="multiple")
+            
+            video_button.click(run_video_inference, inputs=[video_input, video_model, video_confidence], outputs=[video_output, video_files, video_info])
+
+        # Tab 8: Multi-Camera Live
+        with gr.Tab("📹 Multi-Camera"):
+            with gr.Row():
+                gr.Markdown("""
+                <div style='text-align: center; padding: 32px; background: linear-gradient(135deg, #eef2ff 0%, #e0e7ff 100%); border: 2px solid #6366f1; border-radius: 20px; margin-bottom: 28px; box-shadow: 0 8px 24px rgba(99, 102, 241, 0.15);'>
+                    <h2 style='margin: 0; font-size: 32px; color: #3730a3; font-weight: 800; letter-spacing: -0.5px;'>📹 Multi-Camera Live</h2>
+                    <p style='margin: 16px 0 0 0; color: #4f46e5; font-size: 16px; font-weight: 500;'>Several cameras or streams, one batched forward pass per model</p>
+                </div>
+                """)
+            
+            with gr.Row():
+                with gr.Column(scale=1):
+                    with gr.Group():
+                        gr.Markdown("### 📤 Sources & Configure")
+                        multi_sources = gr.Dropdown(
+                            choices=list(MULTI_STREAM_SETTINGS["ui_sources"]),
+                            multiselect=True,
+                            allow_custom_value=MULTI_STREAM_SETTINGS["allow_custom_sources"],
+                            label="Sources",
+                            info="Configured in MULTI_STREAM_SETTINGS['ui_sources']"
+                        )
+                        
+                        with gr.Accordion("⚙️ Detection Settings", open=True):
+                            multi_model = gr.Dropdown(
+                                choices=[BATCH_ALL_MODELS] + list(MODEL_PATHS),
+                                value=BATCH_ALL_MODELS,
+                                label="🤖 Model"
+                            )
+                            multi_confidence = gr.Slider(
+                                0.1, 1.0, value=0.7, 
+                                label="🎯 Confidence Threshold",
+                                info="Applies to every stream"
+                            )
+                        
+                        with gr.Row():
+                            multi_start = gr.Button("▶️ Start Streams", variant="primary", size="lg")
+                            multi_stop = gr.Button("⏹️ Stop Streams", variant="stop", size="lg")
+                        
+                        with gr.Accordion("📈 Stream Stats", open=True):
+                            multi_info = gr.Textbox(
+                                label="Per-Stream FPS / Latency",
+                                lines=6,
+                                placeholder="Pick sources and click Start Streams..."
+                            )
+                
+                with gr.Column(scale=2):
+                    with gr.Group():
+                        gr.Markdown("### 📊 Live Streams")
+                        multi_tiles = []
+                        for row_start in range(0, MULTI_STREAM_SETTINGS["max_streams"], 2):
+                            with gr.Row():
+                                for stream_id in range(row_start, min(row_start + 2, MULTI_STREAM_SETTINGS["max_streams"])):
+                                    multi_tiles.append(gr.Image(label=f"Stream {stream_id}", type="numpy"))
+            
+            multi_event = multi_start.click(run_multi_stream, inputs=[multi_sources, multi_model, multi_confidence], outputs=multi_tiles + [multi_info])
+            multi_stop.click(None, cancels=[multi_event])
+
+        # Tab 9: Browser Camera
+        with gr.Tab("🌐 Browser Camera"):
+            with gr.Row():
+                gr.Markdown("""
+                <div style='text-align: center; padding: 32px; background: linear-gradient(135deg, #ecfdf5 0%, #d1fae5 100%); border: 2px solid #10b981; border-radius: 20px; margin-bottom: 28px; box-shadow: 0 8px 24px rgba(16, 185, 129, 0.15);'>
+                    <h2 style='margin: 0; font-size: 32px; color: #065f46; font-weight: 800; letter-spacing: -0.5px;'>🌐 Browser Camera</h2>
+                    <p style='margin: 16px 0 0 0; color: #047857; font-size: 16px; font-weight: 500;'>Your own webcam, streamed from the browser and annotated by the server</p>
+                </div>
+                """)
+            
+            with gr.Row():
+                with gr.Column(scale=1):
+                    with gr.Group():
+                        gr.Markdown("### 📤 Configure")
+                        with gr.Accordion("⚙️ Detection Settings", open=True):
+                            browser_model = gr.Dropdown(
+                                choices=[BATCH_ALL_MODELS] + list(MODEL_PATHS),
+                                value=BATCH_ALL_MODELS,
+                                label="🤖 Model"
+                            )
+                            browser_confidence = gr.Slider(
+                                0.1, 1.0, value=0.7, 
+                                label="🎯 Confidence Threshold"
+                            )
+                        
+                        with gr.Row():
+                            browser_start = gr.Button("▶️ Start Camera", variant="primary", size="lg")
+                            browser_stop = gr.Button("⏹️ Stop Camera", variant="stop", size="lg")
+                
+                with gr.Column(scale=2):
+                    with gr.Group():
+                        gr.Markdown("### 📊 Live Detection")
+                        browser_output = gr.HTML()
+            
+            browser_start.click(start_browser_camera, inputs=[browser_model, browser_confidence], outputs=browser_output, show_progress=False)
+            browser_stop.click(stop_browser_camera, outputs=browser_output, show_progress=False)
+        
+    demo.unload(stop_browser_camera)
 
 # ============================================================================
 # LAUNCH
 # ============================================================================
 
+def create_app() -> FastAPI:
+    """Headless API + live stream routes + the Gradio UI on one FastAPI app"""
+    # Headless API first so its routes take precedence over the Gradio mount
+    app = FastAPI(title="Autopilot Pro")
+    app.include_router(create_api_router(
+        models, model_locks, translations={"TrafficSign": TRAFFIC_SIGN_TRANSLATIONS}
+    ))
+    app.include_router(create_stream_router(live_sessions, browser_camera_feed))
+    app.include_router(create_health_router(models, live_sessions))
+    app.include_router(enable_hot_reload(models))
+    return gr.mount_gradio_app(
+        app, demo, path="/",
+        favicon_path=str(base_dir / "UI" / "images" / "logo_fyp.png")
+    )
+
 if __name__ == "__main__":
     print("🎉 Autopilot Pro is ready!")
-    print("🌐 Launching Gradio interface...")
-    
-    # For local development
-    # demo.launch(server_name="0.0.0.0", server_port=7860, share=False)
+    print("🌐 Launching Gradio interface + headless API (/v1)...")
     
-    # For deployment (Hugging Face Spaces, etc.)
-    demo.launch(
-        favicon_path=str(base_dir / "UI" / "images" / "logo_fyp.png")
+    # Same env vars demo.launch() honours (Hugging Face Spaces, Docker)
+    uvicorn.run(
+        create_app(),
+        host=os.getenv("GRADIO_SERVER_NAME", "127.0.0.1"),
+        port=int(os.getenv("GRADIO_SERVER_PORT", "7860"))
     )
-
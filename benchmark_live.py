@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Live Pipeline Benchmark
+========================================
+Measures the live camera path end to end without a camera. A synthetic camera plays
+an image folder or video file at a fixed frame rate (video_sources.open_synthetic_camera)
+and every model script's own process_camera_feed() runs on it, exactly as in the
+live tab, until the output is consumed here instead of by the browser.
+
+For each script it reports, as one JSON object per line on stdout:
+
+    fps                 frames that came out of the live loop per second
+    frames_dropped      camera frames the pipeline never saw + frames superseded inside it
+    latency_ms          capture -> display percentiles (p50 / p90 / p99 / max)
+    cpu_ms_per_frame    process CPU time (all threads) per displayed frame
+
+Progress goes to stderr, so the output can be piped or saved directly:
+
+    python benchmark_live.py --fps 30 --seconds 20 > live_benchmark.jsonl
+    python benchmark_live.py --targets Pedestrian Autopilotpro --source drive.mp4
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from config import LIVE_SESSION_SETTINGS
+from live_sessions import LiveSessionManager
+from model_registry import release_models
+from video_sources import open_synthetic_camera
+
+BASE_DIR = Path(__file__).parent
+
+# Script to benchmark -> (path, default synthetic camera source)
+LIVE_SCRIPTS = {
+    "LTV_HTV": ("LTV_HTV_Model/LTV_HTV_Model.py", "Testing_images/LTV_HTV_Images"),
+    "Pedestrian": ("Pedestrian_Model/Pedestrian_Model.py", "Testing_images/Pedestrian_Images"),
+    "TrafficLight": ("Traffic_Light_Model/TRAFFIC_LIGHT_MODEL.py", "Testing_images/Traffic_light_images"),
+    "TrafficSign": ("TRAFFIC_SIGN_MODEL/TRAFFIC_SIGN_MODEL.py", "Testing_images/Traffic_Sign_Images"),
+    "Autopilotpro": ("AUTOPILOT PRO/Autopilotpro.py", "Testing_images/LTV_HTV_Images"),
+}
+
+def load_script(name: str):
+    """Import a model script as a module (its launch is guarded by __main__)"""
+    path = BASE_DIR / LIVE_SCRIPTS[name][0]
+    spec = importlib.util.spec_from_file_location(f"live_benchmark_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class SyntheticLiveFeed:
+    """A model script's process_camera_feed() running on a synthetic camera.
+
+    Iterate `frames` to drive it; `session.pipeline.stats` and `camera` hold the counters.
+    """
+
+    def __init__(self, name: str, source, fps: float, width: int = None, height: int = None):
+        self.module = load_script(name)
+        self._cameras = []
+
+        def open_camera():
+            camera = open_synthetic_camera(source, fps, width, height)
+            self._cameras.append(camera)
+            return camera
+
+        # No session budgets: the caller decides how long to run and the camera sets the rate
+        self.sessions = LiveSessionManager(open_camera, {**LIVE_SESSION_SETTINGS, "max_fps": 0,
+                                                         "max_frames": 0, "max_seconds": 0})
+        self.session = self.sessions.start("benchmark")
+        self.frames = self.module.process_camera_feed(self.session)
+
+    @property
+    def camera(self):
+        return self._cameras[0]
+
+    @property
+    def stats(self) -> Dict:
+        return self.session.pipeline.stats
+
+    def close(self):
+        self.session.cancel()
+        self.frames.close()
+        self.sessions.remove(self.session)
+
+def benchmark_script(name: str, source, fps: float, seconds: float, warmup: float,
+                     width: int = None, height: int = None) -> Dict:
+    """Run one script's live loop on a synthetic camera and return its measurements"""
+    feed = SyntheticLiveFeed(name, source, fps, width, height)
+    frames = feed.frames
+
+    try:
+        # Warm-up: first inferences are slow (lazy init, allocator, caches)
+        warmup_end = time.monotonic() + warmup
+        for _ in frames:
+            if time.monotonic() >= warmup_end:
+                break
+        stats = feed.stats
+        camera = feed.camera
+        before = {key: stats[key] for key in ("frames_captured", "frames_dropped", "inferences")}
+        camera_dropped = camera.frames_dropped
+        camera_decoded = camera.frames_decoded
+        stats["latencies"].clear()
+
+        displayed = 0
+        cpu_start = time.process_time()
+        start = time.monotonic()
+        end = start + seconds
+        for _ in frames:
+            displayed += 1
+            if time.monotonic() >= end:
+                break
+        elapsed = max(time.monotonic() - start, 1e-6)
+        cpu = time.process_time() - cpu_start
+        latencies = np.array(stats["latencies"] or [0.0]) * 1000
+        camera_frames = camera.frames_decoded - camera_decoded
+        return {
+            "target": name,
+            "source": str(source),
+            "camera_fps": fps,
+            "seconds": round(elapsed, 3),
+            "frames_displayed": displayed,
+            "fps": round(displayed / elapsed, 2),
+            "camera_frames": camera_frames,
+            "frames_dropped": (camera.frames_dropped - camera_dropped) + (stats["frames_dropped"] - before["frames_dropped"]),
+            "drop_rate": round(max(1 - displayed / camera_frames, 0.0), 4) if camera_frames else 0.0,
+            "inferences": stats["inferences"] - before["inferences"],
+            "latency_ms": {
+                "p50": round(float(np.percentile(latencies, 50)), 2),
+                "p90": round(float(np.percentile(latencies, 90)), 2),
+                "p99": round(float(np.percentile(latencies, 99)), 2),
+                "max": round(float(latencies.max()), 2),
+            },
+            "cpu_ms_per_frame": round(cpu * 1000 / max(displayed, 1), 2),
+        }
+    finally:
+        feed.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the live camera loop of each model script")
+    parser.add_argument("--targets", nargs="+", default=list(LIVE_SCRIPTS), choices=list(LIVE_SCRIPTS))
+    parser.add_argument("--source", default=None,
+                        help="image folder or video file for the synthetic camera (default: the target's Testing_images folder)")
+    parser.add_argument("--fps", type=float, default=30, help="synthetic camera frame rate")
+    parser.add_argument("--seconds", type=float, default=20, help="measured duration per target")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before each run")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--output", default=None, help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.targets:
+        source = args.source or str(BASE_DIR / LIVE_SCRIPTS[name][1])
+        print(f"⏱️  {name}: {args.seconds:g}s at {args.fps:g} FPS from {source}...", file=sys.stderr)
+        try:
+            result = benchmark_script(name, source, args.fps, args.seconds, args.warmup, args.width, args.height)
+        except Exception as e:
+            # One broken script (bad weights, import error in its module) shouldn't cost the other rows
+            result = {"target": name, "error": f"{type(e).__name__}: {e}"}
+        results.append(result)
+        print(json.dumps(result), flush=True)
+        # Drop the script's model before loading the next one; the registry would otherwise keep
+        # every model for the life of the process. Some FastAPI versions also cache the script's
+        # Gradio routes (and so its model) until their LRU cache evicts them.
+        release_models()
+        gc.collect()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any("error" in result for result in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
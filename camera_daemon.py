@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Shared Camera Daemon
+=====================================
+One process owns the camera, decodes each frame once and publishes it into a
+shared-memory ring buffer. Every model server attaches to the ring and copies the
+latest frame out of it (a memcpy, no decode), so five detectors watching the same
+camera cost one decode per frame instead of five competing VideoCaptures.
+
+Started automatically by launch_all.py when CAMERA_SETTINGS["shared_capture"] is on.
+Can also be run by hand:
+
+    python camera_daemon.py --source 0 --width 640 --height 480
+
+Ring layout (one SharedMemory block):
+    header  int64[8]      magic, width, height, channels, slots, latest_seq, pid, heartbeat_ns
+    slots   int64[S, 2]   per-slot (seq, captured_ns)
+    frames  uint8[S,H,W,C]
+"""
+
+import argparse
+import os
+import signal
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config import CAMERA_SETTINGS
+from video_sources import open_video_source
+
+RING_MAGIC = 0x41505231  # "APR1"
+HEADER_FIELDS = 8
+MAGIC, WIDTH, HEIGHT, CHANNELS, SLOTS, LATEST_SEQ, PID, HEARTBEAT = range(HEADER_FIELDS)
+
+class SharedFrameRing:
+    """Fixed-size ring of BGR frames in shared memory (single writer, many readers)"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, width: int, height: int, channels: int, slots: int, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.width, self.height, self.channels, self.slots = width, height, channels, slots
+        header_bytes = HEADER_FIELDS * 8
+        slot_bytes = slots * 2 * 8
+        self.header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf, offset=0)
+        self.slot_meta = np.ndarray((slots, 2), dtype=np.int64, buffer=shm.buf, offset=header_bytes)
+        self.frames = np.ndarray((slots, height, width, channels), dtype=np.uint8,
+                                 buffer=shm.buf, offset=header_bytes + slot_bytes)
+
+    @staticmethod
+    def size_for(width: int, height: int, channels: int, slots: int) -> int:
+        return HEADER_FIELDS * 8 + slots * 2 * 8 + slots * height * width * channels
+
+    @classmethod
+    def create(cls, name: str, width: int, height: int, channels: int = 3, slots: int = 8) -> "SharedFrameRing":
+        try:
+            # A previous daemon that was killed hard can leave its block behind
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls.size_for(width, height, channels, slots))
+        ring = cls(shm, width, height, channels, slots, owner=True)
+        ring.slot_meta[:] = -1
+        ring.header[:] = [RING_MAGIC, width, height, channels, slots, -1, os.getpid(), time.time_ns()]
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrameRing":
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 registers every attach with the resource tracker, which would
+            # unlink the daemon's block when this reader exits
+            shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(shm._name, "shared_memory")
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf, offset=0)
+        if header[MAGIC] != RING_MAGIC:
+            shm.close()
+            raise ValueError(f"Shared memory block '{name}' is not an Autopilot frame ring")
+        width, height, channels, slots = (int(header[i]) for i in (WIDTH, HEIGHT, CHANNELS, SLOTS))
+        del header
+        return cls(shm, width, height, channels, slots, owner=False)
+
+    def write(self, frame: np.ndarray, captured_ns: int):
+        """Copy a frame into the next slot and publish it"""
+        seq = int(self.header[LATEST_SEQ]) + 1
+        slot = seq % self.slots
+        self.slot_meta[slot, 0] = -1            # mark slot as being written
+        self.frames[slot] = frame
+        self.slot_meta[slot, 1] = captured_ns
+        self.slot_meta[slot, 0] = seq
+        self.header[LATEST_SEQ] = seq
+        self.header[HEARTBEAT] = time.time_ns()
+
+    def latest(self) -> Tuple[int, Optional[np.ndarray], int]:
+        """(seq, read-only frame view, captured_ns) of the newest published frame; seq -1 if none yet"""
+        seq = int(self.header[LATEST_SEQ])
+        if seq < 0:
+            return -1, None, 0
+        slot = seq % self.slots
+        if self.slot_meta[slot, 0] != seq:
+            return -1, None, 0
+        view = self.frames[slot]
+        view.flags.writeable = False
+        return seq, view, int(self.slot_meta[slot, 1])
+
+    def snapshot(self) -> Tuple[int, Optional[np.ndarray], int]:
+        """Like latest(), but a private copy of the frame, checked not to have been overwritten mid-copy"""
+        while True:
+            seq, view, captured_ns = self.latest()
+            if view is None:
+                return seq, None, captured_ns
+            frame = view.copy()
+            # The writer marks the slot before touching the pixels: still our seq means an intact copy
+            if self.slot_meta[seq % self.slots, 0] == seq:
+                return seq, frame, captured_ns
+
+    def heartbeat_age(self) -> float:
+        return (time.time_ns() - int(self.header[HEARTBEAT])) / 1e9
+
+    def close(self):
+        # Drop numpy views before closing the mapping
+        del self.header, self.slot_meta, self.frames
+        try:
+            self.shm.close()
+        except BufferError:
+            pass    # a caller still holds a frame view; the mapping goes away with it
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+class SharedCameraCapture:
+    """cv2.VideoCapture-compatible reader over a SharedFrameRing.
+
+    read() blocks until a frame newer than the last one returned is published and
+    hands back a copy of it. A view into the ring would be overwritten after
+    ring_slots frames, which is shorter than a slow inference pass.
+    """
+
+    def __init__(self, name: str = CAMERA_SETTINGS["shm_name"], timeout: float = 2.0):
+        self.ring = SharedFrameRing.attach(name)
+        self.timeout = timeout
+        self.last_seq = -1
+        self.last_captured_ns = 0
+
+    def isOpened(self) -> bool:
+        return self.ring is not None
+
+    def set(self, prop, value) -> bool:
+        return False    # resolution/buffering are owned by the daemon
+
+    def get(self, prop) -> float:
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.ring.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.ring.height)
+        return 0.0
+
+    def read(self):
+        deadline = time.monotonic() + self.timeout
+        while self.ring is not None and time.monotonic() < deadline:
+            # Only copy once a newer frame is published
+            if int(self.ring.header[LATEST_SEQ]) > self.last_seq:
+                seq, frame, captured_ns = self.ring.snapshot()
+                if seq > self.last_seq:
+                    self.last_seq = seq
+                    self.last_captured_ns = captured_ns
+                    return True, frame
+            if self.ring.heartbeat_age() > self.timeout:
+                break   # daemon stopped publishing
+            time.sleep(0.002)
+        return False, None
+
+    def release(self):
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+def open_shared_camera(name: str = CAMERA_SETTINGS["shm_name"]) -> Optional[SharedCameraCapture]:
+    """Attach to a running camera daemon, or return None if there isn't one"""
+    try:
+        capture = SharedCameraCapture(name)
+    except (FileNotFoundError, ValueError):
+        return None
+    if capture.ring.heartbeat_age() > capture.timeout and capture.ring.header[LATEST_SEQ] >= 0:
+        # Left behind by a daemon that died without cleaning up
+        capture.release()
+        return None
+    return capture
+
+def run_daemon(source, width: int, height: int, slots: int, name: str, max_fps: float = 0):
+    # Any video source works here (camera, file, image folder, stream); it is decoded,
+    # resized and rate-capped on its own thread
+    cap = open_video_source(source, width=width, height=height, max_fps=max_fps, loop=True)
+    if cap is None or not cap.isOpened():
+        print(f"❌ Camera daemon: could not open source {source!r}")
+        return 1
+
+    ring = SharedFrameRing.create(name, width, height, 3, slots)
+    running = True
+
+    def handle_stop(signum, frame):
+        nonlocal running
+        running = False
+
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+    print(f"📷 Camera daemon publishing {width}x{height} frames from {source!r} to shared memory '{name}'")
+
+    try:
+        while running:
+            ret, frame = cap.read()
+            if not ret:
+                print("⚠️ Camera daemon: source returned no frame, stopping")
+                break
+            ring.write(frame, time.time_ns())
+    finally:
+        cap.release()
+        ring.close()
+        print("📷 Camera daemon stopped")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared camera capture daemon for Autopilot Pro")
+    parser.add_argument("--source", default=str(CAMERA_SETTINGS["source"]), help="camera index, video file, image folder or stream URL")
+    parser.add_argument("--width", type=int, default=CAMERA_SETTINGS["width"])
+    parser.add_argument("--height", type=int, default=CAMERA_SETTINGS["height"])
+    parser.add_argument("--slots", type=int, default=CAMERA_SETTINGS["ring_slots"])
+    parser.add_argument("--fps", type=float, default=CAMERA_SETTINGS["max_fps"], help="publish rate cap (0 = camera rate)")
+    parser.add_argument("--name", default=CAMERA_SETTINGS["shm_name"], help="shared memory block name")
+    args = parser.parse_args()
+
+    return run_daemon(args.source, args.width, args.height, args.slots, args.name, args.fps)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,52 +4,155 @@ Autopilot Pro Configuration File
 Customize ports, timeouts, and other settings here.
 """
 
-# Server Configuration
+import os
+
+# Server Configuration (launch_all.py builds its fleet from this)
+# "replicas" > 1 runs that many copies of the script on ports from
+# LAUNCHER_SETTINGS["replica_base_port"] up, behind a load balancer on "port".
+# "cpu_weight" is each process's share of the cores and "concurrent_models" how many
+# models it runs at once (cpu_budget.py turns both into thread counts)
 SERVER_CONFIG = {
     "LTV_HTV": {
         "name": "LTV/HTV Detection",
         "port": 7860,
         "icon": "🚙",
         "script": "LTV_HTV_Model/LTV_HTV_Model.py",
-        "enabled": True
+        "enabled": True,
+        "replicas": 1,
+        "cpu_weight": 1,
+        "concurrent_models": 1
     },
     "Pedestrian": {
         "name": "Pedestrian Detection",
         "port": 7861,
         "icon": "🚶",
         "script": "Pedestrian_Model/Pedestrian_Model.py",
-        "enabled": True
+        "enabled": True,
+        "replicas": 1,
+        "cpu_weight": 1,
+        "concurrent_models": 1
     },
     "TrafficLight": {
         "name": "Traffic Light Detection",
         "port": 7862,
         "icon": "🚦",
         "script": "Traffic_Light_Model/TRAFFIC_LIGHT_MODEL.py",
-        "enabled": True
+        "enabled": True,
+        "replicas": 1,
+        "cpu_weight": 1,
+        "concurrent_models": 1
     },
     "TrafficSign": {
         "name": "Traffic Sign Detection",
         "port": 7869,
         "icon": "🚸",
         "script": "TRAFFIC_SIGN_MODEL/TRAFFIC_SIGN_MODEL.py",
-        "enabled": True
+        "enabled": True,
+        "replicas": 1,
+        "cpu_weight": 1,
+        "concurrent_models": 1
     },
     "AutopilotPro": {
         "name": "Autopilot Pro (Combined)",
         "port": 7868,
         "icon": "🤖",
         "script": "AUTOPILOT PRO/Autopilotpro.py",
-        "enabled": True
+        "enabled": True,
+        "replicas": 1,
+        "cpu_weight": 4,
+        "concurrent_models": 4
     }
 }
 
+# Model Weights (relative to the repo root; keys are the model names used by app.py)
+MODEL_FILES = {
+    "LTV_HTV": "LTV_HTV_Model/LTV_HTV.pt",
+    "Pedestrian": "Pedestrian_Model/last.pt",
+    "TrafficLight": "Traffic_Light_Model/epoch70.pt",
+    "TrafficSign": "TRAFFIC_SIGN_MODEL/trafic.pt"
+}
+
+# Sample images new weights are checked on before a hot reload swaps them in (hot_reload.py)
+MODEL_SAMPLES = {
+    "LTV_HTV": "Testing_images/LTV_HTV_Images",
+    "Pedestrian": "Testing_images/Pedestrian_Images",
+    "TrafficLight": "Testing_images/Traffic_light_images",
+    "TrafficSign": "Testing_images/Traffic_Sign_Images"
+}
+
+# Hot Model Reload (replaced weights files are loaded, checked and swapped in without a restart;
+# POST /admin/reload/<model> needs the AUTOPILOT_ADMIN_TOKEN env var set and sent as X-Admin-Token)
+HOT_RELOAD_SETTINGS = {
+    "watch_files": True,                # poll the weights files for changes
+    "poll_interval": 5,                 # seconds between checks
+    "settle_seconds": 2,                # a changed file must stay unchanged this long (copy finished)
+    "sample_images": 3,                 # sample images the new weights must run on
+    "min_detections": 1,                # objects they must find on those, in total (0 = only run)
+    "require_same_classes": True        # reject weights whose class names differ from the loaded ones
+}
+
+# Traffic sign translations
+TRAFFIC_SIGN_TRANSLATIONS = {
+    "20": "Speed Limit 20", "30": "Speed Limit 30",
+    "dur": "Stop", "durak": "Bus Stop",
+    "girisyok": "No Entry", "ilerisag": "Go Straight & Turn Right",
+    "ilerisol": "Go Straight & Turn Left", "kirmizi": "Red Light",
+    "park": "Parking", "parkyasak": "No Parking",
+    "sag": "Right", "sagadonulmez": "No Right Turn",
+    "sari": "Yellow Light", "sol": "Left",
+    "soladonulmez": "No Left Turn", "yesil": "Green Light",
+    "parkyasak2": "No Parking (Variant)", "arac": "Vehicle",
+    "yaya": "Pedestrian", "otobus": "Bus",
+    "bisikletli": "Cyclist", "yapılar": "Buildings",
+    "yayagecidi": "Pedestrian Crossing", "tasitrafiginekapali": "Closed to Vehicle Traffic"
+}
+
+# CPU Budget (cpu_budget.py: launch_all.py and prefork.py split the cores between processes)
+CPU_BUDGET_SETTINGS = {
+    "enabled": True,
+    "reserve_cores": 1,                 # cores left for the launcher, balancers, camera daemon and browser
+    "interop_threads": 1,               # torch inter-op threads (YOLO graphs are sequential)
+    "opencv_threads": 1,                # cv2 threads per process for resize/draw/encode (0 = same as torch)
+    "pin_cores": False                  # pin each process to its own cores (Linux)
+}
+
 # Launcher Settings
 LAUNCHER_SETTINGS = {
-    "server_startup_timeout": 120,      # seconds to wait for each server
-    "health_check_interval": 1,         # seconds between health checks
+    "server_startup_timeout": 120,      # seconds to wait for all servers to report ready
     "auto_open_browser": True,          # automatically open UI in browser
-    "show_server_logs": False,          # show detailed server output
-    "graceful_shutdown_timeout": 5      # seconds to wait before force kill
+    "show_server_logs": False,          # show server stdout (errors on stderr are always shown)
+    "graceful_shutdown_timeout": 5,     # seconds to wait before force kill
+    "replica_base_port": 7900,          # first port handed to replicas behind a load balancer
+    "single_process": False             # every UI in one process over shared models (serve_all.py)
+}
+
+# Supervisor (launch_all.py keeps the servers up after startup)
+SUPERVISOR_SETTINGS = {
+    "check_interval": 2,                # seconds between process / memory checks
+    "restart_backoff": 1,               # seconds before restarting a crashed server, doubled per consecutive crash
+    "max_restart_backoff": 60,          # cap on that delay
+    "stable_after": 60,                 # seconds of uptime that reset the consecutive crash count
+    "startup_grace": 120,               # extra seconds for a server that missed the launch deadline to get ready
+    "max_rss_mb": 4096,                 # recycle a server whose resident memory passes this (0 = off)
+    "max_p99_latency_ms": 2000,         # recycle a server whose model-call p99 stays above this (0 = off)
+    "latency_strikes": 3,               # consecutive stats reports over the p99 limit before recycling
+    "stats_interval": 30,               # seconds between the latency stats each server sends
+    "status_interval": 600              # seconds between supervisor status tables (0 = only at exit)
+}
+
+# Local Load Balancer (load_balancer.py, in front of a model's replicas)
+LOAD_BALANCER_SETTINGS = {
+    "connect_timeout": 2,               # seconds to reach a replica before trying another
+    "unhealthy_cooldown": 5,            # seconds a refusing replica is skipped
+    "session_ttl": 3600                 # seconds an idle session stays pinned to its replica
+}
+
+# Pre-fork Serving (prefork.py: app.py's models loaded once, workers forked behind a load balancer)
+PREFORK_SETTINGS = {
+    "workers": 2,                       # worker processes sharing the parent's weights copy-on-write
+    "worker_base_port": 7950,           # workers listen on 127.0.0.1 from here up
+    "respawn_delay": 1,                 # seconds before a dead worker is replaced
+    "shutdown_timeout": 5               # seconds workers get to finish before being killed
 }
 
 # UI Settings
@@ -61,3 +164,125 @@ PERFORMANCE = {
     "live_confidence_threshold": 0.7     # for camera feed
 }
 
+# Live Camera Settings (shared by every process_camera_feed)
+LIVE_SETTINGS = {
+    "tracking_enabled": True,           # carry boxes between detector keyframes
+    "keyframe_interval": 3,             # run YOLO every N frames (starting value if adaptive)
+    "adaptive_keyframes": True,         # shorten interval on motion/new objects, lengthen when stable
+    "min_keyframe_interval": 1,
+    "max_keyframe_interval": 10,
+    "tracker_iou_threshold": 0.3,       # min IoU to match a detection to an existing track
+    "tracker_max_misses": 2,            # keyframes a track may go unmatched before it is dropped
+    "motion_gating": True,              # reuse detections when the scene hasn't changed
+    "motion_threshold": 0.01,           # fraction of (64px wide) thumbnail pixels that must change
+    "motion_pixel_threshold": 25,       # per-pixel grey-level difference that counts as change
+    "motion_max_skip": 30,              # force a fresh inference after this many skipped frames
+    "motion_region_inference": False,   # detect only inside the changed region (single-model feeds)
+    # Combined live feed: run each model every N frames, holding its last result in between
+    # (keys match the model names in AUTOPILOT PRO/Autopilotpro.py)
+    "model_cadence": {
+        "Pedestrian": 1,
+        "LTV_HTV": 2,
+        "Traffic_Light": 3,
+        "Traffic_Sign": 5
+    }
+}
+
+# Live Sessions (per-user state for every "Start Camera" click; see live_sessions.py)
+LIVE_SESSION_SETTINGS = {
+    "max_sessions": 4,                  # concurrent live streams per server
+    "max_fps": 30,                      # per-session frame budget, 0 = camera rate
+    "max_frames": 0,                    # end a session after this many frames, 0 = unlimited
+    "max_seconds": 1800                 # end a session after this long, 0 = unlimited
+}
+
+# MJPEG Live Stream (/live/stream.mjpg on every model server; see live_stream.py)
+LIVE_STREAM_SETTINGS = {
+    "max_fps": 15,                      # frames per second sent to each viewer (upper bound for ?fps=)
+    "jpeg_quality": 75                  # JPEG quality of streamed frames
+}
+
+# Browser Camera (the page captures the webcam and streams it over /live/ws; see live_stream.py)
+BROWSER_CAMERA_SETTINGS = {
+    "max_width": 640,                   # the browser downscales frames to this width before sending
+    "fps": 10,                          # frames per second the server accepts from each browser
+    "jpeg_quality": 70,                 # JPEG quality of uploaded (and, with server overlays, returned) frames
+    "overlay": "client"                 # "client": send detections, the page draws them; "server": send annotated JPEGs
+}
+
+# Shared Camera (one capture daemon feeding every model server via shared memory)
+CAMERA_SETTINGS = {
+    "shared_capture": True,             # launch_all.py starts camera_daemon.py; servers attach to it
+    "source": 0,                        # camera index or stream URL
+    "width": 640,
+    "height": 480,
+    "max_fps": 0,                       # publish rate cap, 0 = camera rate
+    "ring_slots": 8,                    # frames kept in the ring (readers' views stay valid this long)
+    "shm_name": "autopilot_camera"
+}
+
+# Live Video Source (used when no shared camera daemon is running; see video_sources.py)
+# source: camera index, video file, image folder/glob, stream URL or "shared".
+# The AUTOPILOT_VIDEO_SOURCE environment variable overrides it, e.g. to replay a recorded drive.
+VIDEO_SOURCE_SETTINGS = {
+    "source": os.environ.get("AUTOPILOT_VIDEO_SOURCE", 0),
+    "width": None,                      # resize frames to width x height (None = native size)
+    "height": None,
+    "max_fps": 0,                       # delivered frame rate cap, 0 = source rate
+    "loop": True,                       # restart video files / image folders when they end
+    "buffer_size": 4,                   # decoded frames buffered ahead of the pipeline
+    "image_sequence_fps": 10            # playback rate for image folders
+}
+
+# Offline Video Processing (app.py "Video Processing" tab and video_processing.py CLI)
+VIDEO_SETTINGS = {
+    "batch_size": 8,                    # frames per YOLO forward pass
+    "codec": "mp4v",                    # FourCC of the annotated output video
+    "progress_interval": 1.0            # seconds between progress updates
+}
+
+# Result Files (app.py batch / video tabs: annotated outputs kept in the temp folder for download)
+RESULT_FILES_SETTINGS = {
+    "keep_runs": 10                     # finished runs kept per tab; older ones are deleted
+}
+
+# Multi-Stream Live Engine (app.py "Multi-Camera" tab and multi_stream.py CLI)
+MULTI_STREAM_SETTINGS = {
+    "max_streams": 4,                   # sources watched at once (also the number of UI tiles)
+    "batch_window_ms": 10,              # wait this long for other streams' frames before a batch
+    "display_fps": 15,                  # UI refresh rate for the stream tiles
+    "report_interval": 1.0,             # seconds between stats updates
+    # What the Multi-Camera tab may open: name shown in the UI -> camera index, file, folder or URL
+    # (relative paths are under the project folder)
+    "ui_sources": {
+        "Camera 0": 0,
+        "LTV/HTV test images": "Testing_images/LTV_HTV_Images",
+        "Pedestrian test images": "Testing_images/Pedestrian_Images",
+        "Traffic light test images": "Testing_images/Traffic_light_images",
+        "Traffic sign test images": "Testing_images/Traffic_Sign_Images"
+    },
+    # Also accept sources typed in the UI. Anyone reaching the UI could then make the server
+    # read its files or devices and fetch any URL; only enable on a trusted network
+    "allow_custom_sources": False
+}
+
+# Headless Inference API (served by app.py next to the Gradio UI)
+API_SETTINGS = {
+    "max_concurrent_requests": 4,       # in-flight inferences across all API calls
+    "queue_timeout": 10,                # seconds a request may wait for a slot before 503
+    "max_batch_size": 16,               # images per YOLO forward pass
+    "max_batch_images": 64,             # images accepted in one batch request
+    "max_upload_mb": 20                 # per-image upload limit
+}
+
+
+# Soak Test (soak_test.py; trends are fitted after the warm-up)
+SOAK_SETTINGS = {
+    "sample_interval": 10,              # seconds between resource / latency samples
+    "warmup": 60,                       # seconds ignored before fitting trends
+    "max_rss_growth_mb_per_hour": 20,   # RSS slope above this is reported as a leak...
+    "min_rss_growth_mb": 50,            # ...once the fitted growth over the run also exceeds this
+    "max_fd_growth": 10,                # open file handles gained over the run
+    "max_thread_growth": 5,             # threads gained over the run
+    "max_latency_drift": 1.5            # p95 latency of the last quarter vs the first quarter
+}
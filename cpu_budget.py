@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - CPU Budget
+===========================
+Every model server hosts PyTorch and OpenCV thread pools that default to one thread
+per core, so five servers on one machine run five times as many compute threads as
+there are cores and lose their time to context switches. launch_all.py splits the
+cores between the processes instead, in proportion to each model's "cpu_weight" in
+SERVER_CONFIG:
+
+    threads     torch intra-op threads per model call (also OMP_NUM_THREADS / MKL_NUM_THREADS);
+                a process's cores divided by the models it runs at once ("concurrent_models")
+    interop     torch inter-op threads
+    opencv      cv2.setNumThreads
+    cores       CPUs the process is pinned to (only with CPU_BUDGET_SETTINGS["pin_cores"], Linux)
+
+The plan reaches each server through AUTOPILOT_CPU_PLAN, and the server applies it
+with apply_cpu_plan() before loading its models. Without it (script started by hand)
+nothing changes.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from config import CPU_BUDGET_SETTINGS
+
+CPU_PLAN_ENV = "AUTOPILOT_CPU_PLAN"
+
+def available_cores() -> List[int]:
+    """CPUs this process may run on (respects container / taskset limits where the OS exposes them)"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def plan_cpu(processes: Dict[str, Tuple[float, int]], settings: Dict = CPU_BUDGET_SETTINGS,
+             cores: Optional[List[int]] = None) -> Dict[str, Dict]:
+    """Split the cores between processes, given as id -> (cpu weight, models run concurrently)"""
+    cores = cores if cores is not None else available_cores()
+    reserved = settings["reserve_cores"]
+    usable = cores[reserved:] if len(cores) > reserved else cores
+    total_weight = sum(weight for weight, _ in processes.values()) or 1
+
+    # Largest remainder: every process gets at least one core, the rest goes by weight
+    shares = {key: len(usable) * weight / total_weight for key, (weight, _) in processes.items()}
+    allotted = {key: max(int(share), 1) for key, share in shares.items()}
+    spare = len(usable) - sum(allotted.values())
+    for key in sorted(shares, key=lambda key: shares[key] - int(shares[key]), reverse=True)[:max(spare, 0)]:
+        allotted[key] += 1
+
+    plan = {}
+    offset = 0
+    for key, (_, concurrency) in processes.items():
+        count = allotted[key]
+        threads = max(count // max(concurrency, 1), 1)
+        plan[key] = {
+            "threads": threads,
+            "interop": min(settings["interop_threads"], count),
+            "opencv": settings["opencv_threads"] or threads,
+            # More processes than cores: pinned sets wrap around and overlap
+            "cores": [usable[(offset + i) % len(usable)] for i in range(count)] if settings["pin_cores"] else [],
+        }
+        offset += count
+    return plan
+
+def plan_env(entry: Dict) -> Dict[str, str]:
+    """Environment carrying one process's plan (the OMP/MKL variables take effect when torch is imported)"""
+    threads = str(entry["threads"])
+    return {CPU_PLAN_ENV: json.dumps(entry), "OMP_NUM_THREADS": threads, "MKL_NUM_THREADS": threads}
+
+def pin(pid: int, cores: List[int]):
+    """Restrict a process (0 = the calling thread) to `cores`; threads it starts afterwards inherit it"""
+    if cores and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(pid, cores)
+        except OSError as e:
+            print(f"⚠️  Could not pin process {pid} to cores {cores}: {e}")
+
+def apply_cpu_plan(entry: Optional[Dict] = None) -> Optional[Dict]:
+    """Apply a plan entry (default: the one launch_all.py passed in the environment) before models load"""
+    if entry is None:
+        raw = os.environ.get(CPU_PLAN_ENV)
+        if not raw:
+            return None
+        entry = json.loads(raw)
+
+    pin(0, entry.get("cores", []))
+    try:
+        import torch
+        torch.set_num_threads(entry["threads"])
+        try:
+            torch.set_num_interop_threads(entry["interop"])
+        except RuntimeError:
+            pass    # only settable before the first parallel work; the default then stays
+    except ImportError:
+        pass
+    import cv2
+    cv2.setNumThreads(entry["opencv"])
+    return entry
+
+def describe(entry: Dict) -> str:
+    cores = entry.get("cores")
+    pinned = f" · cores {','.join(map(str, cores))}" if cores else ""
+    return f"{entry['threads']} threads · {entry['interop']} inter-op · {entry['opencv']} OpenCV{pinned}"
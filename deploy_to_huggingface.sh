@@ -87,6 +87,24 @@ cp ../Autopilot_Pro/app.py . || exit 1
 cp ../Autopilot_Pro/requirements.txt . || exit 1
 cp ../Autopilot_Pro/.gitattributes . || exit 1
 cp ../Autopilot_Pro/config.py . || exit 1
+cp ../Autopilot_Pro/inference_api.py . || exit 1
+cp ../Autopilot_Pro/video_processing.py . || exit 1
+cp ../Autopilot_Pro/video_sources.py . || exit 1
+cp ../Autopilot_Pro/multi_stream.py . || exit 1
+cp ../Autopilot_Pro/live_pipeline.py . || exit 1
+cp ../Autopilot_Pro/live_sessions.py . || exit 1
+cp ../Autopilot_Pro/live_stream.py . || exit 1
+cp ../Autopilot_Pro/tracking.py . || exit 1
+cp ../Autopilot_Pro/motion_gate.py . || exit 1
+cp ../Autopilot_Pro/camera_daemon.py . || exit 1
+cp ../Autopilot_Pro/health.py . || exit 1
+cp ../Autopilot_Pro/hot_reload.py . || exit 1
+cp ../Autopilot_Pro/model_registry.py . || exit 1
+cp ../Autopilot_Pro/readiness.py . || exit 1
+cp ../Autopilot_Pro/load_balancer.py . || exit 1
+cp ../Autopilot_Pro/prefork.py . || exit 1
+cp ../Autopilot_Pro/cpu_budget.py . || exit 1
+mkdir -p UI && cp ../Autopilot_Pro/UI/live_camera.html UI/ || exit 1
 
 # Copy model folders
 cp -r ../Autopilot_Pro/LTV_HTV_Model . || exit 1
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Health Endpoints
+=================================
+Cheap probes for Docker, compose and launch_all.py instead of fetching the whole
+Gradio page:
+
+    GET /healthz    liveness: the process answers HTTP (no model is touched); the
+                    Docker and compose health checks use this one
+    GET /readyz     readiness, for routing: 200 once every loaded model has run an
+                    inference, 503 while one is still cold or its last call failed
+
+Both reply with a small JSON body. /readyz lists every loaded model's state
+(loaded / warm / failing), its queue depth (callers holding or waiting for it),
+call count and last inference latency, plus the active live sessions. Models whose
+weights are missing are listed apart under "missing": the server runs without
+them (app.py) and no amount of waiting makes them ready, so they don't hold back
+the rest. A server with no model at all is never ready.
+"""
+
+import time
+from typing import Dict, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+STARTED_AT = time.time()
+
+def model_status(model) -> Dict:
+    if hasattr(model, "status"):
+        return model.status()
+    return {"state": "loaded"}      # a plain YOLO object keeps no call statistics
+
+def create_health_router(models: Dict[str, Optional[object]], live_sessions=None) -> APIRouter:
+    router = APIRouter()
+
+    @router.get("/healthz")
+    async def healthz():
+        return {"status": "ok", "uptime": round(time.time() - STARTED_AT, 1)}
+
+    @router.get("/readyz")
+    async def readyz():
+        statuses = {name: model_status(model) for name, model in models.items() if model is not None}
+        ready = bool(statuses) and all(status["state"] == "warm" for status in statuses.values())
+        body = {
+            "status": "ready" if ready else "not_ready",
+            "uptime": round(time.time() - STARTED_AT, 1),
+            "models": statuses,
+            "missing": [name for name, model in models.items() if model is None],
+        }
+        if live_sessions is not None:
+            body["live_sessions"] = live_sessions.active()
+        return JSONResponse(body, status_code=200 if ready else 503)
+
+    return router
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Hot Model Reload
+=================================
+Picks up new weights without restarting a server (which would drop every live
+session). docker-compose.yml mounts the model folders, so copying a new
+LTV_HTV.pt / last.pt / epoch70.pt / trafic.pt over the old one is enough:
+
+    watcher     polls the weights files every HOT_RELOAD_SETTINGS["poll_interval"] seconds
+                and reloads one once it has stopped changing for "settle_seconds"
+    endpoint    POST /admin/reload/<model> reloads on demand; send the token from the
+                AUTOPILOT_ADMIN_TOKEN environment variable as the X-Admin-Token header
+                (without that variable the endpoint answers 403)
+
+A reload loads the new file in a background thread while the old model keeps
+serving, runs it on a few images from Testing_images (which also warms it up) and
+only then swaps it in with SharedModel.swap(). Calls already running or queued
+finish on the old model. Weights that fail to load, raise on the samples, find
+nothing on them, or detect different classes are rejected and the old model stays.
+Where Testing_images is missing (the Docker image) a blank frame is used and only
+has to run without error.
+"""
+
+import hmac
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from fastapi import APIRouter, Header, HTTPException
+from starlette.concurrency import run_in_threadpool
+from ultralytics import YOLO
+
+from config import HOT_RELOAD_SETTINGS, MODEL_FILES, MODEL_SAMPLES
+from model_registry import SharedModel
+
+ADMIN_TOKEN_ENV = "AUTOPILOT_ADMIN_TOKEN"
+BASE_DIR = Path(__file__).parent
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+# Weights path -> lock held while that file is being reloaded
+_reload_locks: Dict[str, threading.Lock] = {}
+_reload_locks_guard = threading.Lock()
+
+def sample_images(weights_path: str, limit: int) -> List[np.ndarray]:
+    """Up to `limit` of the model's Testing_images (none in the Docker image, which does not copy them)"""
+    images = []
+    for name, path in MODEL_FILES.items():
+        folder = BASE_DIR / MODEL_SAMPLES.get(name, "")
+        if os.path.realpath(BASE_DIR / path) != weights_path or not folder.is_dir():
+            continue
+        for file in sorted(folder.iterdir()):
+            if len(images) >= limit:
+                break
+            if file.suffix.lower() in IMAGE_SUFFIXES:
+                image = cv2.imread(str(file))
+                if image is not None:
+                    images.append(image)
+    return images
+
+def check_candidate(candidate: YOLO, current: YOLO, images: List[np.ndarray],
+                    settings: Dict) -> Tuple[Optional[str], int]:
+    """Run the new model on the samples: (reason to reject it or None, objects detected)"""
+    if settings["require_same_classes"] and dict(candidate.names) != dict(current.names):
+        return "class names differ from the loaded model", 0
+    # Without samples the new model only has to run on a blank frame
+    frames = images or [np.zeros((640, 640, 3), dtype=np.uint8)]
+    detections = 0
+    for image in frames:
+        for result in candidate(image, verbose=False):
+            detections += len(result.boxes) if result.boxes is not None else 0
+    if images and detections < settings["min_detections"]:
+        return f"{detections} detections on {len(images)} sample images", detections
+    return None, detections
+
+def reload_model(name: str, shared: SharedModel, settings: Dict = HOT_RELOAD_SETTINGS) -> Dict:
+    """Load, check and swap in the current contents of the model's weights file"""
+    with _reload_locks_guard:
+        lock = _reload_locks.setdefault(shared.path, threading.Lock())
+    if not lock.acquire(blocking=False):
+        return {"model": name, "status": "busy", "reason": "a reload is already running"}
+    started = time.perf_counter()
+    try:
+        try:
+            candidate = YOLO(shared.path)
+            reason, detections = check_candidate(candidate, shared.model, sample_images(
+                shared.path, settings["sample_images"]), settings)
+        except Exception as e:
+            reason, detections = f"{type(e).__name__}: {e}", 0
+        if reason is None:
+            shared.swap(candidate)
+        seconds = round(time.perf_counter() - started, 2)
+    finally:
+        lock.release()
+
+    if reason is None:
+        print(f"🔄 Reloaded {name} from {shared.path} in {seconds}s ({detections} detections on the samples)")
+        return {"model": name, "status": "swapped", "seconds": seconds, "detections": detections}
+    print(f"⚠️  Kept the current {name} model, new weights rejected: {reason}")
+    return {"model": name, "status": "rejected", "reason": reason, "seconds": seconds}
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None     # mid-replace; the next poll sees the new file
+    return stat.st_mtime_ns, stat.st_size
+
+class WeightsWatcher:
+    """Polls the weights files of the watched models and reloads the ones that changed"""
+
+    def __init__(self, settings: Dict = HOT_RELOAD_SETTINGS):
+        self.settings = settings
+        self.watched: Dict[str, Tuple[str, SharedModel]] = {}     # weights path -> (name, model)
+        self.signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        self.changed_at: Dict[str, Tuple[Tuple[int, int], float]] = {}     # path -> (new signature, first seen)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, models: Dict[str, Optional[object]]):
+        with self._lock:
+            for name, model in models.items():
+                # Models shared between UIs are watched once
+                if isinstance(model, SharedModel) and model.path and model.path not in self.watched:
+                    self.watched[model.path] = (name, model)
+                    self.signatures[model.path] = file_signature(model.path)
+            if self.watched and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="weights-watcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.settings["poll_interval"])
+            with self._lock:
+                watched = list(self.watched.items())
+            for path, (name, model) in watched:
+                self.poll(path, name, model)
+
+    def poll(self, path: str, name: str, model: SharedModel):
+        signature = file_signature(path)
+        if signature is None or signature == self.signatures[path]:
+            self.changed_at.pop(path, None)
+            return
+        # Still being written: wait until the file has stopped changing
+        last_seen = self.changed_at.get(path)
+        if last_seen is None or last_seen[0] != signature:
+            self.changed_at[path] = (signature, time.monotonic())
+            return
+        if time.monotonic() - last_seen[1] < self.settings["settle_seconds"]:
+            return
+        del self.changed_at[path]
+        # Remembered even when rejected, so a bad file is not retried every poll
+        self.signatures[path] = signature
+        reload_model(name, model, self.settings)
+
+_watcher = WeightsWatcher()
+
+def enable_hot_reload(models: Dict[str, Optional[object]]) -> APIRouter:
+    """Watch `models`' weights files (if enabled) and return the router with the reload endpoint"""
+    if HOT_RELOAD_SETTINGS["watch_files"]:
+        _watcher.watch(models)
+    router = APIRouter()
+
+    @router.post("/admin/reload/{model_name}")
+    async def reload(model_name: str, x_admin_token: Optional[str] = Header(None)):
+        token = os.environ.get(ADMIN_TOKEN_ENV)
+        if not token or not hmac.compare_digest(x_admin_token or "", token):
+            raise HTTPException(status_code=403, detail=f"Set {ADMIN_TOKEN_ENV} and send it as X-Admin-Token")
+        model = models.get(model_name)
+        if not isinstance(model, SharedModel):
+            raise HTTPException(status_code=404, detail=f"Unknown model: {model_name}")
+        result = await run_in_threadpool(reload_model, model_name, model)
+        if result["status"] == "busy":
+            raise HTTPException(status_code=409, detail=result["reason"])
+        return result
+
+    return router
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Headless Inference API
+=======================================
+HTTP endpoints that return detections only (no rendered images).
+Mounted by app.py next to the Gradio UI and backed by the same loaded models.
+
+Endpoints (all under /v1):
+    GET  /v1/models                      -> loaded models and their class names
+    POST /v1/detect/{model}              -> raw image bytes in the request body
+    POST /v1/detect/{model}/batch        -> multipart upload with one or more "files"
+
+Query parameters:
+    conf     confidence threshold (default: PERFORMANCE["static_confidence_threshold"])
+    classes  comma separated class ids or names to keep (default: all)
+    format   "json" (default) or "binary"
+
+Binary format (little-endian, media type application/x-autopilot-detections):
+    b"APD1" | uint32 image_count | per image: uint32 n | n x float32[6]
+    where each row is (x1, y1, x2, y2, confidence, class_id).
+"""
+
+import asyncio
+import struct
+import threading
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+from config import API_SETTINGS, PERFORMANCE
+
+BINARY_MAGIC = b"APD1"
+BINARY_MEDIA_TYPE = "application/x-autopilot-detections"
+
+# ============================================================================
+# DETECTION HELPERS
+# ============================================================================
+
+def decode_image_bytes(data: bytes) -> np.ndarray:
+    """Decode encoded image bytes (JPEG/PNG/...) into a BGR array"""
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty image payload")
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise HTTPException(status_code=400, detail="Could not decode image")
+    return img
+
+def resolve_classes(model, classes: Optional[str]) -> Optional[List[int]]:
+    """Turn a "0,2,person" style filter into class ids understood by the model"""
+    if not classes:
+        return None
+
+    names = getattr(model, "names", {}) or {}
+    name_to_id = {str(name): idx for idx, name in names.items()}
+    class_ids = []
+    for token in classes.split(","):
+        token = token.strip()
+        if not token:
+            continue
+        if token.isdigit():
+            class_ids.append(int(token))
+        elif token in name_to_id:
+            class_ids.append(name_to_id[token])
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown class: {token}")
+    return class_ids or None
+
+def detect_batch(model, images: List[np.ndarray], confidence_threshold: float,
+                 class_ids: Optional[List[int]] = None,
+                 translate: Optional[Callable[[str], str]] = None,
+                 batch_size: int = 16) -> List[List[Dict]]:
+    """Run one model over a list of BGR images and return plain detection dicts per image"""
+    detections = []
+    names = getattr(model, "names", {}) or {}
+
+    for start in range(0, len(images), batch_size):
+        chunk = images[start:start + batch_size]
+        # Let YOLO apply the confidence/class filters inside NMS instead of afterwards
+        results = model(chunk, conf=confidence_threshold, classes=class_ids, verbose=False)
+
+        for result in results:
+            image_detections = []
+            boxes = result.boxes
+            if boxes is not None and len(boxes):
+                xyxy = boxes.xyxy.cpu().numpy()
+                confs = boxes.conf.cpu().numpy()
+                clss = boxes.cls.cpu().numpy().astype(int)
+                for (x1, y1, x2, y2), confidence, cls_index in zip(xyxy, confs, clss):
+                    label = names.get(int(cls_index), f"Class_{cls_index}")
+                    if translate is not None:
+                        label = translate(label)
+                    image_detections.append({
+                        "box": [int(x1), int(y1), int(x2), int(y2)],
+                        "confidence": round(float(confidence), 4),
+                        "class_id": int(cls_index),
+                        "label": label,
+                    })
+            detections.append(image_detections)
+
+    return detections
+
+def pack_detections_binary(batch: List[List[Dict]]) -> bytes:
+    """Pack per-image detections into the compact APD1 binary format"""
+    parts = [BINARY_MAGIC, struct.pack("<I", len(batch))]
+    for image_detections in batch:
+        rows = np.array(
+            [d["box"] + [d["confidence"], d["class_id"]] for d in image_detections],
+            dtype="<f4"
+        ).reshape(-1, 6)
+        parts.append(struct.pack("<I", len(rows)))
+        parts.append(rows.tobytes())
+    return b"".join(parts)
+
+def unpack_detections_binary(payload: bytes) -> List[np.ndarray]:
+    """Inverse of pack_detections_binary, for API clients written in Python"""
+    if payload[:4] != BINARY_MAGIC:
+        raise ValueError("Not an APD1 payload")
+    (image_count,) = struct.unpack_from("<I", payload, 4)
+    offset = 8
+    batch = []
+    for _ in range(image_count):
+        (n,) = struct.unpack_from("<I", payload, offset)
+        offset += 4
+        rows = np.frombuffer(payload, dtype="<f4", count=n * 6, offset=offset).reshape(n, 6)
+        offset += n * 6 * 4
+        batch.append(rows)
+    return batch
+
+# ============================================================================
+# CONCURRENCY LIMITING
+# ============================================================================
+
+class ConcurrencyLimiter:
+    """Caps in-flight API inferences; callers wait up to queue_timeout, then get a 503"""
+
+    def __init__(self, max_concurrent: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self._semaphore = None
+
+    async def __aenter__(self):
+        # Created lazily so it binds to the server's event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Inference API is busy, retry later")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+
+# ============================================================================
+# ROUTES
+# ============================================================================
+
+def create_api_router(models: Dict, model_locks: Dict[str, threading.Lock],
+                      translations: Optional[Dict[str, Dict[str, str]]] = None) -> APIRouter:
+    """Build the /v1 router over an already-loaded model registry"""
+    router = APIRouter(prefix="/v1", tags=["inference"])
+    limiter = ConcurrencyLimiter(API_SETTINGS["max_concurrent_requests"], API_SETTINGS["queue_timeout"])
+    max_upload_bytes = API_SETTINGS["max_upload_mb"] * 1024 * 1024
+    translations = translations or {}
+
+    def get_model(model_name: str):
+        if model_name not in models:
+            raise HTTPException(status_code=404, detail=f"Unknown model: {model_name}")
+        if models[model_name] is None:
+            raise HTTPException(status_code=503, detail=f"Model not loaded: {model_name}")
+        return models[model_name]
+
+    def run_detection(model_name: str, images: List[np.ndarray], conf: float, classes: Optional[str]):
+        model = get_model(model_name)
+        class_ids = resolve_classes(model, classes)
+        label_map = translations.get(model_name)
+        translate = (lambda label: label_map.get(label, label)) if label_map else None
+        # The UI uses the same model objects, so serialise per model
+        with model_locks[model_name]:
+            return detect_batch(model, images, conf, class_ids, translate, API_SETTINGS["max_batch_size"])
+
+    def build_response(model_name: str, batch: List[List[Dict]], output_format: str):
+        if output_format == "binary":
+            return Response(content=pack_detections_binary(batch), media_type=BINARY_MEDIA_TYPE)
+        return JSONResponse({
+            "model": model_name,
+            "results": [{"count": len(dets), "detections": dets} for dets in batch],
+        })
+
+    @router.get("/models")
+    async def list_models():
+        return {
+            name: {
+                "loaded": model is not None,
+                "classes": dict(getattr(model, "names", {}) or {}) if model is not None else {},
+            }
+            for name, model in models.items()
+        }
+
+    @router.post("/detect/{model_name}")
+    async def detect_single(request: Request, model_name: str,
+                            conf: float = Query(PERFORMANCE["static_confidence_threshold"], ge=0.0, le=1.0),
+                            classes: Optional[str] = None,
+                            format: str = Query("json", pattern="^(json|binary)$")):
+        get_model(model_name)
+        data = await request.body()
+        if len(data) > max_upload_bytes:
+            raise HTTPException(status_code=413, detail="Image too large")
+        image = decode_image_bytes(data)
+
+        async with limiter:
+            batch = await run_in_threadpool(run_detection, model_name, [image], conf, classes)
+        return build_response(model_name, batch, format)
+
+    @router.post("/detect/{model_name}/batch")
+    async def detect_many(model_name: str,
+                          files: List[UploadFile] = File(...),
+                          conf: float = Query(PERFORMANCE["static_confidence_threshold"], ge=0.0, le=1.0),
+                          classes: Optional[str] = None,
+                          format: str = Query("json", pattern="^(json|binary)$")):
+        get_model(model_name)
+        if len(files) > API_SETTINGS["max_batch_images"]:
+            raise HTTPException(status_code=413, detail=f"At most {API_SETTINGS['max_batch_images']} images per batch")
+
+        images = []
+        for upload in files:
+            data = await upload.read()
+            if len(data) > max_upload_bytes:
+                raise HTTPException(status_code=413, detail=f"Image too large: {upload.filename}")
+            images.append(decode_image_bytes(data))
+
+        async with limiter:
+            batch = await run_in_threadpool(run_detection, model_name, images, conf, classes)
+        return build_response(model_name, batch, format)
+
+    return router
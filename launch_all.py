@@ -10,7 +10,9 @@ Usage: python launch_all.py
 
 import os
 import sys
+import argparse
 import time
+import queue
 import subprocess
 import threading
 import signal
@@ -19,6 +21,12 @@ from pathlib import Path
 import requests
 from typing import List, Dict, Optional
 
+from config import (CAMERA_SETTINGS, CPU_BUDGET_SETTINGS, LAUNCHER_SETTINGS, MODEL_FILES, SERVER_CONFIG,
+                    SUPERVISOR_SETTINGS)
+from cpu_budget import available_cores, describe, pin, plan_cpu, plan_env
+from process_probe import ProcessProbe
+from readiness import REPLICA_PORT_ENV, ReadinessListener
+
 # Color codes for better terminal output
 class Colors:
     GREEN = '\033[92m'
@@ -33,6 +41,14 @@ def print_colored(message: str, color: str = Colors.GREEN):
     """Print colored messages to terminal"""
     print(f"{color}{message}{Colors.END}")
 
+# Startup stages each server reports through readiness.py, in order
+STARTUP_STAGES = {
+    "started": "imports done",
+    "models_loaded": "models loaded",
+    "warmed": "warm-up done",
+    "ready": "ready"
+}
+
 def print_header():
     """Print the application header"""
     header = """
@@ -49,73 +65,109 @@ def print_header():
 class GradioServerManager:
     """Manages multiple Gradio server instances"""
     
-    def __init__(self):
+    def __init__(self, single_process: bool = LAUNCHER_SETTINGS["single_process"]):
         self.base_dir = Path(__file__).parent.absolute()
+        self.single_process = single_process
         self.processes: List[subprocess.Popen] = []
         self.servers: List[Dict] = []
+        self.camera_process: Optional[subprocess.Popen] = None
+        self.stopped = False
+        # Servers push their startup stages here instead of being polled over HTTP
+        self.readiness = ReadinessListener().start()
         self.setup_servers()
         
     def setup_servers(self):
-        """Define all Gradio servers to launch"""
-        self.servers = [
-            {
-                "name": "LTV/HTV Detection",
-                "script": self.base_dir / "LTV_HTV_Model" / "LTV_HTV_Model.py",
-                "port": 7860,
-                "icon": "🚙",
-                "process": None
-            },
-            {
-                "name": "Pedestrian Detection",
-                "script": self.base_dir / "Pedestrian_Model" / "Pedestrian_Model.py",
-                "port": 7861,
-                "icon": "🚶",
-                "process": None
-            },
-            {
-                "name": "Traffic Light Detection",
-                "script": self.base_dir / "Traffic_Light_Model" / "TRAFFIC_LIGHT_MODEL.py",
-                "port": 7862,
-                "icon": "🚦",
-                "process": None
-            },
-            {
-                "name": "Traffic Sign Detection",
-                "script": self.base_dir / "TRAFFIC_SIGN_MODEL" / "TRAFFIC_SIGN_MODEL.py",
-                "port": 7869,
-                "icon": "🚸",
-                "process": None
-            },
-            {
-                "name": "Autopilot Pro (Combined)",
-                "script": self.base_dir / "AUTOPILOT PRO" / "Autopilotpro.py",
-                "port": 7868,
-                "icon": "🤖",
+        """Build the fleet from SERVER_CONFIG: one process per model, or replicas behind a load balancer"""
+        self.servers = []
+        if self.single_process:
+            self.setup_single_process()
+            return
+        next_replica_port = LAUNCHER_SETTINGS["replica_base_port"]
+        for key, cfg in SERVER_CONFIG.items():
+            if not cfg.get("enabled", True):
+                continue
+            script = self.base_dir / cfg["script"]
+            replicas = max(int(cfg.get("replicas", 1)), 1)
+            cpu = (cfg.get("cpu_weight", 1), cfg.get("concurrent_models", 1))
+            if replicas == 1:
+                self.servers.append({
+                    "name": cfg["name"],
+                    "script": script,
+                    "port": cfg["port"],
+                    "icon": cfg["icon"],
+                    "cpu": cpu,
+                    "public": True,
+                    "process": None
+                })
+                continue
+            
+            # Replicas listen on private ports; the balancer takes the model's public port
+            replica_ports = list(range(next_replica_port, next_replica_port + replicas))
+            next_replica_port += replicas
+            for index, port in enumerate(replica_ports, 1):
+                self.servers.append({
+                    "name": f"{cfg['name']} #{index}",
+                    "script": script,
+                    "port": port,
+                    "icon": cfg["icon"],
+                    "env": {REPLICA_PORT_ENV: str(port)},
+                    "cpu": cpu,
+                    "public": False,
+                    "process": None
+                })
+            self.servers.append({
+                "name": cfg["name"],
+                "script": self.base_dir / "load_balancer.py",
+                "args": ["--port", str(cfg["port"]), "--upstream", *map(str, replica_ports), "--name", key],
+                "port": cfg["port"],
+                "icon": cfg["icon"],
+                "replicas": replicas,
+                "public": True,
                 "process": None
-            }
-        ]
+            })
+    
+    def setup_single_process(self):
+        """One serve_all.py process hosting every enabled UI on its usual port"""
+        enabled = [cfg for cfg in SERVER_CONFIG.values() if cfg.get("enabled", True)]
+        if not enabled:
+            return
+        self.servers = [{
+            "name": "All models (single process)",
+            "script": self.base_dir / "serve_all.py",
+            "port": enabled[0]["port"],
+            "icon": "🧩",
+            "cpu": (1, len(MODEL_FILES)),
+            "uis": enabled,
+            "public": True,
+            "process": None
+        }]
+    
+    def plan_cpu(self):
+        """Split the cores between the model servers and print the plan (cpu_budget.py)"""
+        if not CPU_BUDGET_SETTINGS["enabled"]:
+            return
+        model_servers = [server for server in self.servers if "cpu" in server]
+        plan = plan_cpu({str(server["port"]): server["cpu"] for server in model_servers})
+        
+        cores = len(available_cores())
+        reserved = CPU_BUDGET_SETTINGS["reserve_cores"] if cores > CPU_BUDGET_SETTINGS["reserve_cores"] else 0
+        print_colored(f"🧮 CPU Plan ({cores} cores, {reserved} reserved):", Colors.CYAN + Colors.BOLD)
+        print_colored("─" * 60, Colors.CYAN)
+        for server in model_servers:
+            server["cpu_plan"] = plan[str(server["port"])]
+            server.setdefault("env", {}).update(plan_env(server["cpu_plan"]))
+            print_colored(f"  {server['icon']} {server['name']:<26} {describe(server['cpu_plan'])}", Colors.GREEN)
+        print_colored("─" * 60 + "\n", Colors.CYAN)
     
     def check_port_available(self, port: int) -> bool:
         """Check if a port is available or already has a server running"""
         try:
-            response = requests.get(f"http://127.0.0.1:{port}", timeout=2)
-            return True  # Server already running on this port
+            # /healthz is a few bytes of JSON; the Gradio page is hundreds of KB
+            response = requests.get(f"http://127.0.0.1:{port}/healthz", timeout=2)
+            return response.ok  # Server already running on this port
         except requests.exceptions.RequestException:
             return False  # Port is free or server not responding
     
-    def wait_for_server(self, port: int, timeout: int = 60) -> bool:
-        """Wait for a server to become available on specified port"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                response = requests.get(f"http://127.0.0.1:{port}", timeout=2)
-                if response.status_code == 200:
-                    return True
-            except requests.exceptions.RequestException:
-                pass
-            time.sleep(1)
-        return False
-    
     def launch_server_process(self, server: Dict) -> bool:
         """Launch a single Gradio server process (non-blocking)"""
         script_path = server["script"]
@@ -133,22 +185,22 @@ class GradioServerManager:
         
         try:
             # Launch the server process (non-blocking)
-            # Don't redirect output so we can see errors in real-time
+            # stderr is never redirected so errors show up in real-time
             process = subprocess.Popen(
-                [sys.executable, str(script_path)],
-                cwd=script_path.parent
+                [sys.executable, str(script_path)] + server.get("args", []),
+                cwd=script_path.parent,
+                env={**self.readiness.child_env(str(server["port"])), **server.get("env", {})},
+                stdout=None if LAUNCHER_SETTINGS["show_server_logs"] else subprocess.DEVNULL
             )
             
+            # Pin right away so the threads started while importing land on the planned cores too
+            pin(process.pid, server.get("cpu_plan", {}).get("cores", []))
             server["process"] = process
             server["status"] = "starting"
+            server["spawned_at"] = time.time()
+            server["ready_by"] = server["spawned_at"] + LAUNCHER_SETTINGS["server_startup_timeout"]
+            server["timeline"] = {}
             self.processes.append(process)
-            
-            # Quick check if process died immediately
-            time.sleep(0.5)
-            if process.poll() is not None:
-                print_colored(f"  ❌ {server['name']} process died immediately (exit code: {process.returncode})", Colors.RED)
-                return False
-            
             return True
                 
         except Exception as e:
@@ -156,6 +208,32 @@ class GradioServerManager:
             server["status"] = "failed"
             return False
     
+    def start_camera_daemon(self) -> bool:
+        """Start the shared camera daemon so every server reads one decoded stream"""
+        if not CAMERA_SETTINGS["shared_capture"]:
+            return False
+        
+        script_path = self.base_dir / "camera_daemon.py"
+        print_colored("📷 Starting shared camera daemon...", Colors.BLUE + Colors.BOLD)
+        try:
+            # A source given via AUTOPILOT_VIDEO_SOURCE (file, image folder, stream) is shared too
+            source = os.environ.get("AUTOPILOT_VIDEO_SOURCE", str(CAMERA_SETTINGS["source"]))
+            self.camera_process = subprocess.Popen(
+                [sys.executable, str(script_path), "--source", source], cwd=self.base_dir
+            )
+        except Exception as e:
+            print_colored(f"  ⚠️  Could not start camera daemon: {e}", Colors.YELLOW)
+            return False
+        
+        # Give it a moment to open the device; servers fall back to direct capture without it
+        time.sleep(1)
+        if self.camera_process.poll() is not None:
+            print_colored("  ⚠️  No camera available - live tabs will open the camera directly", Colors.YELLOW)
+            self.camera_process = None
+            return False
+        print_colored(f"  ✓ Camera frames shared via '{CAMERA_SETTINGS['shm_name']}'\n", Colors.GREEN)
+        return True
+    
     def launch_all_servers(self):
         """Launch all Gradio servers in parallel for faster startup"""
         print_colored("\n📡 Starting Gradio Servers in Parallel...\n", Colors.CYAN + Colors.BOLD)
@@ -167,76 +245,95 @@ class GradioServerManager:
             self.launch_server_process(server)
         
         print()
-        print_colored("⏳ Phase 2: Waiting for servers to be ready...", Colors.BLUE + Colors.BOLD)
+        print_colored("⏳ Phase 2: Waiting for servers to report ready...", Colors.BLUE + Colors.BOLD)
         print_colored("   (Models are loading into memory - usually takes 30-60 seconds)\n", Colors.YELLOW)
         
-        # Phase 2: Wait for all servers to become ready (parallel health checks)
+        # Phase 2: React to the stages servers report; no HTTP polling
         start_time = time.time()
-        max_wait = 120  # Maximum 2 minutes
-        check_interval = 2  # Check every 2 seconds
+        timeout = LAUNCHER_SETTINGS["server_startup_timeout"]
+        servers_by_id = {str(server["port"]): server for server in self.servers}
+        pending = {server_id for server_id, server in servers_by_id.items() if server.get("status") == "starting"}
         
-        servers_ready = {server["port"]: False for server in self.servers}
-        last_ready_count = 0
-        
-        while time.time() - start_time < max_wait:
-            all_ready = True
-            elapsed = int(time.time() - start_time)
-            ready_count = 0
-            
-            for server in self.servers:
-                port = server["port"]
-                
-                # Skip if already confirmed ready
-                if servers_ready[port]:
-                    ready_count += 1
-                    continue
-                
-                # Check if server is responding
-                if self.check_port_available(port):
-                    servers_ready[port] = True
-                    ready_count += 1
-                    print_colored(f"  ✅ {server['icon']} {server['name']} is ready! (Port: {port}) [{elapsed}s]", Colors.GREEN)
-                else:
-                    all_ready = False
-            
-            # Show progress if no new servers became ready
-            if ready_count == last_ready_count and not all_ready:
-                progress = "⚡" * ready_count + "⏳" * (len(self.servers) - ready_count)
-                print_colored(f"  [{elapsed}s] {progress} ({ready_count}/{len(self.servers)} ready)", Colors.YELLOW)
-            
-            last_ready_count = ready_count
-            
-            # Exit early if all servers are ready
-            if all_ready:
-                break
+        while pending and time.time() - start_time < timeout:
+            try:
+                event = self.readiness.events.get(timeout=0.5)
+            except queue.Empty:
+                # Nothing reported: make sure nobody we're waiting for has died
+                for server_id in list(pending):
+                    server = servers_by_id[server_id]
+                    if server["process"].poll() is not None:
+                        pending.discard(server_id)
+                        server["status"] = "failed"
+                        print_colored(f"  ❌ {server['icon']} {server['name']} exited during startup "
+                                      f"(exit code: {server['process'].returncode})", Colors.RED)
+                continue
             
-            # Wait before next check
-            time.sleep(check_interval)
+            server = servers_by_id.get(str(event.get("server")))
+            stage = event.get("stage")
+            if server is None or server.get("status") != "starting" or stage not in STARTUP_STAGES:
+                continue
+            at = event["time"] - server["spawned_at"]
+            # A single-process server reports each stage once per script: keep the first start, the last of the rest
+            if stage != "started" or stage not in server["timeline"]:
+                server["timeline"][stage] = at
+            if stage == "ready":
+                pending.discard(str(server["port"]))
+                server["status"] = "running"
+                print_colored(f"  ✅ {server['icon']} {server['name']} is ready! (Port: {server['port']}) [{at:.1f}s]", Colors.GREEN)
+            else:
+                print_colored(f"     {server['icon']} {server['name']}: {STARTUP_STAGES[stage]} [{at:.1f}s]", Colors.YELLOW)
+        
+        for server_id in pending:
+            servers_by_id[server_id]["status"] = "timeout"
         
         # Count results
-        successful = sum(1 for ready in servers_ready.values() if ready)
+        successful = sum(1 for server in self.servers if server.get("status") == "running")
         failed = len(self.servers) - successful
         
         # Print summary
         print()
         print_colored("═" * 60, Colors.CYAN)
-        total_time = int(time.time() - start_time)
-        print_colored(f"\n✅ Successfully launched: {successful}/{len(self.servers)} servers in {total_time}s", Colors.GREEN + Colors.BOLD)
+        total_time = time.time() - start_time
+        print_colored(f"\n✅ Successfully launched: {successful}/{len(self.servers)} servers in {total_time:.1f}s", Colors.GREEN + Colors.BOLD)
         if failed > 0:
             print_colored(f"❌ Failed or timed out: {failed}/{len(self.servers)} servers", Colors.RED)
             print_colored(f"   (They may still be loading - check status in a moment)", Colors.YELLOW)
         print_colored("\n" + "═" * 60 + "\n", Colors.CYAN)
         
+        self.print_timelines()
         return successful, failed
     
+    def print_timelines(self):
+        """Per-server startup timeline (seconds since each process was spawned)"""
+        launched = [server for server in self.servers if server.get("timeline")]
+        if not launched:
+            return
+        print_colored("📊 Startup Timelines (seconds since launch):", Colors.CYAN + Colors.BOLD)
+        print_colored("─" * 60, Colors.CYAN)
+        for server in launched:
+            steps = " → ".join(f"{label} {server['timeline'][stage]:.1f}s"
+                               for stage, label in STARTUP_STAGES.items() if stage in server["timeline"])
+            color = Colors.GREEN if server["status"] == "running" else Colors.RED
+            print_colored(f"  {server['icon']} {server['name']:<26} {steps}", color)
+        first_spawn = min(server["spawned_at"] for server in launched)
+        ready_at = [server["spawned_at"] + server["timeline"]["ready"] for server in launched if "ready" in server["timeline"]]
+        if ready_at:
+            print_colored(f"  ⏱️  Total time to ready: {max(ready_at) - first_spawn:.1f}s", Colors.CYAN + Colors.BOLD)
+        print_colored("─" * 60 + "\n", Colors.CYAN)
+    
     def print_server_info(self):
         """Print information about all running servers"""
         print_colored("🌐 Server Information:", Colors.CYAN + Colors.BOLD)
         print_colored("─" * 60, Colors.CYAN)
         for server in self.servers:
-            if self.check_port_available(server["port"]):
+            if server.get("public") and server.get("status") == "running":
+                for ui in server.get("uis", []):
+                    print_colored(f"  {ui['icon']} {ui['name']:<30} http://127.0.0.1:{ui['port']}", Colors.GREEN)
+                if server.get("uis"):
+                    continue
                 url = f"http://127.0.0.1:{server['port']}"
-                print_colored(f"  {server['icon']} {server['name']:<30} {url}", Colors.GREEN)
+                replicas = f"  ({server['replicas']} replicas)" if server.get("replicas") else ""
+                print_colored(f"  {server['icon']} {server['name']:<30} {url}{replicas}", Colors.GREEN)
         print_colored("─" * 60 + "\n", Colors.CYAN)
     
     def open_ui(self):
@@ -249,22 +346,182 @@ class GradioServerManager:
         else:
             print_colored(f"⚠️  UI file not found: {ui_path}", Colors.YELLOW)
     
+    # ------------------------------------------------------------------
+    # Supervision: restart crashed servers, recycle ones over their limits
+    # ------------------------------------------------------------------
+    
+    def supervise(self):
+        """Keep every launched server up until interrupted"""
+        now = time.time()
+        for server in self.servers:
+            server.update(restarts=0, recycles=0, crash_streak=0, latency_strikes=0, uptime=0.0)
+            if server.get("status") == "running":
+                server["up_since"] = now
+            elif server.get("status") == "timeout":
+                # Missed the launch deadline but may still be loading; restart it if it doesn't finish soon
+                server["status"] = "starting"
+                server["ready_by"] = now + SUPERVISOR_SETTINGS["startup_grace"]
+            elif server.get("status") == "failed" and server.get("process") is not None:
+                self.schedule_restart(server, now)
+        
+        servers_by_id = {str(server["port"]): server for server in self.servers}
+        next_check = 0.0
+        last_status = now
+        while True:
+            try:
+                self.handle_event(servers_by_id, self.readiness.events.get(timeout=SUPERVISOR_SETTINGS["check_interval"]))
+            except queue.Empty:
+                pass
+            now = time.time()
+            if now < next_check:
+                continue
+            next_check = now + SUPERVISOR_SETTINGS["check_interval"]
+            for server in self.servers:
+                self.check_server(server, now)
+            interval = SUPERVISOR_SETTINGS["status_interval"]
+            if interval and now - last_status >= interval:
+                self.print_server_stats()
+                last_status = now
+    
+    def handle_event(self, servers_by_id: Dict[str, Dict], event: Dict):
+        """Readiness of restarted servers and the latency stats of running ones"""
+        server = servers_by_id.get(str(event.get("server")))
+        if server is None or server.get("process") is None or event.get("pid") != server["process"].pid:
+            return    # unknown server or a report from a process already replaced
+        stage = event.get("stage")
+        if stage == "ready" and server["status"] == "starting":
+            server["status"] = "running"
+            server["up_since"] = time.time()
+            print_colored(f"  ✅ {server['icon']} {server['name']} is back up "
+                          f"[{time.time() - server['spawned_at']:.1f}s]", Colors.GREEN)
+        elif stage == "stats":
+            server["p99_ms"] = event.get("p99_ms")
+            limit = SUPERVISOR_SETTINGS["max_p99_latency_ms"]
+            over = limit and server["p99_ms"] is not None and server["p99_ms"] > limit
+            server["latency_strikes"] = server["latency_strikes"] + 1 if over else 0
+    
+    def check_server(self, server: Dict, now: float):
+        process = server.get("process")
+        if process is None:
+            return    # found already running at startup; not ours to manage
+        if server["status"] == "backoff":
+            if now >= server["restart_at"]:
+                self.restart_server(server)
+            return
+        if process.poll() is not None:
+            self.handle_crash(server, now)
+            return
+        if server["status"] == "starting":
+            if now > server["ready_by"]:
+                print_colored(f"  ⚠️  {server['icon']} {server['name']} did not become ready, stopping it", Colors.YELLOW)
+                self.stop_process(process)    # the next check treats it as a crash
+            return
+        
+        # Running
+        if now - server["up_since"] >= SUPERVISOR_SETTINGS["stable_after"]:
+            server["crash_streak"] = 0
+        try:
+            server["rss_mb"] = ProcessProbe(process.pid).sample()["rss_mb"]
+        except (OSError, KeyError):
+            # Exited since poll(); reap it and restart like any other crash
+            self.stop_process(process)
+            self.handle_crash(server, now)
+            return
+        max_rss = SUPERVISOR_SETTINGS["max_rss_mb"]
+        if max_rss and server["rss_mb"] and server["rss_mb"] > max_rss:
+            self.recycle_server(server, f"RSS {server['rss_mb']:.0f} MB > {max_rss} MB")
+        elif server["latency_strikes"] >= SUPERVISOR_SETTINGS["latency_strikes"]:
+            self.recycle_server(server, f"p99 latency {server['p99_ms']:.0f} ms > "
+                                        f"{SUPERVISOR_SETTINGS['max_p99_latency_ms']} ms")
+    
+    def handle_crash(self, server: Dict, now: float):
+        self.mark_down(server, now)
+        server["restarts"] += 1
+        print_colored(f"  ❌ {server['icon']} {server['name']} exited "
+                      f"(exit code: {server['process'].returncode})", Colors.RED)
+        self.schedule_restart(server, now)
+    
+    def schedule_restart(self, server: Dict, now: float):
+        """Restart after an exponential backoff on consecutive crashes"""
+        server["crash_streak"] += 1
+        delay = min(SUPERVISOR_SETTINGS["restart_backoff"] * 2 ** (server["crash_streak"] - 1),
+                    SUPERVISOR_SETTINGS["max_restart_backoff"])
+        server["status"] = "backoff"
+        server["restart_at"] = now + delay
+        print_colored(f"     🔄 Restarting {server['name']} in {delay:g}s "
+                      f"(crash #{server['crash_streak']} in a row)", Colors.YELLOW)
+    
+    def recycle_server(self, server: Dict, reason: str):
+        """Gracefully replace a server that is still up but over its limits"""
+        print_colored(f"  ♻️  Recycling {server['icon']} {server['name']}: {reason}", Colors.YELLOW)
+        server["recycles"] += 1
+        self.mark_down(server, time.time())
+        self.stop_process(server["process"])
+        self.restart_server(server)
+    
+    def restart_server(self, server: Dict):
+        if server["process"] in self.processes:
+            self.processes.remove(server["process"])
+        server["latency_strikes"] = 0
+        server["p99_ms"] = None
+        if not self.launch_server_process(server) or server.get("status") == "failed":
+            self.schedule_restart(server, time.time())
+    
+    def mark_down(self, server: Dict, now: float):
+        if "up_since" in server:
+            server["uptime"] += now - server.pop("up_since")
+    
+    def stop_process(self, process: subprocess.Popen) -> bool:
+        """SIGTERM, then SIGKILL after the grace period; True if it stopped on its own"""
+        if process.poll() is not None:
+            return True
+        process.terminate()
+        try:
+            process.wait(timeout=LAUNCHER_SETTINGS["graceful_shutdown_timeout"])
+            return True
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            return False
+    
+    def print_server_stats(self):
+        """Per-server status, uptime, restarts and recycles"""
+        supervised = [server for server in self.servers if "restarts" in server]
+        if not supervised:
+            return
+        now = time.time()
+        print_colored("🩺 Supervisor Stats:", Colors.CYAN + Colors.BOLD)
+        print_colored("─" * 60, Colors.CYAN)
+        for server in supervised:
+            uptime = server["uptime"] + (now - server["up_since"] if "up_since" in server else 0)
+            rss = f"  {server['rss_mb']:.0f} MB" if server.get("rss_mb") else ""
+            p99 = f"  p99 {server['p99_ms']:.0f} ms" if server.get("p99_ms") is not None else ""
+            color = Colors.GREEN if server["status"] == "running" else Colors.YELLOW
+            print_colored(f"  {server['icon']} {server['name']:<26} {server['status']:<8} up {uptime / 60:.1f} min  "
+                          f"restarts {server['restarts']}  recycles {server['recycles']}{rss}{p99}", color)
+        print_colored("─" * 60 + "\n", Colors.CYAN)
+    
     def shutdown_all_servers(self):
         """Gracefully shutdown all running servers"""
+        if self.stopped:
+            return
+        self.stopped = True
         print_colored("\n\n🛑 Shutting down all servers...", Colors.YELLOW + Colors.BOLD)
+        self.print_server_stats()
         
-        for process in self.processes:
+        # Stop the camera daemon last so servers never read from a vanished ring
+        processes = self.processes + ([self.camera_process] if self.camera_process else [])
+        for process in processes:
             if process and process.poll() is None:  # Process is still running
                 try:
-                    process.terminate()
-                    process.wait(timeout=5)
-                    print_colored("  ✓ Server stopped gracefully", Colors.GREEN)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    print_colored("  ⚠️  Server force killed", Colors.YELLOW)
+                    if self.stop_process(process):
+                        print_colored("  ✓ Server stopped gracefully", Colors.GREEN)
+                    else:
+                        print_colored("  ⚠️  Server force killed", Colors.YELLOW)
                 except Exception as e:
                     print_colored(f"  ❌ Error stopping server: {e}", Colors.RED)
         
+        self.readiness.close()
         print_colored("\n✅ All servers stopped. Goodbye! 👋\n", Colors.GREEN + Colors.BOLD)
 
 def signal_handler(signum, frame):
@@ -342,6 +599,11 @@ def check_dependencies():
 
 def main():
     """Main launcher function"""
+    parser = argparse.ArgumentParser(description="Launch every Autopilot Pro model server")
+    parser.add_argument("--single-process", action="store_true", default=LAUNCHER_SETTINGS["single_process"],
+                        help="host all UIs in one process over one shared set of models")
+    args = parser.parse_args()
+    
     # Print header
     print_header()
     
@@ -351,13 +613,19 @@ def main():
         sys.exit(1)
     
     # Create server manager
-    manager = GradioServerManager()
+    manager = GradioServerManager(single_process=args.single_process)
     
     # Set up signal handler for graceful shutdown
     signal_handler.manager = manager
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
+    # Thread counts and cores for every model server, applied before their models load
+    manager.plan_cpu()
+    
+    # Start the shared camera before the servers that read from it
+    manager.start_camera_daemon()
+    
     # Launch all servers
     successful, failed = manager.launch_all_servers()
     
@@ -369,7 +637,8 @@ def main():
     manager.print_server_info()
     
     # Open UI in browser
-    manager.open_ui()
+    if LAUNCHER_SETTINGS["auto_open_browser"]:
+        manager.open_ui()
     
     # Print instructions
     print_instructions()
@@ -378,13 +647,8 @@ def main():
     print_colored("⏳ Press Ctrl+C to stop all servers and exit...\n", Colors.YELLOW)
     
     try:
-        # Monitor processes and keep script alive
-        while True:
-            time.sleep(5)
-            # Check if any critical process died
-            alive_count = sum(1 for p in manager.processes if p and p.poll() is None)
-            if alive_count < len(manager.processes):
-                print_colored(f"⚠️  Warning: Some servers may have stopped ({alive_count}/{len(manager.processes)} running)", Colors.YELLOW)
+        # Restart crashed servers and recycle ones over their memory / latency limits
+        manager.supervise()
     except KeyboardInterrupt:
         pass
     finally:
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Pipelined Live Engine
+======================================
+Runs the live camera loop as three decoupled stages instead of one blocking loop:
+
+    capture thread  ->  [latest frame]  ->  inference thread  ->  [latest result]  ->  render (caller)
+
+Both hand-off queues hold a single item and drop the older entry when a newer one
+arrives, so the camera is drained continuously and the displayed frame is never
+more than one inference behind the live scene.
+
+With tracking enabled (LIVE_SETTINGS["tracking_enabled"]) the inference stage only
+runs the detector on keyframes and carries boxes forward with an IoU tracker on the
+frames in between, so the overlay keeps up with the camera frame rate.
+
+With motion gating enabled (LIVE_SETTINGS["motion_gating"]) a cheap frame-difference
+check runs before every inference; unchanged scenes reuse the previous detections.
+"""
+
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List
+
+import cv2
+
+from camera_daemon import open_shared_camera
+from config import CAMERA_SETTINGS, LIVE_SETTINGS
+from motion_gate import MotionGate, merge_region_detections
+from tracking import IoUTracker, KeyframeScheduler
+from video_sources import open_video_source
+
+def open_live_capture(source=None):
+    """Attach to the shared camera daemon if one is running, otherwise open the configured
+    video source (camera, file, image folder or stream; see VIDEO_SOURCE_SETTINGS)"""
+    if CAMERA_SETTINGS["shared_capture"]:
+        shared = open_shared_camera()
+        if shared is not None:
+            return shared
+    return open_video_source(source)
+
+def put_latest(q: queue.Queue, item) -> bool:
+    """Put item into a bounded queue, evicting the oldest entry if full. Returns True if one was dropped."""
+    dropped = False
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped = True
+            except queue.Empty:
+                pass
+
+class LivePipeline:
+    """Capture / inference / render pipeline around a cv2.VideoCapture-like source.
+
+    open_capture: callable returning an opened capture (anything with read()/release())
+    infer:        callable(frame) -> detections (list of dicts with "box", "label", "confidence")
+    render:       callable(frame, detections) -> output yielded to the UI (e.g. a PIL image)
+    should_stop:  callable polled by every stage; returning True ends the stream
+    session:      optional LiveSession; its cancel token and frame budget also end / throttle the stream,
+                  and with session.client_overlay the raw detections are yielded instead of render()'s output
+    tracking:     run the detector on keyframes only and track boxes in between
+    motion_gate:  skip inference on frames that haven't changed since the last one
+    motion_regions: run the detector on the changed region only (infer must be stateless)
+    """
+
+    def __init__(self, open_capture: Callable[[], Any], infer: Callable, render: Callable,
+                 should_stop: Callable[[], bool] = lambda: False, session=None, queue_size: int = 1,
+                 tracking: bool = LIVE_SETTINGS["tracking_enabled"],
+                 motion_gate: bool = LIVE_SETTINGS["motion_gating"],
+                 motion_regions: bool = LIVE_SETTINGS["motion_region_inference"]):
+        self.open_capture = open_capture
+        self.infer = infer
+        self.render = render
+        self.should_stop = should_stop
+        self.session = session
+        if session is not None:
+            session.pipeline = self
+        self.tracker = None
+        self.scheduler = None
+        if tracking:
+            self.tracker = IoUTracker(LIVE_SETTINGS["tracker_iou_threshold"], LIVE_SETTINGS["tracker_max_misses"])
+            self.scheduler = KeyframeScheduler(
+                LIVE_SETTINGS["keyframe_interval"],
+                adaptive=LIVE_SETTINGS["adaptive_keyframes"],
+                min_interval=LIVE_SETTINGS["min_keyframe_interval"],
+                max_interval=LIVE_SETTINGS["max_keyframe_interval"],
+            )
+        self.motion_gate = None
+        self.motion_regions = motion_regions
+        if motion_gate:
+            self.motion_gate = MotionGate(
+                LIVE_SETTINGS["motion_threshold"],
+                LIVE_SETTINGS["motion_pixel_threshold"],
+                max_skip=LIVE_SETTINGS["motion_max_skip"],
+            )
+        self._last_detections = None
+        self.frame_queue = queue.Queue(maxsize=queue_size)
+        self.result_queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._capture_done = threading.Event()
+        self._error = None
+        self.stats: Dict[str, Any] = {
+            "frames_captured": 0,
+            "frames_dropped": 0,
+            "frames_throttled": 0,     # skipped to stay inside the session's FPS budget
+            "frames_inferred": 0,
+            "keyframes": 0,
+            "inferences": 0,
+            "region_inferences": 0,
+            "motion_checks": 0,
+            "motion_skips": 0,
+            "inference_cpu_s": 0.0,
+            "gate_cpu_s": 0.0,
+            "frames_rendered": 0,
+            "latencies": [],        # capture -> render, seconds (last 1000 frames)
+        }
+
+    def stopped(self) -> bool:
+        return (self._stop.is_set() or self.should_stop()
+                or (self.session is not None and self.session.cancelled()))
+
+    def _capture_loop(self, cap):
+        try:
+            while not self.stopped():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if self.session is not None and not self.session.admit_frame():
+                    self.stats["frames_throttled"] += 1
+                    continue
+                self.stats["frames_captured"] += 1
+                item = (frame, time.perf_counter(), self.stats["frames_captured"])
+                if put_latest(self.frame_queue, item):
+                    self.stats["frames_dropped"] += 1
+        except Exception as e:
+            self._error = e
+        finally:
+            self._capture_done.set()
+
+    def _inference_loop(self):
+        try:
+            while not self.stopped():
+                try:
+                    frame, captured_at, frame_index = self.frame_queue.get(timeout=0.05)
+                except queue.Empty:
+                    if self._capture_done.is_set():
+                        break
+                    continue
+                detections = self.detect_or_track(frame, frame_index)
+                self.stats["frames_inferred"] += 1
+                if put_latest(self.result_queue, (frame, detections, captured_at)):
+                    self.stats["frames_dropped"] += 1
+        except Exception as e:
+            self._error = e
+            self._stop.set()
+
+    def detect_or_track(self, frame, frame_index: int):
+        """Full inference on keyframes, tracker extrapolation on every other frame"""
+        if self.tracker is not None and not self.scheduler.is_keyframe():
+            return self.tracker.predict(frame_index)
+
+        self.stats["keyframes"] += 1
+        detections = self.gated_infer(frame)
+        if self.tracker is None:
+            return detections
+        detections = self.tracker.update(detections, frame_index)
+        self.scheduler.adapt(self.tracker)
+        return detections
+
+    def gated_infer(self, frame):
+        """Run the detector unless the motion gate says the scene hasn't changed"""
+        if self.motion_gate is None:
+            return self.timed_infer(frame)
+
+        # CPU time of this (inference) thread only; process time would also bill the capture,
+        # render and other sessions' threads. Torch's intra-op pool threads are not included.
+        gate_start = time.thread_time()
+        changed, region = self.motion_gate.check(frame)
+        self.stats["gate_cpu_s"] += time.thread_time() - gate_start
+        self.stats["motion_checks"] += 1
+
+        if self._last_detections is not None and not changed:
+            self.stats["motion_skips"] += 1
+            return self._last_detections
+
+        if self._last_detections is not None and region is not None and self.motion_regions:
+            x1, y1, x2, y2 = region
+            fresh = self.timed_infer(frame[y1:y2, x1:x2])
+            self.stats["region_inferences"] += 1
+            detections = merge_region_detections(self._last_detections, fresh, region)
+        else:
+            detections = self.timed_infer(frame)
+        self._last_detections = detections
+        return detections
+
+    def timed_infer(self, frame):
+        # Sessions of one server share its model, so they take turns running it
+        with self.session.manager.inference_lock if self.session is not None else nullcontext():
+            cpu_start = time.thread_time()
+            detections = self.infer(frame)
+        self.stats["inference_cpu_s"] += time.thread_time() - cpu_start
+        self.stats["inferences"] += 1
+        return detections
+
+    def report(self) -> str:
+        """One-line session summary: throughput plus what motion gating saved"""
+        stats = self.stats
+        text = (f"📊 Live session: {stats['frames_rendered']} frames shown, "
+                f"{stats['inferences']} inferences, {stats['frames_dropped']} dropped")
+        if stats["motion_checks"]:
+            skip_rate = stats["motion_skips"] / stats["motion_checks"]
+            cpu_per_inference = stats["inference_cpu_s"] / max(stats["inferences"], 1)
+            cpu_saved = stats["motion_skips"] * cpu_per_inference - stats["gate_cpu_s"]
+            text += (f" | motion skips {stats['motion_skips']}/{stats['motion_checks']} ({skip_rate:.0%}), "
+                     f"~{cpu_saved:.1f}s CPU saved")
+        return text
+
+    def run(self):
+        """Generator yielding rendered outputs until stopped or the source ends"""
+        cap = self.open_capture()
+        if cap is None or (hasattr(cap, "isOpened") and not cap.isOpened()):
+            raise RuntimeError("⚠️ Camera not working!")
+        if hasattr(cap, "set"):
+            # Keep the driver queue short; the capture thread drains it anyway
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        workers: List[threading.Thread] = [
+            threading.Thread(target=self._capture_loop, args=(cap,), name="live-capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="live-inference", daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            while not self.stopped():
+                try:
+                    frame, detections, captured_at = self.result_queue.get(timeout=0.05)
+                except queue.Empty:
+                    if not workers[1].is_alive():
+                        break
+                    continue
+                if self.session is not None and self.session.client_overlay:
+                    # The page draws the overlay on its own video; no drawing or encoding here
+                    output = detections
+                else:
+                    if not frame.flags.writeable:
+                        # A CaptureHub frame, shared with the other sessions; draw on a private copy
+                        frame = frame.copy()
+                    output = self.render(frame, detections)
+                self.stats["frames_rendered"] += 1
+                latencies = self.stats["latencies"]
+                latencies.append(time.perf_counter() - captured_at)
+                if len(latencies) > 1000:
+                    del latencies[:len(latencies) - 1000]
+                yield output
+        finally:
+            self._stop.set()
+            for worker in workers:
+                worker.join(timeout=2)
+            cap.release()
+            print(self.report())
+
+        if self._error is not None:
+            raise self._error
+
+class ModelCadence:
+    """Per-model run cadence for multi-model live feeds.
+
+    cadence maps model name -> run every N frames. Models that are not due keep their
+    last detections, which are redrawn as-is; ages() reports how stale each result is.
+    Start offsets are staggered so slow models don't all fire on the same frame.
+    """
+
+    def __init__(self, cadence: Dict[str, int]):
+        self.cadence = {name: max(1, int(every)) for name, every in cadence.items()}
+        self.offsets = {name: i for i, name in enumerate(self.cadence)}
+        self.frame_index = -1
+        self.results: Dict[str, tuple] = {}     # name -> (detections, frame_index, timestamp)
+
+    def next_frame(self) -> List[str]:
+        """Advance one frame and return the models due to run on it"""
+        self.frame_index += 1
+        return [
+            name for name, every in self.cadence.items()
+            if name not in self.results or (self.frame_index + self.offsets[name]) % every == 0
+        ]
+
+    def update(self, name: str, detections: List[Dict]):
+        self.results[name] = (detections, self.frame_index, time.perf_counter())
+
+    def detections(self) -> List[Dict]:
+        return [det for dets, _, _ in list(self.results.values()) for det in dets]
+
+    def ages(self) -> Dict[str, tuple]:
+        """Model name -> (frames, seconds) since its result was produced"""
+        now = time.perf_counter()
+        return {
+            name: (self.frame_index - index, now - produced_at)
+            for name, (_, index, produced_at) in list(self.results.items())
+        }
+
+def draw_result_ages(frame, ages: Dict[str, tuple], color=(255, 255, 255), colors: Dict[str, tuple] = None):
+    """Overlay how old each model's result is in the top-left corner of a BGR frame"""
+    for row, (name, (frames, seconds)) in enumerate(ages.items()):
+        text_color = colors.get(name, color) if colors else color
+        text = f"{name}: {frames}f / {seconds * 1000:.0f}ms"
+        cv2.putText(frame, text, (10, 20 + row * 18), cv2.FONT_HERSHEY_SIMPLEX, 0.5, text_color, 1, cv2.LINE_AA)
+    return frame
+
+def draw_detections(frame, detections, color=(0, 255, 0), colors: Dict[str, tuple] = None):
+    """Draw detection dicts onto a BGR frame in place; per-model colors override the default"""
+    for det in detections:
+        x1, y1, x2, y2 = det["box"]
+        box_color = colors.get(det.get("model"), color) if colors else color
+        cv2.rectangle(frame, (x1, y1), (x2, y2), box_color, 3)
+        label_text = f"{det['label']} {det['confidence']:.2f}"
+        cv2.putText(frame, label_text, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, box_color, 2, cv2.LINE_AA)
+    return frame
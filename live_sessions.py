@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Live Sessions
+==============================
+Per-user state for the live camera tabs. Every "Start Camera" click gets its own
+LiveSession with a cancel token and a frame budget, so "Stop Camera" only stops the
+caller's stream and an abandoned tab stops costing CPU as soon as it is cancelled.
+
+All sessions in one server read the camera through a CaptureHub: the device is opened
+once, on the first session, and every session gets the newest frame from it instead of
+competing for the device. The hub closes the device when the last session ends.
+Sessions fed from the viewer's browser bring their own PushCapture instead.
+
+    sessions = LiveSessionManager()
+
+    with sessions.start(request.session_hash) as session:
+        yield from LivePipeline(session.open_capture, detect_frame, render_frame, session=session).run()
+"""
+
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+
+from config import LIVE_SESSION_SETTINGS
+
+class SessionLimitError(RuntimeError):
+    """Raised when a server already runs its maximum number of live sessions"""
+
+class CaptureHub:
+    """One capture shared by every session in the process (opened on demand, ref-counted)"""
+
+    def __init__(self, open_capture: Callable):
+        self.open_capture = open_capture
+        self.lock = threading.Lock()
+        self.new_frame = threading.Condition(self.lock)
+        self.readers = 0
+        self.cap = None
+        self.frame = None
+        self.seq = 0
+        self.ended = True
+        self._stop = None
+        self._thread = None
+
+    def attach(self) -> Optional["HubReader"]:
+        with self.lock:
+            if self.readers == 0 or self.ended:
+                if self.cap is not None:
+                    # The source ended while sessions were still attached; reopen it
+                    self._stop.set()
+                    self.cap.release()
+                cap = self.open_capture()
+                if cap is None or (hasattr(cap, "isOpened") and not cap.isOpened()):
+                    return None
+                self.cap, self.frame, self.ended = cap, None, False
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._read_loop, args=(cap, self._stop),
+                                                name="capture-hub", daemon=True)
+                self._thread.start()
+            self.readers += 1
+            return HubReader(self)
+
+    def detach(self):
+        with self.lock:
+            self.readers -= 1
+            if self.readers > 0:
+                return
+            stop, thread, cap = self._stop, self._thread, self.cap
+            self.cap = self._thread = None
+        stop.set()
+        thread.join(timeout=2)
+        cap.release()
+
+    def _read_loop(self, cap, stop: threading.Event):
+        try:
+            while not stop.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                # Sessions share this frame: read-only, so drawing on it fails loudly instead of
+                # leaking one session's boxes into the others (LivePipeline.run copies it first)
+                frame.flags.writeable = False
+                with self.new_frame:
+                    self.frame = frame
+                    self.seq += 1
+                    self.new_frame.notify_all()
+        finally:
+            with self.new_frame:
+                self.ended = True
+                self.new_frame.notify_all()
+
+class HubReader:
+    """cv2.VideoCapture-like view of a CaptureHub for one session"""
+
+    def __init__(self, hub: CaptureHub, timeout: float = 2.0):
+        self.hub = hub
+        self.timeout = timeout
+        self.last_seq = hub.seq
+        self.released = False
+
+    def isOpened(self) -> bool:
+        return not self.released
+
+    def set(self, prop, value) -> bool:
+        return False    # the hub owns the device
+
+    def read(self):
+        with self.hub.new_frame:
+            if not self.hub.new_frame.wait_for(lambda: self.hub.seq > self.last_seq or self.hub.ended, self.timeout):
+                return False, None
+            if self.hub.seq <= self.last_seq:
+                return False, None
+            self.last_seq = self.hub.seq
+            return True, self.hub.frame
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.hub.detach()
+
+class PushCapture:
+    """cv2.VideoCapture-like source fed with push(), e.g. frames uploaded by a browser.
+
+    read() waits up to `timeout` seconds for the next frame; only the newest pushed
+    frame is kept.
+    """
+
+    def __init__(self, timeout: float = 10.0):
+        self.frames = queue.Queue(maxsize=1)
+        self.timeout = timeout
+        self.closed = False
+
+    def push(self, frame):
+        while True:
+            try:
+                self.frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self.frames.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def isOpened(self) -> bool:
+        return not self.closed
+
+    def set(self, prop, value) -> bool:
+        return False
+
+    def read(self):
+        deadline = time.monotonic() + self.timeout
+        while not self.closed and time.monotonic() < deadline:
+            try:
+                return True, self.frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return False, None
+
+    def release(self):
+        self.closed = True
+
+class LiveSession:
+    """One user's live stream: cancel token plus frame-rate, frame-count and duration budgets.
+
+    capture: frame source for this session only (e.g. a PushCapture fed by the browser);
+             by default the session reads the server camera through the manager's hub
+    options: free-form per-session parameters (e.g. the model picked in app.py)
+
+    client_overlay: the viewer draws the boxes itself, so the pipeline skips rendering
+    """
+
+    def __init__(self, session_id: str, manager: "LiveSessionManager", max_fps: float = 0,
+                 max_frames: int = 0, max_seconds: float = 0, capture=None, options: Dict = None):
+        self.session_id = session_id
+        self.manager = manager
+        self.capture = capture
+        self.options = options or {}
+        self.client_overlay = False
+        self.pipeline = None        # the LivePipeline serving this session, for its stats
+        self.cancel_token = threading.Event()
+        self.max_fps = max_fps
+        self.max_frames = max_frames
+        self.max_seconds = max_seconds
+        self.started_at = time.monotonic()
+        self.frames = 0
+        self._next_frame_at = 0.0
+
+    def open_capture(self):
+        if self.capture is not None:
+            return self.capture
+        return self.manager.hub.attach()
+
+    def cancel(self):
+        self.cancel_token.set()
+
+    def cancelled(self) -> bool:
+        """True once stopped by the user, replaced by a newer session, or out of budget"""
+        if self.cancel_token.is_set():
+            return True
+        if self.max_frames and self.frames >= self.max_frames:
+            return True
+        if self.max_seconds and time.monotonic() - self.started_at > self.max_seconds:
+            return True
+        return False
+
+    def admit_frame(self) -> bool:
+        """Whether a captured frame fits the session's FPS budget (frames over budget are skipped)"""
+        if self.max_fps:
+            now = time.monotonic()
+            if now < self._next_frame_at:
+                return False
+            self._next_frame_at = max(self._next_frame_at + 1.0 / self.max_fps, now)
+        self.frames += 1
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cancel()
+        self.manager.remove(self)
+        return False
+
+class LiveSessionManager:
+    """Tracks the live sessions of one server and enforces LIVE_SESSION_SETTINGS"""
+
+    def __init__(self, open_capture: Callable = None, settings: Dict = LIVE_SESSION_SETTINGS):
+        if open_capture is None:
+            from live_pipeline import open_live_capture
+            open_capture = open_live_capture
+        self.hub = CaptureHub(open_capture)
+        self.settings = settings
+        # YOLO models aren't safe to call from several threads; sessions take turns
+        self.inference_lock = threading.Lock()
+        self.lock = threading.Lock()
+        self.sessions: Dict[str, LiveSession] = {}
+
+    def start(self, session_id: Optional[str] = None, capture=None, options: Dict = None) -> LiveSession:
+        """New session for this caller; a previous session with the same id is cancelled first"""
+        session_id = session_id or uuid.uuid4().hex
+        with self.lock:
+            previous = self.sessions.pop(session_id, None)
+            if previous is not None:
+                previous.cancel()
+            if len(self.sessions) >= self.settings["max_sessions"]:
+                raise SessionLimitError(f"⚠️ {len(self.sessions)} live sessions already running, try again later")
+            session = LiveSession(session_id, self, self.settings["max_fps"],
+                                  self.settings["max_frames"], self.settings["max_seconds"],
+                                  capture=capture, options=options)
+            self.sessions[session_id] = session
+            return session
+
+    def stop(self, session_id: Optional[str]):
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+        if session is not None:
+            session.cancel()
+
+    def remove(self, session: LiveSession):
+        with self.lock:
+            if self.sessions.get(session.session_id) is session:
+                del self.sessions[session.session_id]
+
+    def active(self) -> int:
+        with self.lock:
+            return len(self.sessions)
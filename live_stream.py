@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - MJPEG Live Stream
+==================================
+Serves the annotated live feed as multipart MJPEG instead of pushing one Gradio image
+update per frame. Each frame is JPEG-encoded once and written straight to the HTTP
+response; a browser shows it with a plain <img> tag.
+
+    GET /live/stream.mjpg?session=<id>&fps=<n>
+
+Every connection runs its own LiveSession (an existing session with the same id is
+replaced), capped at `fps` frames per second. When the client is slower than the
+pipeline, intermediate frames are dropped and it always gets the newest one. Closing
+the connection cancels the session, which stops its inference immediately.
+
+The model scripts embed the stream in their Gradio live tab (stream_html) and
+UI/home.html links to it directly.
+
+The same router also takes the camera from the viewer's browser instead of the server:
+
+    GET /live/browser?session=<id>      page that opens the webcam (UI/live_camera.html)
+    WS  /live/ws?session=<id>           JPEG frames up, detections (or annotated JPEGs) down
+
+Any other query parameters of the page (e.g. model=..., conf=...) are passed on to the
+socket and end up in LiveSession.options for the feed to use.
+
+The server opens the socket with a config message (frame width, FPS, JPEG quality,
+overlay mode) and the page downscales every frame to that width before sending it.
+With the default client overlay (BROWSER_CAMERA_SETTINGS["overlay"], or ?overlay=
+on the page URL) each reply is only the frame's detections,
+
+    {"type": "detections", "size": [w, h], "boxes": [[x1, y1, x2, y2, confidence, label, model], ...]}
+
+in the coordinates of the uploaded frame, and the page draws them on a canvas over
+its own video; nothing is drawn or re-encoded on the server. With ?overlay=server
+the reply is the annotated frame as a binary JPEG message instead. The page only
+sends its next frame after the previous reply arrived, and the server holds each
+reply until the next frame is due, so the server sets the frame rate and a slow
+connection or a busy model never builds up a backlog.
+"""
+
+import asyncio
+import html
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+from urllib.parse import urlencode
+
+import cv2
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from config import BROWSER_CAMERA_SETTINGS, LIVE_STREAM_SETTINGS, SUPERVISOR_SETTINGS
+from live_sessions import LiveSession, LiveSessionManager, PushCapture, SessionLimitError
+from model_registry import latency_stats
+from readiness import REPLICA_PORT_ENV, report, report_periodically
+
+BROWSER_CAMERA_PAGE = Path(__file__).parent / "UI" / "live_camera.html"
+
+BOUNDARY = "frame"
+
+def encode_mjpeg_part(frame, quality: int = LIVE_STREAM_SETTINGS["jpeg_quality"]) -> bytes:
+    """One multipart MJPEG chunk for a BGR frame"""
+    ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        return b""
+    data = jpeg.tobytes()
+    header = f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(data)}\r\n\r\n".encode()
+    return header + data + b"\r\n"
+
+def create_stream_router(sessions: LiveSessionManager,
+                         feed: Callable[[LiveSession], Iterator]) -> APIRouter:
+    """Router exposing /live/stream.mjpg and the browser camera; feed(session) yields annotated BGR frames"""
+    router = APIRouter(prefix="/live")
+
+    @router.get("/stream.mjpg")
+    async def stream(session: str = Query(None), fps: float = Query(None, gt=0)):
+        try:
+            live_session = sessions.start(session)
+        except SessionLimitError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        # Only as many frames enter the pipeline as will be sent
+        live_session.max_fps = min(fps or LIVE_STREAM_SETTINGS["max_fps"], LIVE_STREAM_SETTINGS["max_fps"])
+        frames = feed(live_session)
+
+        def parts():
+            try:
+                for frame in frames:
+                    part = encode_mjpeg_part(frame)
+                    if part:
+                        yield part
+            finally:
+                frames.close()
+
+        async def body():
+            chunks = parts()
+            try:
+                async for part in iterate_in_threadpool(chunks):
+                    yield part
+            finally:
+                # Client went away (or the session ended): free the camera and CPU now
+                live_session.cancel()
+                sessions.remove(live_session)
+                try:
+                    chunks.close()
+                except ValueError:
+                    pass    # still running in the threadpool; it stops on the cancelled session
+
+        return StreamingResponse(body(), media_type=f"multipart/x-mixed-replace; boundary={BOUNDARY}",
+                                 headers={"Cache-Control": "no-cache, no-store"})
+
+    @router.get("/browser")
+    async def browser_page():
+        return FileResponse(BROWSER_CAMERA_PAGE, headers={"Cache-Control": "no-cache"})
+
+    @router.websocket("/ws")
+    async def browser_camera(websocket: WebSocket, session: str = Query(None)):
+        await websocket.accept()
+        settings = BROWSER_CAMERA_SETTINGS
+        options = {key: value for key, value in websocket.query_params.items() if key not in ("session", "overlay")}
+        overlay = websocket.query_params.get("overlay", settings["overlay"])
+        capture = PushCapture()
+        try:
+            live_session = sessions.start(session, capture=capture, options=options)
+        except SessionLimitError as e:
+            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.close()
+            return
+        # Pacing happens here, per reply; the session must not drop the frames it is handed
+        live_session.max_fps = 0
+        live_session.client_overlay = overlay == "client"
+        frames = feed(live_session)
+        interval = 1.0 / settings["fps"]
+        await websocket.send_json({"type": "config", "max_width": settings["max_width"], "fps": settings["fps"],
+                                   "quality": settings["jpeg_quality"], "overlay": overlay})
+        next_reply_at = time.monotonic()
+        try:
+            while not live_session.cancelled():
+                data = await websocket.receive_bytes()
+                frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+                if frame is None:
+                    await websocket.send_json({"type": "error", "message": "⚠️ Could not decode frame"})
+                    continue
+                capture.push(frame)
+                output = await run_in_threadpool(next, frames, None)
+                if output is None:
+                    break
+                if live_session.client_overlay:
+                    reply = json.dumps(overlay_message(output, frame), separators=(",", ":"))
+                else:
+                    ok, jpeg = cv2.imencode(".jpg", output, [cv2.IMWRITE_JPEG_QUALITY, settings["jpeg_quality"]])
+                    reply = jpeg.tobytes() if ok else None
+                # The page sends its next frame when this reply lands, so the delay sets its frame rate
+                delay = next_reply_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_reply_at = max(next_reply_at + interval, time.monotonic())
+                if isinstance(reply, str):
+                    await websocket.send_text(reply)
+                elif reply is not None:
+                    await websocket.send_bytes(reply)
+        except WebSocketDisconnect:
+            pass
+        except RuntimeError as e:
+            # Pipeline failure (e.g. the model raised); tell the page if it is still there
+            try:
+                await websocket.send_json({"type": "error", "message": str(e)})
+            except Exception:
+                pass
+        finally:
+            live_session.cancel()
+            sessions.remove(live_session)
+            capture.release()
+            try:
+                await run_in_threadpool(frames.close)
+            except ValueError:
+                pass    # still running in the threadpool; it stops on the cancelled session
+
+    return router
+
+def overlay_message(detections, frame) -> Dict:
+    """Compact detections message for a client-drawn overlay.
+
+    detections is a model script's list of detection dicts, or a dict of them per
+    model (app.py); the model id comes from the dict key or the detection's "model".
+    """
+    if isinstance(detections, dict):
+        items = [(model, det) for model, model_detections in detections.items() for det in model_detections]
+    else:
+        items = [(det.get("model", ""), det) for det in detections]
+    height, width = frame.shape[:2]
+    return {
+        "type": "detections",
+        "size": [width, height],
+        "boxes": [[*(int(v) for v in det["box"]), round(float(det["confidence"]), 3), det["label"], model]
+                  for model, det in items],
+    }
+
+def stream_html(session_id: str, fps: float = LIVE_STREAM_SETTINGS["max_fps"]) -> str:
+    """<img> tag that shows the caller's MJPEG live stream"""
+    # The timestamp makes every Start click a new URL, so the browser reconnects
+    src = f"/live/stream.mjpg?session={html.escape(session_id or '')}&fps={fps:g}&t={time.time_ns()}"
+    return f'<img src="{src}" alt="Live Detection" style="width: 100%; border-radius: 8px;">'
+
+def browser_camera_html(session_id: str, **options) -> str:
+    """<iframe> with the browser camera page for the caller's session; options reach LiveSession.options"""
+    # The iframe gets its own document, so the page's script runs (Gradio doesn't run inline scripts)
+    query = urlencode({"session": session_id or "", **options, "t": time.time_ns()})
+    src = html.escape(f"/live/browser?{query}")
+    return (f'<iframe src="{src}" allow="camera" title="Browser Camera" '
+            f'style="width: 100%; height: 560px; border: none; border-radius: 8px;"></iframe>')
+
+def start_with_stream(demo, *routers: APIRouter, **launch_kwargs):
+    """demo.launch() without blocking, with the stream (and health) routes added to Gradio's
+    own server (so share links carry them)"""
+    replica_port = os.environ.get(REPLICA_PORT_ENV)
+    if replica_port:
+        # One of several replicas behind launch_all.py's load balancer, which owns the public port
+        launch_kwargs.update(server_port=int(replica_port), share=False)
+    demo.launch(prevent_thread_lock=True, **launch_kwargs)
+    for router in routers:
+        demo.app.include_router(router)
+
+def launch_with_stream(demo, *routers: APIRouter, **launch_kwargs):
+    """start_with_stream(), then serve until interrupted"""
+    start_with_stream(demo, *routers, **launch_kwargs)
+    report("ready", url=demo.local_url)
+    report_periodically(SUPERVISOR_SETTINGS["stats_interval"], latency_stats)
+    demo.block_thread()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Local Load Balancer
+====================================
+Sits on a model's public port and spreads its traffic over several replica servers
+(launch_all.py starts one per model whose SERVER_CONFIG entry has "replicas" > 1).
+
+Each request goes to the replica with the fewest outstanding requests, so a busy
+model can use as many cores as it has replicas. A Gradio session keeps its state
+in one process, though, so everything that belongs to a session sticks to the
+replica that served it first:
+
+    session_hash / session      query parameter, JSON body or /heartbeat/<hash> path
+    event_id                    returned by /queue/join and /call/<api>, used in later paths
+
+HTTP responses are streamed through (server-sent events and MJPEG included) and
+WebSockets (/live/ws) are relayed both ways. A replica that refuses connections is
+skipped for LOAD_BALANCER_SETTINGS["unhealthy_cooldown"] seconds.
+
+    python load_balancer.py --port 7861 --upstream 7900 7901 --name Pedestrian
+
+GET /_balancer/stats shows the per-replica counters.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+import httpx
+import uvicorn
+import websockets
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from config import LOAD_BALANCER_SETTINGS
+from readiness import report
+
+HOP_BY_HOP = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+              "te", "trailers", "transfer-encoding", "upgrade"}
+HTTP_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"]
+
+class Upstream:
+    """One replica and its load counters"""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.down_until = 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self, cooldown: float):
+        self.failures += 1
+        self.down_until = time.monotonic() + cooldown
+
+class LoadBalancer:
+    """Least-outstanding-requests replica choice with session affinity"""
+
+    def __init__(self, ports: List[int], settings: Dict = LOAD_BALANCER_SETTINGS):
+        self.upstreams = [Upstream(port) for port in ports]
+        self.settings = settings
+        self.affinity: Dict[str, tuple] = {}        # session / event id -> (upstream, last used)
+        self._last_prune = time.monotonic()
+
+    def pick(self, keys: List[str] = (), exclude: List[Upstream] = ()) -> Optional[Upstream]:
+        now = time.monotonic()
+        for key in keys:
+            pinned = self.affinity.get(key)
+            if pinned is not None and pinned[0].available() and pinned[0] not in exclude:
+                self.affinity[key] = (pinned[0], now)
+                return pinned[0]
+
+        candidates = [u for u in self.upstreams if u not in exclude]
+        healthy = [u for u in candidates if u.available()]
+        if not candidates:
+            return None
+        upstream = min(healthy or candidates, key=lambda u: (u.outstanding, u.requests))
+        for key in keys:
+            self.pin(key, upstream)
+        return upstream
+
+    def pin(self, key: str, upstream: Upstream):
+        now = time.monotonic()
+        self.affinity[key] = (upstream, now)
+        if now - self._last_prune > 60:
+            # Forget sessions idle for longer than session_ttl
+            ttl = self.settings["session_ttl"]
+            self.affinity = {k: v for k, v in self.affinity.items() if now - v[1] < ttl}
+            self._last_prune = now
+
+    def affinity_keys(self, path: str, query_params, body: bytes = b"") -> List[str]:
+        """Session hashes and known event ids this request refers to"""
+        keys = [query_params[name] for name in ("session_hash", "session") if query_params.get(name)]
+        segments = [segment for segment in path.split("/") if segment]
+        if "heartbeat" in segments[:-1]:
+            keys.append(segments[-1])
+        keys.extend(segment for segment in segments if segment in self.affinity)
+        if body and len(body) < 65536 and body[:1] == b"{":
+            try:
+                session_hash = json.loads(body).get("session_hash")
+            except (ValueError, AttributeError):
+                session_hash = None
+            if session_hash:
+                keys.append(session_hash)
+        return keys
+
+    def stats(self) -> Dict:
+        return {
+            "replicas": [{"port": u.port, "outstanding": u.outstanding, "requests": u.requests,
+                          "failures": u.failures, "available": u.available()} for u in self.upstreams],
+            "pinned_sessions": len(self.affinity),
+        }
+
+def create_app(balancer: LoadBalancer) -> Starlette:
+    settings = balancer.settings
+    client = httpx.AsyncClient(timeout=httpx.Timeout(None, connect=settings["connect_timeout"]),
+                               limits=httpx.Limits(max_connections=None, max_keepalive_connections=64))
+
+    async def stats(request: Request):
+        return JSONResponse(balancer.stats())
+
+    async def proxy_http(request: Request):
+        body = await request.body()
+        keys = balancer.affinity_keys(request.url.path, request.query_params, body)
+        headers = [(k, v) for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP]
+        target = request.url.path + (f"?{request.url.query}" if request.url.query else "")
+        tried = []
+        while True:
+            upstream = balancer.pick(keys, exclude=tried)
+            if upstream is None:
+                return PlainTextResponse("⚠️ No replica available", status_code=503)
+            upstream.outstanding += 1
+            try:
+                response = await client.send(client.build_request(request.method, upstream.url + target,
+                                                                  headers=headers, content=body), stream=True)
+                break
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # Nothing was sent yet; another replica can take it
+                upstream.outstanding -= 1
+                upstream.mark_down(settings["unhealthy_cooldown"])
+                tried.append(upstream)
+            except httpx.TransportError as e:
+                # The request may already have reached the replica; replaying it could run it twice
+                upstream.outstanding -= 1
+                upstream.mark_down(settings["unhealthy_cooldown"])
+                return PlainTextResponse(f"⚠️ Replica {upstream.port} failed: {type(e).__name__}",
+                                         status_code=502)
+
+        response_headers = [(k.encode("latin-1"), v.encode("latin-1"))
+                            for k, v in response.headers.multi_items() if k.lower() not in HOP_BY_HOP]
+
+        if request.method == "POST" and ("/queue/join" in target or "/call/" in target):
+            # Small JSON reply carrying the event id later requests will use
+            try:
+                content = await response.aread()
+            finally:
+                upstream.outstanding -= 1
+                upstream.requests += 1
+                await response.aclose()
+            try:
+                event_id = json.loads(content).get("event_id")
+            except (ValueError, AttributeError):
+                event_id = None
+            if event_id:
+                balancer.pin(event_id, upstream)
+            # aread() decoded the body, so the upstream encoding and length no longer apply
+            reply = Response(content, status_code=response.status_code)
+            reply.raw_headers = [(b"content-length", str(len(content)).encode())] + [
+                (k, v) for k, v in response_headers if k.lower() not in (b"content-length", b"content-encoding")]
+            return reply
+
+        async def stream():
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            finally:
+                upstream.outstanding -= 1
+                upstream.requests += 1
+                await response.aclose()
+
+        reply = StreamingResponse(stream(), status_code=response.status_code)
+        reply.raw_headers = response_headers
+        return reply
+
+    async def proxy_websocket(websocket: WebSocket):
+        keys = balancer.affinity_keys(websocket.url.path, websocket.query_params)
+        target = websocket.url.path + (f"?{websocket.url.query}" if websocket.url.query else "")
+        tried = []
+        while True:
+            upstream = balancer.pick(keys, exclude=tried)
+            if upstream is None:
+                await websocket.close(code=1013)
+                return
+            try:
+                remote = await websockets.connect(f"ws://127.0.0.1:{upstream.port}{target}", max_size=None,
+                                                  open_timeout=settings["connect_timeout"])
+                break
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+                upstream.mark_down(settings["unhealthy_cooldown"])
+                tried.append(upstream)
+
+        await websocket.accept()
+        upstream.outstanding += 1
+
+        async def client_to_remote():
+            try:
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        return
+                    await remote.send(message["bytes"] if message.get("bytes") is not None else message["text"])
+            except WebSocketDisconnect:
+                pass
+
+        async def remote_to_client():
+            async for message in remote:
+                if isinstance(message, bytes):
+                    await websocket.send_bytes(message)
+                else:
+                    await websocket.send_text(message)
+
+        tasks = [asyncio.create_task(client_to_remote()), asyncio.create_task(remote_to_client())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            upstream.outstanding -= 1
+            upstream.requests += 1
+            await remote.close()
+            try:
+                await websocket.close()
+            except RuntimeError:
+                pass    # already closed by the client
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await client.aclose()
+
+    return Starlette(routes=[
+        Route("/_balancer/stats", stats),
+        Route("/{path:path}", proxy_http, methods=HTTP_METHODS),
+        WebSocketRoute("/{path:path}", proxy_websocket),
+    ], lifespan=lifespan)
+
+class BalancerServer(uvicorn.Server):
+    """uvicorn server that reports "ready" to the launcher once it is listening"""
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets)
+        report("ready", url=f"http://{self.config.host}:{self.config.port}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Least-outstanding-requests balancer for model replicas")
+    parser.add_argument("--port", type=int, required=True, help="public port to listen on")
+    parser.add_argument("--upstream", type=int, nargs="+", required=True, help="replica ports")
+    parser.add_argument("--name", default="model", help="name shown in the logs")
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+
+    balancer = LoadBalancer(args.upstream)
+    print(f"⚖️  {args.name}: balancing port {args.port} over replicas {', '.join(map(str, args.upstream))}")
+    config = uvicorn.Config(create_app(balancer), host=args.host, port=args.port, log_level="warning")
+    BalancerServer(config).run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
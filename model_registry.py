@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Shared Model Registry
+======================================
+One YOLO instance per weights file per process. The model scripts load their
+weights through shared_model(), so when serve_all.py imports all five of them into
+one process each network is loaded once instead of twice (Autopilotpro.py uses
+the same four files as the single-model scripts).
+
+A shared model can be called from several UIs at once and an Ultralytics predictor
+is not thread-safe, so calls are serialized per model; every other attribute
+(names, overrides, ...) passes straight through to the YOLO object.
+
+Every call's latency (lock wait included, as the caller sees it) is recorded;
+latency_stats() summarizes them for the launcher's supervisor, and status() gives
+a model's state, queue depth and last latency for /readyz (health.py).
+
+swap() replaces the network in place (hot_reload.py): every caller keeps the same
+SharedModel, and a call binds the YOLO object it runs when it is made, so calls
+already running or queued finish on the old weights and later ones use the new.
+"""
+
+import collections
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+from ultralytics import YOLO
+
+# Call latencies (seconds) not yet collected by latency_stats()
+_latencies: "collections.deque[float]" = collections.deque(maxlen=10000)
+
+class QueueLock:
+    """Re-entrant lock that counts the threads holding or waiting for it"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._held = threading.local()
+        self._count_lock = threading.Lock()
+        self.depth = 0
+
+    def __enter__(self):
+        level = getattr(self._held, "level", 0)
+        if level == 0:
+            with self._count_lock:
+                self.depth += 1
+        self._lock.acquire()
+        self._held.level = level + 1
+        return self
+
+    def __exit__(self, *exc):
+        self._held.level -= 1
+        self._lock.release()
+        if self._held.level == 0:
+            with self._count_lock:
+                self.depth -= 1
+
+class SharedModel:
+    """A YOLO model whose inference calls are serialized"""
+
+    def __init__(self, model: YOLO, path: Optional[str] = None):
+        self.model = model
+        self.path = path
+        # Callers that run several calls as one unit (app.py's model_locks) hold it around them
+        self.lock = QueueLock()
+        self.calls = 0
+        self.last_latency: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.reloads = 0
+
+    def _run(self, method, args, kwargs):
+        started = time.perf_counter()
+        try:
+            with self.lock:
+                result = method(*args, **kwargs)
+            self.last_error = None
+            return result
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.calls += 1
+            self.last_latency = time.perf_counter() - started
+            _latencies.append(self.last_latency)
+
+    def __call__(self, *args, **kwargs):
+        return self._run(self.model, args, kwargs)
+
+    def predict(self, *args, **kwargs):
+        return self._run(self.model.predict, args, kwargs)
+
+    def status(self) -> Dict:
+        """warm once a call succeeded (warm-up included), failing while the last call raised"""
+        state = "failing" if self.last_error else "warm" if self.calls else "loaded"
+        return {
+            "state": state,
+            "calls": self.calls,
+            "queue_depth": self.lock.depth,
+            "last_latency_ms": round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            "last_error": self.last_error,
+            "reloads": self.reloads,
+        }
+
+    def swap(self, model: YOLO):
+        """Serve `model` from now on; a single assignment, so no call ever sees a half-swapped model"""
+        self.model = model
+        self.last_error = None
+        self.reloads += 1
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+_models: Dict[str, SharedModel] = {}
+_registry_lock = threading.Lock()
+
+def shared_model(path: str) -> SharedModel:
+    """The process-wide model for a weights file, loaded on first use"""
+    key = os.path.realpath(path)
+    with _registry_lock:
+        if key not in _models:
+            _models[key] = SharedModel(YOLO(key), key)
+        return _models[key]
+
+def release_models():
+    """Forget every loaded model, so it is freed once its last user drops it (benchmark_live.py).
+    The registry otherwise keeps each model for the life of the process."""
+    with _registry_lock:
+        _models.clear()
+
+def loaded_models() -> Dict[str, SharedModel]:
+    """Weights path -> model, for everything loaded so far"""
+    return dict(_models)
+
+def latency_stats() -> Dict:
+    """Number of model calls and their p99 latency (ms) since the previous call"""
+    calls = []
+    while _latencies:
+        calls.append(_latencies.popleft())
+    if not calls:
+        return {"calls": 0, "p99_ms": None}
+    return {"calls": len(calls), "p99_ms": round(float(np.percentile(calls, 99)) * 1000, 1)}
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Motion Gate
+============================
+Cheap change detector that sits in front of live inference. Frames are reduced to a
+small grayscale thumbnail and compared with the thumbnail of the last frame that was
+actually sent to the detector; if too few pixels changed, the previous detections are
+reused instead of running YOLO again.
+
+The gate can also report the bounding box of the changed area so the caller can run
+the detector on that region only.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+Region = Tuple[int, int, int, int]
+
+class MotionGate:
+    """Downsampled frame-difference gate.
+
+    threshold:        fraction of thumbnail pixels that must change to count as motion
+    pixel_threshold:  per-pixel absolute difference (0-255) that counts as changed
+    width:            thumbnail width; height follows the frame aspect ratio
+    max_skip:         force a fresh inference after this many consecutive skips
+    max_region:       changed regions larger than this fraction of the frame are reported as None
+    padding:          fraction of the frame size added around a changed region
+    """
+
+    def __init__(self, threshold: float = 0.01, pixel_threshold: int = 25, width: int = 64,
+                 max_skip: int = 30, max_region: float = 0.5, padding: float = 0.05):
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.width = width
+        self.max_skip = max_skip
+        self.max_region = max_region
+        self.padding = padding
+        self.reference: Optional[np.ndarray] = None
+        self.skipped = 0
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        height = max(1, round(self.width * gray.shape[0] / gray.shape[1]))
+        small = cv2.resize(gray, (self.width, height), interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(small, (3, 3), 0)
+
+    def check(self, frame: np.ndarray) -> Tuple[bool, Optional[Region]]:
+        """Return (changed, region). region is the changed area in frame pixels, or None for the whole frame."""
+        thumb = self._thumbnail(frame)
+        if self.reference is None or self.reference.shape != thumb.shape or self.skipped >= self.max_skip:
+            self.reference = thumb
+            self.skipped = 0
+            return True, None
+
+        mask = cv2.absdiff(thumb, self.reference) > self.pixel_threshold
+        if mask.mean() < self.threshold:
+            # Keep the old reference so slow drift accumulates until it crosses the threshold
+            self.skipped += 1
+            return False, None
+
+        self.reference = thumb
+        self.skipped = 0
+        return True, self._region(mask, frame.shape)
+
+    def _region(self, mask: np.ndarray, frame_shape) -> Optional[Region]:
+        ys, xs = np.nonzero(mask)
+        frame_h, frame_w = frame_shape[:2]
+        scale_x = frame_w / mask.shape[1]
+        scale_y = frame_h / mask.shape[0]
+        pad_x, pad_y = int(frame_w * self.padding), int(frame_h * self.padding)
+
+        x1 = max(0, int(xs.min() * scale_x) - pad_x)
+        y1 = max(0, int(ys.min() * scale_y) - pad_y)
+        x2 = min(frame_w, int((xs.max() + 1) * scale_x) + pad_x)
+        y2 = min(frame_h, int((ys.max() + 1) * scale_y) + pad_y)
+
+        if (x2 - x1) * (y2 - y1) > self.max_region * frame_w * frame_h:
+            return None
+        return x1, y1, x2, y2
+
+def boxes_overlap(box, region: Region) -> bool:
+    return box[0] < region[2] and box[2] > region[0] and box[1] < region[3] and box[3] > region[1]
+
+def merge_region_detections(previous: List[Dict], fresh: List[Dict], region: Region) -> List[Dict]:
+    """Shift region-relative detections into frame coordinates and replace the stale ones inside the region"""
+    x_off, y_off = region[0], region[1]
+    shifted = []
+    for det in fresh:
+        x1, y1, x2, y2 = det["box"]
+        shifted.append({**det, "box": [x1 + x_off, y1 + y_off, x2 + x_off, y2 + y_off]})
+    kept = [det for det in previous if not boxes_overlap(det["box"], region)]
+    return kept + shifted
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Multi-Stream Engine
+====================================
+Watches several video sources at once from a single process. Each source is read on
+its own thread, which only ever keeps that stream's newest frame. One engine thread
+collects the newest unprocessed frame from every stream and runs them through each
+model as a single batch, so N cameras cost one forward pass per model instead of N.
+
+Results go back to the stream they came from (latest(stream_id)), and report() gives
+per-stream FPS / latency plus the total throughput.
+
+Used by the "Multi-Camera" tab in app.py, and from the command line:
+
+    python multi_stream.py 0 drive.mp4 http://127.0.0.1:8090/stream.mjpg --models Pedestrian --seconds 30
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import MULTI_STREAM_SETTINGS, PERFORMANCE, TRAFFIC_SIGN_TRANSLATIONS
+from inference_api import detect_batch
+from video_sources import open_video_source
+
+class StreamState:
+    """One source: its reader thread, newest frame, newest result and stats"""
+
+    def __init__(self, stream_id: int, source):
+        self.stream_id = stream_id
+        self.source = source
+        self.cap = open_video_source(source)
+        self.lock = threading.Lock()
+        self.frame = None               # (frame, captured_at, seq) not yet processed
+        self.result = None              # (frame, detections per model, captured_at)
+        self.seq = 0
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.latencies = deque(maxlen=1000)     # capture -> result, seconds
+        self.ended = False
+
+    def opened(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    def read_loop(self, stop: threading.Event):
+        try:
+            while not stop.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                with self.lock:
+                    if self.frame is not None:
+                        self.frames_dropped += 1    # engine never got to the previous one
+                    self.seq += 1
+                    self.frames_captured += 1
+                    self.frame = (frame, time.perf_counter(), self.seq)
+        finally:
+            self.ended = True
+
+    def take_frame(self):
+        """Hand the newest unprocessed frame to the engine (or None)"""
+        with self.lock:
+            item, self.frame = self.frame, None
+        return item
+
+    def publish(self, frame, detections: Dict[str, List[Dict]], captured_at: float):
+        now = time.perf_counter()
+        with self.lock:
+            self.result = (frame, detections, captured_at)
+            self.frames_processed += 1
+            self.latencies.append(now - captured_at)
+
+class MultiStreamEngine:
+    """Cross-stream batching engine.
+
+    sources: camera indexes, files, image folders or stream URLs (see video_sources.py)
+    models:  model name -> loaded YOLO model
+    locks:   optional model name -> lock, when the models are shared with other callers
+    """
+
+    def __init__(self, sources: List, models: Dict, confidence_threshold: float = PERFORMANCE["live_confidence_threshold"],
+                 locks: Optional[Dict[str, threading.Lock]] = None):
+        self.streams = [StreamState(i, source) for i, source in enumerate(sources)]
+        self.models = models
+        self.confidence_threshold = confidence_threshold
+        self.locks = locks
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.batches = 0
+        self.batch_frames = 0
+        self.started_at = None
+        self.error: Optional[str] = None     # why the engine thread stopped early, if it failed
+
+    def start(self):
+        for stream in self.streams:
+            if not stream.opened():
+                self.stop()
+                raise RuntimeError(f"⚠️ Could not open stream {stream.stream_id}: {stream.source!r}")
+        self.started_at = time.perf_counter()
+        for stream in self.streams:
+            self._threads.append(threading.Thread(target=stream.read_loop, args=(self._stop,),
+                                                  name=f"stream-{stream.stream_id}", daemon=True))
+        self._threads.append(threading.Thread(target=self._engine_loop, name="multi-stream-engine", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        for stream in self.streams:
+            if stream.cap is not None:
+                stream.cap.release()
+
+    def running(self) -> bool:
+        return not self._stop.is_set() and not all(stream.ended for stream in self.streams)
+
+    def _collect(self) -> List:
+        """Newest unprocessed frame of every stream, waiting up to batch_window_ms for stragglers"""
+        pending, waiting = [], list(self.streams)
+        deadline = None
+        while waiting and not self._stop.is_set():
+            for stream in list(waiting):
+                item = stream.take_frame()
+                if item is not None:
+                    pending.append((stream, item))
+                    waiting.remove(stream)
+                elif stream.ended:
+                    waiting.remove(stream)
+            if not waiting:
+                break
+            if pending and deadline is None:
+                deadline = time.perf_counter() + MULTI_STREAM_SETTINGS["batch_window_ms"] / 1000
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            time.sleep(0.001)
+        return pending
+
+    def _engine_loop(self):
+        try:
+            self._process_batches()
+        except Exception as e:
+            # Stop the streams too, so running() turns False and callers can show the error
+            self.error = f"{type(e).__name__}: {e}"
+            self._stop.set()
+
+    def _process_batches(self):
+        while not self._stop.is_set():
+            pending = self._collect()
+            if not pending:
+                if all(stream.ended for stream in self.streams):
+                    break
+                continue
+
+            frames = [frame for _, (frame, _, _) in pending]
+            per_stream = [dict() for _ in pending]
+            for model_name, model in self.models.items():
+                translate = (lambda label: TRAFFIC_SIGN_TRANSLATIONS.get(label, label)) if model_name == "TrafficSign" else None
+                with self.locks[model_name] if self.locks else nullcontext():
+                    # One forward pass per model covering every stream with a new frame
+                    results = detect_batch(model, frames, self.confidence_threshold,
+                                           translate=translate, batch_size=len(frames))
+                for stream_detections, detections in zip(per_stream, results):
+                    stream_detections[model_name] = detections
+
+            self.batches += 1
+            self.batch_frames += len(frames)
+            for (stream, (frame, captured_at, _)), detections in zip(pending, per_stream):
+                stream.publish(frame, detections, captured_at)
+
+    def latest(self, stream_id: int):
+        """(frame, detections per model, captured_at) of the newest processed frame, or None"""
+        stream = self.streams[stream_id]
+        with stream.lock:
+            return stream.result
+
+    def report(self) -> Dict:
+        """Per-stream FPS / latency percentiles and total throughput"""
+        elapsed = max(time.perf_counter() - (self.started_at or time.perf_counter()), 1e-6)
+        streams = []
+        for stream in self.streams:
+            with stream.lock:
+                latencies = np.array(stream.latencies) * 1000 if stream.latencies else np.zeros(1)
+                streams.append({
+                    "stream": stream.stream_id,
+                    "source": str(stream.source),
+                    "fps": stream.frames_processed / elapsed,
+                    "frames_processed": stream.frames_processed,
+                    "frames_dropped": stream.frames_dropped,
+                    "latency_p50_ms": float(np.percentile(latencies, 50)),
+                    "latency_p95_ms": float(np.percentile(latencies, 95)),
+                })
+        total = sum(s["frames_processed"] for s in streams)
+        return {
+            "elapsed": elapsed,
+            "streams": streams,
+            "total_fps": total / elapsed,
+            "batches": self.batches,
+            "mean_batch_size": self.batch_frames / max(self.batches, 1),
+        }
+
+def format_report(report: Dict) -> str:
+    lines = [f"📹 Stream {s['stream']} ({s['source']}): {s['fps']:.1f} FPS | "
+             f"latency p50 {s['latency_p50_ms']:.0f}ms / p95 {s['latency_p95_ms']:.0f}ms | "
+             f"{s['frames_dropped']} dropped"
+             for s in report["streams"]]
+    lines.append(f"⚡ Total: {report['total_fps']:.1f} FPS across {len(report['streams'])} streams "
+                 f"(mean batch {report['mean_batch_size']:.1f})")
+    return "\n".join(lines)
+
+def main():
+    from config import MODEL_FILES
+    from video_processing import load_models
+
+    parser = argparse.ArgumentParser(description="Watch several video sources with one batched engine")
+    parser.add_argument("sources", nargs="+", help="camera indexes, video files, image folders or stream URLs")
+    parser.add_argument("--models", nargs="+", default=list(MODEL_FILES), choices=list(MODEL_FILES))
+    parser.add_argument("--conf", type=float, default=PERFORMANCE["live_confidence_threshold"])
+    parser.add_argument("--seconds", type=float, default=30, help="how long to run")
+    args = parser.parse_args()
+
+    if len(args.sources) > MULTI_STREAM_SETTINGS["max_streams"]:
+        print(f"❌ At most {MULTI_STREAM_SETTINGS['max_streams']} streams (MULTI_STREAM_SETTINGS['max_streams'])")
+        return 1
+
+    engine = MultiStreamEngine(args.sources, load_models(args.models), args.conf)
+    try:
+        engine.start()
+    except RuntimeError as e:
+        print(e)
+        return 1
+
+    deadline = time.monotonic() + args.seconds
+    try:
+        while engine.running() and time.monotonic() < deadline:
+            time.sleep(MULTI_STREAM_SETTINGS["report_interval"])
+            print(format_report(engine.report()) + "\n")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop()
+    if engine.error:
+        print(f"❌ Engine stopped: {engine.error}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
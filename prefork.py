@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Pre-fork Server
+================================
+Serves app.py from several processes without loading the models several times.
+The parent imports app.py (loading all four models), warms them up and only then
+forks the workers. Every worker starts with the weights already in memory and
+shares those pages with the parent copy-on-write, so N workers cost roughly one
+set of weights plus their own activations, and a worker starts in milliseconds.
+
+    parent      loads + warms the models, binds every socket, forks and re-forks children
+    workers     app.create_app() on 127.0.0.1:<worker_base_port + i>
+    balancer    load_balancer.py's proxy on the public port (a Gradio session stays on one worker)
+
+A worker that dies is replaced after PREFORK_SETTINGS["respawn_delay"] seconds. Its
+listening socket stays open in the parent, so connections made in the meantime
+wait in the backlog instead of failing. Needs os.fork (Linux / macOS).
+
+    python prefork.py --workers 4
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Callable, Dict, List, Tuple
+
+import uvicorn
+
+from config import CPU_BUDGET_SETTINGS, PREFORK_SETTINGS
+from cpu_budget import apply_cpu_plan, describe, plan_cpu
+from load_balancer import BalancerServer, LoadBalancer, create_app as create_balancer_app
+from readiness import report
+
+class Shutdown(Exception):
+    """SIGINT / SIGTERM in the parent"""
+
+def set_torch_threads(count: int):
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(count)
+
+def describe_exit(status: int) -> str:
+    if os.WIFSIGNALED(status):
+        return f"signal {os.WTERMSIG(status)}"
+    return f"exit code {os.WEXITSTATUS(status)}"
+
+class PreforkServer:
+    """Forks the workers and the balancer from a parent that already holds the models"""
+
+    def __init__(self, application, workers: int, host: str, port: int, settings: Dict = PREFORK_SETTINGS):
+        self.application = application
+        self.settings = settings
+        self.host = host
+        self.port = port
+        # Bound once here, so a replacement worker takes over its predecessor's socket
+        self.worker_sockets = [socket.create_server(("127.0.0.1", settings["worker_base_port"] + index))
+                               for index in range(workers)]
+        self.public_socket = socket.create_server((host, port))
+        # Each worker gets its own slice of the cores rather than one thread per core
+        self.cpu_plan = (plan_cpu({f"Worker {index + 1}": (1, 1) for index in range(workers)})
+                         if CPU_BUDGET_SETTINGS["enabled"] else {})
+        self.children: Dict[int, Tuple[str, Callable]] = {}     # pid -> (name, entry point)
+
+    @property
+    def worker_ports(self) -> List[int]:
+        return [sock.getsockname()[1] for sock in self.worker_sockets]
+
+    def spawn(self, name: str, target: Callable):
+        pid = os.fork()
+        if pid:
+            self.children[pid] = (name, target)
+            return
+        # Child: never returns into the parent's loop
+        code = 1
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            target()
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def close_sockets(self, keep: socket.socket = None):
+        for sock in self.worker_sockets + [self.public_socket]:
+            if sock is not keep:
+                sock.close()
+
+    def serve_worker(self, index: int):
+        sock = self.worker_sockets[index]
+        self.close_sockets(keep=sock)
+        entry = self.cpu_plan.get(f"Worker {index + 1}")
+        if entry:
+            apply_cpu_plan(entry)
+        else:
+            set_torch_threads(os.cpu_count() or 1)     # undo the parent's single-threaded warm-up
+        config = uvicorn.Config(self.application.create_app(), host="127.0.0.1",
+                                port=sock.getsockname()[1], log_level="warning")
+        uvicorn.Server(config).run(sockets=[sock])
+
+    def serve_balancer(self):
+        ports = self.worker_ports
+        self.close_sockets(keep=self.public_socket)
+        config = uvicorn.Config(create_balancer_app(LoadBalancer(ports)), host=self.host,
+                                port=self.port, log_level="warning")
+        BalancerServer(config).run(sockets=[self.public_socket])
+
+    def run(self):
+        def on_signal(signum, frame):
+            raise Shutdown()
+        signal.signal(signal.SIGINT, on_signal)
+        signal.signal(signal.SIGTERM, on_signal)
+
+        for index in range(len(self.worker_sockets)):
+            self.spawn(f"Worker {index + 1}", lambda index=index: self.serve_worker(index))
+        self.spawn("Balancer", self.serve_balancer)
+
+        try:
+            while True:
+                pid, status = os.wait()
+                child = self.children.pop(pid, None)
+                if child is None:
+                    continue
+                name, target = child
+                print(f"⚠️  {name} (pid {pid}) exited with {describe_exit(status)}, "
+                      f"restarting in {self.settings['respawn_delay']}s")
+                time.sleep(self.settings["respawn_delay"])
+                self.spawn(name, target)
+        except Shutdown:
+            self.stop()
+
+    def stop(self):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        print("🛑 Stopping workers...")
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.settings["shutdown_timeout"]
+        while self.children and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid:
+                self.children.pop(pid, None)
+            else:
+                time.sleep(0.1)
+        for pid in list(self.children):
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.children.clear()
+        self.close_sockets()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve app.py from pre-forked workers sharing one copy of the models")
+    parser.add_argument("--workers", type=int, default=PREFORK_SETTINGS["workers"])
+    parser.add_argument("--host", default=os.getenv("GRADIO_SERVER_NAME", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("GRADIO_SERVER_PORT", "7860")))
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        print("❌ Pre-fork mode needs os.fork (Linux / macOS); run app.py instead")
+        return 1
+    report("started")
+
+    # An OpenMP pool started in the parent is unusable in forked children: warm up single-threaded
+    set_torch_threads(1)
+    # Loads and warms the models. The first prediction also fuses Conv+BN, replacing the weight
+    # tensors; done once, here, the workers share the fused weights instead of each making its own
+    import app as application
+    # Keep the garbage collector from writing to (and so un-sharing) every inherited object
+    gc.freeze()
+
+    server = PreforkServer(application, args.workers, args.host, args.port)
+    print(f"🍴 Forking {args.workers} workers on ports {', '.join(map(str, server.worker_ports))}, "
+          f"balanced on http://{args.host}:{args.port}")
+    for name, entry in server.cpu_plan.items():
+        print(f"   {name}: {describe(entry)}")
+    server.run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
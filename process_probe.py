@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Process Probe
+==============================
+Resource usage of a running process, read from /proc on Linux and through psutil
+(if installed) elsewhere. Used by launch_all.py's supervisor for the servers' RSS
+and by soak_test.py for its leak trends. Standard library only, so the launcher
+can import it before its dependency check.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+class ProcessProbe:
+    """RSS, open file handles and thread count of a process (Linux /proc, else psutil)"""
+
+    def __init__(self, pid: Optional[int] = None):
+        self.pid = pid or os.getpid()
+        self.proc = Path(f"/proc/{self.pid}")
+        self.psutil_process = None
+        if not self.proc.exists():
+            try:
+                import psutil
+            except ImportError:
+                return
+            try:
+                self.psutil_process = psutil.Process(self.pid)
+            except psutil.Error as e:
+                raise ProcessLookupError(f"No process {self.pid}") from e
+
+    def sample(self) -> Dict:
+        """Raises OSError (or KeyError for a zombie's /proc entry) once the process has exited"""
+        if self.proc.exists():
+            status = {}
+            for line in (self.proc / "status").read_text().splitlines():
+                key, _, value = line.partition(":")
+                status[key] = value.split()
+            return {
+                "rss_mb": round(int(status["VmRSS"][0]) / 1024, 1),
+                "open_files": len(os.listdir(self.proc / "fd")),
+                "threads": int(status["Threads"][0]),
+            }
+        if self.psutil_process is not None:
+            import psutil
+            process = self.psutil_process
+            try:
+                handles = process.num_handles() if hasattr(process, "num_handles") else process.num_fds()
+                return {
+                    "rss_mb": round(process.memory_info().rss / 2**20, 1),
+                    "open_files": handles,
+                    "threads": process.num_threads(),
+                }
+            except psutil.Error as e:
+                raise ProcessLookupError(f"No process {self.pid}") from e
+        return {"rss_mb": None, "open_files": None, "threads": None}
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Readiness Signalling
+=====================================
+Model servers tell launch_all.py how far their startup got, instead of the launcher
+polling every port with full page requests. Each stage is one JSON line sent over a
+local TCP socket the launcher listens on:
+
+    report("started")          imports done (gradio / ultralytics / torch are heavy)
+    report("models_loaded")    weights in memory
+    warm_up(model, ...)        one inference on a blank frame, then reports "warmed"
+    report("ready")            HTTP server accepting requests (live_stream.launch_with_stream)
+
+Once ready, servers keep sending "stats" events (model-call p99 latency) that the
+launcher's supervisor uses to recycle a server that has become slow.
+
+The launcher passes its address and the server's id through AUTOPILOT_READY_ADDRESS
+and AUTOPILOT_SERVER_ID; without them (script started by hand) every call is a no-op.
+Replicas behind load_balancer.py also get AUTOPILOT_SERVER_PORT, the port to serve on.
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+READY_ADDRESS_ENV = "AUTOPILOT_READY_ADDRESS"
+SERVER_ID_ENV = "AUTOPILOT_SERVER_ID"
+# Set for replicas behind load_balancer.py: the port to serve on instead of the script's own
+REPLICA_PORT_ENV = "AUTOPILOT_SERVER_PORT"
+
+# ============================================================================
+# SERVER SIDE (model scripts)
+# ============================================================================
+
+def report(stage: str, **info):
+    """Tell the launcher this process reached `stage` (no-op outside launch_all.py)"""
+    address = os.environ.get(READY_ADDRESS_ENV)
+    if not address:
+        return
+    host, port = address.rsplit(":", 1)
+    event = {"server": os.environ.get(SERVER_ID_ENV), "stage": stage, "time": time.time(),
+             "pid": os.getpid(), **info}
+    try:
+        with socket.create_connection((host, int(port)), timeout=2) as conn:
+            conn.sendall((json.dumps(event) + "\n").encode())
+    except OSError:
+        pass    # launcher gone; the server itself is unaffected
+
+def warm_up(*models, size: int = 640):
+    """Run each model once on a blank frame so the first real request skips lazy initialisation"""
+    blank = np.zeros((size, size, 3), dtype=np.uint8)
+    for model in models:
+        try:
+            model(blank, verbose=False)
+        except Exception as e:
+            print(f"⚠️  Warm-up inference failed: {e}")
+    report("warmed")
+
+def report_periodically(interval: float, collect: Callable[[], Dict]) -> Optional[threading.Thread]:
+    """Send report("stats", **collect()) every `interval` seconds (no-op outside launch_all.py)"""
+    if not os.environ.get(READY_ADDRESS_ENV) or interval <= 0:
+        return None
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            report("stats", **collect())
+
+    thread = threading.Thread(target=loop, name="stats-report", daemon=True)
+    thread.start()
+    return thread
+
+# ============================================================================
+# LAUNCHER SIDE
+# ============================================================================
+
+class ReadinessListener:
+    """Collects startup events from child servers; read them from `events` (a queue of dicts)"""
+
+    def __init__(self):
+        self.events: "queue.Queue[Dict]" = queue.Queue()
+        events = self.events
+
+        class EventHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        events.put(json.loads(line))
+                    except ValueError:
+                        pass
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), EventHandler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def child_env(self, server_id: str) -> Dict[str, str]:
+        """Environment for a child process that should report to this listener"""
+        return {**os.environ, READY_ADDRESS_ENV: self.address, SERVER_ID_ENV: server_id}
+
+    def start(self) -> "ReadinessListener":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="readiness", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Single-Process Server
+======================================
+Runs all five model UIs in one Python process. Under launch_all.py every script is
+its own process, and Autopilotpro.py loads the four networks a second time: eight
+model copies and five runtimes for four distinct networks. Here the scripts are
+imported side by side and load their weights through model_registry, so each
+network is in memory once and shared by every UI that uses it.
+
+Each UI keeps its usual port from SERVER_CONFIG, so UI/home.html's iframes and the
+/live stream routes work unchanged.
+
+    python serve_all.py
+    python launch_all.py --single-process
+"""
+
+import argparse
+import importlib.util
+import sys
+from pathlib import Path
+
+from config import SERVER_CONFIG, SUPERVISOR_SETTINGS
+from health import create_health_router
+from hot_reload import enable_hot_reload
+from live_stream import create_stream_router, start_with_stream
+from model_registry import latency_stats, loaded_models
+from readiness import report, report_periodically
+
+BASE_DIR = Path(__file__).parent
+
+def import_script(key: str, path: Path):
+    """Import a model script as a module (its own launch is guarded by __main__)"""
+    spec = importlib.util.spec_from_file_location(f"autopilot_{key.lower()}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve every model UI from one process with shared models")
+    parser.add_argument("--only", nargs="+", choices=list(SERVER_CONFIG), default=None,
+                        help="UIs to serve (default: every enabled one)")
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+
+    keys = args.only or [key for key, cfg in SERVER_CONFIG.items() if cfg.get("enabled", True)]
+    if not keys:
+        print("❌ No model enabled in SERVER_CONFIG")
+        return 1
+    apps = []
+    for key in keys:
+        cfg = SERVER_CONFIG[key]
+        print(f"{cfg['icon']} Loading {cfg['name']}...")
+        apps.append((key, cfg, import_script(key, BASE_DIR / cfg["script"])))
+    print(f"🧠 {len(loaded_models())} distinct models in memory for {len(apps)} UIs")
+
+    for key, cfg, module in apps:
+        # The combined script holds a dict of models, the others a single model
+        models = module.models if hasattr(module, "models") else {key: module.model}
+        start_with_stream(module.demo, create_stream_router(module.live_sessions, module.process_camera_feed),
+                          create_health_router(models, module.live_sessions), enable_hot_reload(models),
+                          server_name=args.host, server_port=cfg["port"], quiet=True)
+        print(f"  ✅ {cfg['icon']} {cfg['name']:<28} {module.demo.local_url}")
+    report("ready", url=apps[0][2].demo.local_url)
+    report_periodically(SUPERVISOR_SETTINGS["stats_interval"], latency_stats)
+
+    try:
+        apps[0][2].demo.block_thread()
+    finally:
+        for _, _, module in apps[1:]:
+            module.demo.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
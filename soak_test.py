@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Soak Test
+==========================
+Runs a workload for hours and watches for slow leaks and drift that a short
+benchmark never shows: retained YOLO Results or PIL images, queues that keep
+growing, file handles or threads that are never closed, latency creeping up.
+
+Two workloads:
+
+    live    a model script's process_camera_feed() on a synthetic camera
+            (same setup as benchmark_live.py), measured in this process
+    api     a stream of image uploads to a running app.py's /v1/detect/<model>;
+            pass the server's --pid to watch its resources instead of ours
+
+Every SOAK_SETTINGS["sample_interval"] seconds one JSON line is printed with RSS,
+open file handles, thread count, failed requests and the latency percentiles of
+that interval. At the end the trends after the warm-up are fitted and a summary
+line lists every finding (RSS slope, handle/thread growth, p95 latency drift,
+failed requests). The exit code is 1 when anything was flagged, and 2 when the
+watched process's resources could not be read at all (not measurable).
+
+    python soak_test.py live --target Pedestrian --hours 12 > soak.jsonl
+    python soak_test.py api --url http://127.0.0.1:7860 --model LTV_HTV --pid 4242 --hours 2
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import cv2
+import numpy as np
+
+from config import SOAK_SETTINGS
+from process_probe import ProcessProbe
+from video_sources import list_images
+
+BASE_DIR = Path(__file__).parent
+
+def latency_percentiles(latencies_ms: List[float]) -> Dict:
+    if not latencies_ms:
+        return {"p50": None, "p95": None, "p99": None}
+    values = np.array(latencies_ms)
+    return {name: round(float(np.percentile(values, q)), 2) for name, q in (("p50", 50), ("p95", 95), ("p99", 99))}
+
+def live_workload(target: str, source, fps: float, width: int, height: int) -> Iterator[Tuple[List[float], int]]:
+    """Drive a model script's live loop; yields the new capture -> display latencies (ms) per frame"""
+    from benchmark_live import LIVE_SCRIPTS, SyntheticLiveFeed
+
+    feed = SyntheticLiveFeed(target, source or str(BASE_DIR / LIVE_SCRIPTS[target][1]), fps, width, height)
+    try:
+        rendered = 0
+        for _ in feed.frames:
+            stats = feed.stats
+            new = stats["frames_rendered"] - rendered
+            rendered = stats["frames_rendered"]
+            yield ([latency * 1000 for latency in stats["latencies"][-new:]] if new else []), 0
+    finally:
+        feed.close()
+
+def api_workload(url: str, model: str, source: str, rate: float) -> Iterator[Tuple[List[float], int]]:
+    """Upload images one after another (at most `rate` per second); yields each request's latency (ms)
+    or, for a failed request, a failure count"""
+    import requests
+
+    images = []
+    for path in list_images(source):
+        frame = cv2.imread(path)
+        if frame is not None:
+            images.append(cv2.imencode(".jpg", frame)[1].tobytes())
+    if not images:
+        raise FileNotFoundError(f"No images found in {source}")
+
+    endpoint = f"{url.rstrip('/')}/v1/detect/{model}"
+    interval = 1.0 / rate if rate else 0.0
+    with requests.Session() as http:
+        for data in itertools.cycle(images):
+            started = time.perf_counter()
+            try:
+                response = http.post(endpoint, data=data, headers={"Content-Type": "image/jpeg"}, timeout=60)
+            except requests.RequestException as e:
+                # A restart or a hung request is a finding, not the end of the run
+                print(f"⚠️  {endpoint}: {type(e).__name__}: {e}", file=sys.stderr)
+                yield [], 1
+                time.sleep(max(interval, 1.0))      # don't spin while the server is down
+                continue
+            latency = (time.perf_counter() - started) * 1000
+            if response.status_code != 200:
+                print(f"⚠️  {endpoint}: HTTP {response.status_code}", file=sys.stderr)
+                yield [], 1
+            else:
+                yield [latency], 0
+            if interval and interval > latency / 1000:
+                time.sleep(interval - latency / 1000)
+
+def soak(workload: Iterator[Tuple[List[float], int]], probe: ProcessProbe, duration: float,
+         interval: float) -> List[Dict]:
+    """Run the workload for `duration` seconds, printing and returning one sample per interval"""
+    samples = []
+    window: List[float] = []
+    events = failed = 0
+    start = time.monotonic()
+    next_sample = start + interval
+    try:
+        for latencies, failures in workload:
+            window.extend(latencies)
+            events += 1
+            failed += failures
+            now = time.monotonic()
+            if now < next_sample:
+                continue
+            sample = {"type": "sample", "elapsed": round(now - start, 1), "events": events, "failed": failed,
+                      **probe.sample(), "latency_ms": latency_percentiles(window)}
+            samples.append(sample)
+            print(json.dumps(sample), flush=True)
+            window, events, failed = [], 0, 0
+            while next_sample <= now:
+                next_sample += interval     # a stall shouldn't produce a burst of catch-up samples
+            if now - start >= duration:
+                break
+    except KeyboardInterrupt:
+        print("⏹️  Interrupted, analysing what was collected", file=sys.stderr)
+    finally:
+        workload.close()
+    return samples
+
+def analyze(samples: List[Dict], settings: Dict = SOAK_SETTINGS) -> List[str]:
+    """Findings from the post-warm-up trend of every metric (empty list = healthy)"""
+    findings = []
+    failed = sum(s.get("failed", 0) for s in samples)
+    if failed:
+        findings.append(f"{failed} of {sum(s['events'] for s in samples)} requests failed")
+
+    steady = [s for s in samples if s["elapsed"] >= settings["warmup"] and s["rss_mb"] is not None]
+    if len(steady) < 3:
+        return findings
+    hours = np.array([s["elapsed"] for s in steady]) / 3600
+
+    rss_slope = float(np.polyfit(hours, [s["rss_mb"] for s in steady], 1)[0])
+    rss_growth = rss_slope * (hours[-1] - hours[0])
+    # Short runs turn allocator noise into steep slopes; a leak also has to add up
+    if rss_slope > settings["max_rss_growth_mb_per_hour"] and rss_growth > settings["min_rss_growth_mb"]:
+        findings.append(f"RSS grows {rss_slope:.1f} MB/hour "
+                        f"({steady[0]['rss_mb']:.0f} -> {steady[-1]['rss_mb']:.0f} MB)")
+
+    for key, limit, what in (("open_files", settings["max_fd_growth"], "open file handles"),
+                             ("threads", settings["max_thread_growth"], "threads")):
+        values = [s[key] for s in steady]
+        if values[-1] - values[0] > limit and np.polyfit(hours, values, 1)[0] > 0:
+            findings.append(f"{what} grow from {values[0]} to {values[-1]}")
+
+    p95 = [s["latency_ms"]["p95"] for s in steady if s["latency_ms"]["p95"] is not None]
+    quarter = len(p95) // 4
+    if quarter:
+        first, last = float(np.mean(p95[:quarter])), float(np.mean(p95[-quarter:]))
+        if first > 0 and last / first > settings["max_latency_drift"]:
+            findings.append(f"p95 latency drifts {first:.1f} -> {last:.1f} ms ({last / first:.2f}x)")
+    return findings
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--hours", type=float, default=1.0, help="how long to run")
+    common.add_argument("--interval", type=float, default=SOAK_SETTINGS["sample_interval"], help="seconds between samples")
+    common.add_argument("--warmup", type=float, default=SOAK_SETTINGS["warmup"], help="seconds left out of the trends")
+
+    parser = argparse.ArgumentParser(description="Long-running leak and latency drift test")
+    sub = parser.add_subparsers(dest="workload", required=True)
+
+    from benchmark_live import LIVE_SCRIPTS
+    live = sub.add_parser("live", parents=[common], help="a model script's live loop on a synthetic camera")
+    live.add_argument("--target", default="Pedestrian", choices=list(LIVE_SCRIPTS))
+    live.add_argument("--source", default=None, help="image folder or video file (default: the target's Testing_images folder)")
+    live.add_argument("--fps", type=float, default=30)
+    live.add_argument("--width", type=int, default=1280)
+    live.add_argument("--height", type=int, default=720)
+
+    api = sub.add_parser("api", parents=[common], help="image uploads to a running app.py")
+    api.add_argument("--url", default="http://127.0.0.1:7860")
+    api.add_argument("--model", default="LTV_HTV")
+    api.add_argument("--source", default=str(BASE_DIR / "Testing_images" / "LTV_HTV_Images"), help="image folder or glob to upload")
+    api.add_argument("--rate", type=float, default=0, help="max requests per second (0 = back to back)")
+    api.add_argument("--pid", type=int, default=None, help="server process to watch (default: this process)")
+    args = parser.parse_args()
+
+    if args.workload == "live":
+        workload = live_workload(args.target, args.source, args.fps, args.width, args.height)
+        probe = ProcessProbe()
+    else:
+        workload = api_workload(args.url, args.model, args.source, args.rate)
+        probe = ProcessProbe(args.pid)
+
+    duration = args.hours * 3600
+    print(f"🧪 Soak test ({args.workload}) for {args.hours:g}h, sampling every {args.interval:g}s...", file=sys.stderr)
+    samples = soak(workload, probe, duration, args.interval)
+    findings = analyze(samples, {**SOAK_SETTINGS, "warmup": args.warmup})
+    # Without /proc or psutil the probe reads nothing; a leak could not have been seen
+    measurable = any(s["rss_mb"] is not None for s in samples)
+    summary = {"type": "summary", "workload": args.workload, "samples": len(samples),
+               "elapsed": samples[-1]["elapsed"] if samples else 0, "findings": findings,
+               "passed": (not findings) if measurable else None, "measurable": measurable}
+    print(json.dumps(summary), flush=True)
+    for finding in findings:
+        print(f"❌ {finding}", file=sys.stderr)
+    if findings:
+        return 1
+    if not measurable:
+        print("⚠️  Not measurable: no resource readings for the watched process (install psutil?)", file=sys.stderr)
+        return 2
+    print("✅ No leaks or drift detected", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
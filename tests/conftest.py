@@ -0,0 +1,7 @@
+"""Unit tests for the pure logic behind the servers: python -m pytest tests"""
+
+import sys
+from pathlib import Path
+
+# The modules live at the repository root, next to the model folders
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,51 @@
+"""CPU planning (cpu_budget.py)"""
+
+import json
+
+from cpu_budget import CPU_PLAN_ENV, plan_cpu, plan_env
+
+SETTINGS = {"enabled": True, "reserve_cores": 1, "interop_threads": 1, "opencv_threads": 1, "pin_cores": True}
+FLEET = {"LTV_HTV": (1, 1), "Pedestrian": (1, 1), "TrafficLight": (1, 1),
+         "TrafficSign": (1, 1), "AutopilotPro": (4, 4)}
+
+def test_cores_split_by_weight():
+    plan = plan_cpu(FLEET, SETTINGS, cores=list(range(17)))
+    # 16 usable cores, weights 1+1+1+1+4: 2 each and 8 for the combined model
+    assert [len(plan[key]["cores"]) for key in FLEET] == [2, 2, 2, 2, 8]
+    assert plan["LTV_HTV"]["threads"] == 2
+    assert plan["AutopilotPro"]["threads"] == 2     # 8 cores over 4 concurrent models
+
+def test_pinned_sets_are_disjoint_and_skip_reserved_cores():
+    plan = plan_cpu(FLEET, SETTINGS, cores=list(range(17)))
+    pinned = [core for entry in plan.values() for core in entry["cores"]]
+    assert sorted(pinned) == list(range(1, 17))
+
+def test_remainder_goes_to_the_largest_fractions():
+    plan = plan_cpu({"a": (1, 1), "b": (1, 1), "c": (1, 1)}, SETTINGS, cores=list(range(9)))
+    # 8 usable cores over three equal shares of 2.67
+    assert sorted(len(entry["cores"]) for entry in plan.values()) == [2, 3, 3]
+
+def test_every_process_gets_a_core_when_oversubscribed():
+    plan = plan_cpu(FLEET, SETTINGS, cores=[0, 1, 2])
+    for entry in plan.values():
+        assert entry["threads"] >= 1
+        assert len(entry["cores"]) >= 1
+        assert set(entry["cores"]) <= {1, 2}
+
+def test_single_core_is_not_reserved_away():
+    plan = plan_cpu({"only": (1, 1)}, SETTINGS, cores=[0])
+    assert plan["only"]["cores"] == [0]
+
+def test_no_pinning_unless_enabled():
+    plan = plan_cpu(FLEET, {**SETTINGS, "pin_cores": False}, cores=list(range(17)))
+    assert all(entry["cores"] == [] for entry in plan.values())
+
+def test_opencv_threads_follow_torch_when_unset():
+    plan = plan_cpu({"a": (1, 1)}, {**SETTINGS, "opencv_threads": 0}, cores=list(range(5)))
+    assert plan["a"]["opencv"] == plan["a"]["threads"] == 4
+
+def test_plan_env_carries_the_entry():
+    entry = plan_cpu({"a": (1, 1)}, SETTINGS, cores=list(range(5)))["a"]
+    env = plan_env(entry)
+    assert json.loads(env[CPU_PLAN_ENV]) == entry
+    assert env["OMP_NUM_THREADS"] == env["MKL_NUM_THREADS"] == "4"
@@ -0,0 +1,44 @@
+"""LivePipeline rendering of frames shared through a CaptureHub (live_pipeline.py, live_sessions.py)"""
+
+import numpy as np
+
+from live_pipeline import LivePipeline, draw_detections
+from live_sessions import CaptureHub
+
+class FakeCapture:
+    """A few black frames, then end of stream"""
+
+    def __init__(self, frames: int = 5):
+        self.remaining = frames
+
+    def isOpened(self) -> bool:
+        return True
+
+    def read(self):
+        if self.remaining <= 0:
+            return False, None
+        self.remaining -= 1
+        return True, np.zeros((120, 160, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+DETECTION = {"box": [10, 10, 60, 60], "label": "car", "confidence": 0.9}
+
+def test_hub_frames_are_read_only():
+    reader = CaptureHub(FakeCapture).attach()
+    ok, frame = reader.read()
+    reader.release()
+    assert ok and not frame.flags.writeable
+
+def test_renders_hub_frames_without_touching_the_shared_one():
+    hub = CaptureHub(FakeCapture)
+    pipeline = LivePipeline(hub.attach, lambda frame: [DETECTION], draw_detections,
+                            tracking=False, motion_gate=False)
+    stream = pipeline.run()
+    try:
+        output = next(stream)
+    finally:
+        stream.close()
+    assert output[10, 10].any()             # the box was drawn on the copy
+    assert not hub.frame.any()              # the frame other sessions see is untouched
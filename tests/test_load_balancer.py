@@ -0,0 +1,92 @@
+"""Replica choice, session affinity and retries (load_balancer.py)"""
+
+import json
+
+import httpx
+import pytest
+from starlette.testclient import TestClient
+
+from load_balancer import LoadBalancer, create_app
+
+SETTINGS = {"connect_timeout": 2, "unhealthy_cooldown": 5, "session_ttl": 3600}
+
+@pytest.fixture
+def balancer():
+    return LoadBalancer([7900, 7901, 7902], SETTINGS)
+
+def test_least_outstanding_replica_is_picked(balancer):
+    first, second, third = balancer.upstreams
+    first.outstanding, second.outstanding, third.outstanding = 3, 1, 2
+    assert balancer.pick() is second
+
+def test_ties_go_to_the_replica_with_fewer_requests(balancer):
+    first, second, third = balancer.upstreams
+    first.requests, second.requests, third.requests = 5, 5, 2
+    assert balancer.pick() is third
+
+def test_session_sticks_to_its_replica(balancer):
+    pinned = balancer.pick(["abc123"])
+    pinned.outstanding = 10                 # now the busiest
+    assert balancer.pick(["abc123"]) is pinned
+    assert balancer.pick(["other"]) is not pinned
+
+def test_down_replica_is_skipped_and_session_moves(balancer):
+    pinned = balancer.pick(["abc123"])
+    pinned.mark_down(SETTINGS["unhealthy_cooldown"])
+    moved = balancer.pick(["abc123"])
+    assert moved is not pinned
+    assert balancer.pick(["abc123"]) is moved
+
+def test_all_down_still_picks_one(balancer):
+    for upstream in balancer.upstreams:
+        upstream.mark_down(SETTINGS["unhealthy_cooldown"])
+    assert balancer.pick() in balancer.upstreams
+
+def test_retry_excludes_the_failed_replica(balancer):
+    failed = balancer.pick()
+    assert balancer.pick(exclude=[failed]) is not failed
+    assert balancer.pick(exclude=balancer.upstreams) is None
+
+def test_affinity_keys_from_query_path_and_body(balancer):
+    assert balancer.affinity_keys("/gradio_api/queue/data", {"session_hash": "s1"}) == ["s1"]
+    assert balancer.affinity_keys("/gradio_api/heartbeat/s2", {}) == ["s2"]
+    body = json.dumps({"data": [], "session_hash": "s3"}).encode()
+    assert balancer.affinity_keys("/gradio_api/queue/join", {}, body) == ["s3"]
+    assert balancer.affinity_keys("/gradio_api/queue/join", {}, b"not json") == []
+
+def test_known_event_ids_in_the_path_are_keys(balancer):
+    upstream = balancer.upstreams[1]
+    balancer.pin("evt42", upstream)
+    keys = balancer.affinity_keys("/gradio_api/call/predict/evt42", {})
+    assert keys == ["evt42"]
+    assert balancer.pick(keys) is upstream
+
+def test_idle_sessions_are_forgotten(balancer, monkeypatch):
+    balancer.pick(["old"])
+    clock = balancer._last_prune + SETTINGS["session_ttl"] + 61
+    monkeypatch.setattr("load_balancer.time.monotonic", lambda: clock)
+    balancer.pin("new", balancer.upstreams[0])
+    assert set(balancer.affinity) == {"new"}
+
+def failing_send(error):
+    calls = []
+    async def send(self, request, **kwargs):
+        calls.append(request.url.port)
+        raise error("boom", request=request)
+    return calls, send
+
+def test_connect_errors_are_retried_on_another_replica(balancer, monkeypatch):
+    calls, send = failing_send(httpx.ConnectError)
+    monkeypatch.setattr(httpx.AsyncClient, "send", send)
+    response = TestClient(create_app(balancer)).get("/config")
+    assert response.status_code == 503                  # every replica refused the connection
+    assert sorted(calls) == [7900, 7901, 7902]
+
+def test_request_is_not_replayed_after_it_was_sent(balancer, monkeypatch):
+    calls, send = failing_send(httpx.ReadError)
+    monkeypatch.setattr(httpx.AsyncClient, "send", send)
+    response = TestClient(create_app(balancer)).post("/gradio_api/queue/join", content=b"{}")
+    assert response.status_code == 502
+    assert len(calls) == 1
+    [failed] = [u for u in balancer.upstreams if u.port == calls[0]]
+    assert not failed.available()
@@ -0,0 +1,73 @@
+"""MotionGate and region merging (motion_gate.py)"""
+
+import numpy as np
+
+from motion_gate import MotionGate, boxes_overlap, merge_region_detections
+
+def frame(value=0, size=(480, 640)):
+    return np.full((*size, 3), value, dtype=np.uint8)
+
+def with_patch(base, x1, y1, x2, y2, value=255):
+    patched = base.copy()
+    patched[y1:y2, x1:x2] = value
+    return patched
+
+def test_first_frame_always_runs():
+    assert MotionGate().check(frame()) == (True, None)
+
+def test_unchanged_frames_are_skipped():
+    gate = MotionGate()
+    gate.check(frame())
+    assert gate.check(frame()) == (False, None)
+    assert gate.skipped == 1
+
+def test_change_below_threshold_is_skipped():
+    gate = MotionGate(threshold=0.05)
+    gate.check(frame())
+    # About 1% of the frame changes: under the 5% threshold
+    changed, _ = gate.check(with_patch(frame(), 0, 0, 64, 48))
+    assert not changed
+
+def test_small_pixel_differences_do_not_count():
+    gate = MotionGate(pixel_threshold=25)
+    gate.check(frame(100))
+    assert gate.check(frame(110)) == (False, None)      # e.g. exposure flicker
+    assert gate.check(frame(200))[0]
+
+def test_change_reports_its_region():
+    gate = MotionGate(threshold=0.01, padding=0.0)
+    gate.check(frame())
+    changed, region = gate.check(with_patch(frame(), 320, 240, 480, 360))
+    assert changed
+    x1, y1, x2, y2 = region
+    # Thumbnail resolution and the blur widen the box slightly; it still covers the patch
+    assert x1 <= 320 and y1 <= 240 and x2 >= 480 and y2 >= 360
+    assert (x2 - x1) * (y2 - y1) < 0.25 * 640 * 480
+
+def test_large_change_means_whole_frame():
+    gate = MotionGate(max_region=0.5)
+    gate.check(frame())
+    assert gate.check(frame(255)) == (True, None)
+
+def test_slow_drift_accumulates_against_the_reference():
+    gate = MotionGate(pixel_threshold=25)
+    gate.check(frame(100))
+    assert not gate.check(frame(115))[0]
+    # Each step is small, but the reference stays at 100
+    assert gate.check(frame(130))[0]
+
+def test_inference_is_forced_after_max_skip():
+    gate = MotionGate(max_skip=3)
+    gate.check(frame())
+    assert [gate.check(frame())[0] for _ in range(4)] == [False, False, False, True]
+
+def test_region_detections_replace_stale_ones_inside_the_region():
+    region = (100, 100, 300, 300)
+    previous = [{"box": [150, 150, 200, 200], "label": "old"},     # inside: replaced
+                {"box": [400, 400, 450, 450], "label": "kept"}]
+    fresh = [{"box": [10, 20, 60, 70], "label": "new"}]           # region coordinates
+    merged = merge_region_detections(previous, fresh, region)
+    assert merged == [{"box": [400, 400, 450, 450], "label": "kept"},
+                      {"box": [110, 120, 160, 170], "label": "new"}]
+    assert boxes_overlap([290, 290, 310, 310], region)
+    assert not boxes_overlap([300, 0, 350, 50], region)
@@ -0,0 +1,50 @@
+"""Leak and drift detection (soak_test.analyze)"""
+
+from soak_test import analyze
+
+SETTINGS = {"sample_interval": 10, "warmup": 60, "max_rss_growth_mb_per_hour": 20, "min_rss_growth_mb": 50,
+            "max_fd_growth": 10, "max_thread_growth": 5, "max_latency_drift": 1.5}
+
+def samples(hours=4.0, interval=600, rss=lambda h: 800.0, files=lambda h: 40, threads=lambda h: 20,
+            p95=lambda h: 50.0):
+    """One sample per `interval` seconds, metrics as functions of the elapsed hours"""
+    result = []
+    for elapsed in range(0, int(hours * 3600) + 1, interval):
+        h = elapsed / 3600
+        result.append({"elapsed": elapsed, "rss_mb": rss(h), "open_files": files(h), "threads": threads(h),
+                       "latency_ms": {"p50": None, "p95": p95(h), "p99": None}})
+    return result
+
+def test_flat_run_is_healthy():
+    assert analyze(samples(), SETTINGS) == []
+
+def test_steady_rss_growth_is_a_leak():
+    [finding] = analyze(samples(rss=lambda h: 800 + 30 * h), SETTINGS)
+    assert finding.startswith("RSS grows 30.0 MB/hour")
+
+def test_steep_but_small_growth_is_noise():
+    # 60 MB/hour over 30 minutes adds up to 30 MB, under min_rss_growth_mb
+    assert analyze(samples(hours=0.5, interval=60, rss=lambda h: 800 + 60 * h), SETTINGS) == []
+
+def test_warmup_growth_is_ignored():
+    # Caches fill during the first minute, then memory stays flat
+    rss = lambda h: 500.0 if h == 0 else 900.0
+    assert analyze(samples(rss=rss), SETTINGS) == []
+
+def test_handle_and_thread_growth():
+    findings = analyze(samples(files=lambda h: 40 + int(10 * h), threads=lambda h: 20 + int(3 * h)), SETTINGS)
+    # The first sample falls in the warm-up, so growth is measured from the second (10 minutes in)
+    assert findings == ["open file handles grow from 41 to 80", "threads grow from 20 to 32"]
+
+def test_latency_drift():
+    [finding] = analyze(samples(p95=lambda h: 50 + 25 * h), SETTINGS)
+    assert finding.startswith("p95 latency drifts")
+
+def test_too_few_samples_report_nothing():
+    # Two samples, one of them in the warm-up: no trend can be fitted
+    assert analyze(samples(hours=0.03, interval=60, rss=lambda h: 800 + 1e6 * h), SETTINGS) == []
+
+def test_failed_requests_are_a_finding():
+    run = [{**s, "events": 10, "failed": 0} for s in samples(hours=1)]
+    run[3]["failed"] = 3
+    assert analyze(run, SETTINGS) == ["3 of 70 requests failed"]
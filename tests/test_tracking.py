@@ -0,0 +1,85 @@
+"""IoUTracker and KeyframeScheduler (tracking.py)"""
+
+import pytest
+
+from tracking import IoUTracker, KeyframeScheduler, box_iou
+
+def detection(box, label="car", confidence=0.9, model=None):
+    det = {"box": list(box), "label": label, "confidence": confidence}
+    if model is not None:
+        det["model"] = model
+    return det
+
+def test_box_iou():
+    assert box_iou([0, 0, 10, 10], [0, 0, 10, 10]) == pytest.approx(1.0)
+    assert box_iou([0, 0, 10, 10], [5, 0, 15, 10]) == pytest.approx(50 / 150)
+    assert box_iou([0, 0, 10, 10], [20, 20, 30, 30]) == 0.0
+
+def test_track_ids_stay_stable_while_objects_move():
+    tracker = IoUTracker()
+    first = tracker.update([detection([0, 0, 100, 100]), detection([300, 0, 400, 100])], 0)
+    ids = {det["box"][0]: det["track_id"] for det in first}
+
+    # Both objects moved a little, listed in the opposite order
+    second = tracker.update([detection([310, 0, 410, 100]), detection([10, 0, 110, 100])], 3)
+    assert {det["box"][0]: det["track_id"] for det in second} == {10: ids[0], 310: ids[300]}
+    assert tracker.last_update_changes == 0
+
+def test_label_and_model_must_match():
+    tracker = IoUTracker()
+    [car] = tracker.update([detection([0, 0, 100, 100], model="LTV_HTV")], 0)
+    tracked = tracker.update([detection([0, 0, 100, 100], label="bus", model="LTV_HTV"),
+                              detection([0, 0, 100, 100], model="Pedestrian")], 1)
+    assert car["track_id"] not in {det["track_id"] for det in tracked}
+    assert tracker.last_update_changes == 2
+
+def test_boxes_are_extrapolated_between_keyframes():
+    tracker = IoUTracker()
+    tracker.update([detection([0, 0, 100, 100])], 0)
+    tracker.update([detection([20, 0, 120, 100])], 2)       # 10 px/frame, smoothed to 5
+    [det] = tracker.predict(4)
+    assert det["tracked"] is True
+    assert det["box"] == [30, 0, 130, 100]
+
+def test_lost_tracks_are_hidden_then_dropped():
+    tracker = IoUTracker(max_misses=2)
+    [det] = tracker.update([detection([0, 0, 100, 100])], 0)
+    assert tracker.update([], 1) == []      # missed once: kept, not drawn
+    tracker.update([], 2)
+    assert len(tracker.tracks) == 1
+    tracker.update([], 3)
+    assert tracker.tracks == [] and tracker.last_update_changes == 1
+
+    # Seen again after being dropped: a new identity
+    [again] = tracker.update([detection([0, 0, 100, 100])], 4)
+    assert again["track_id"] != det["track_id"]
+
+def test_fixed_interval_keyframes():
+    scheduler = KeyframeScheduler(interval=3, adaptive=False)
+    assert [scheduler.is_keyframe() for _ in range(7)] == [True, False, False, True, False, False, True]
+
+def test_interval_grows_while_stable_and_halves_on_change():
+    scheduler = KeyframeScheduler(interval=4, min_interval=1, max_interval=6)
+    tracker = IoUTracker()
+    tracker.update([detection([0, 0, 100, 100])], 0)
+    scheduler.adapt(tracker)                # a new track is a change
+    assert scheduler.interval == 2
+
+    tracker.update([detection([0, 0, 100, 100])], 2)
+    for _ in range(10):
+        scheduler.adapt(tracker)            # still, confident, nothing born or lost
+    assert scheduler.interval == 6
+
+def test_low_confidence_or_fast_motion_shortens_the_interval():
+    scheduler = KeyframeScheduler(interval=8, max_interval=8, confidence_floor=0.8, motion_threshold=0.05)
+    tracker = IoUTracker()
+    tracker.update([detection([0, 0, 100, 100], confidence=0.5)], 0)
+    tracker.update([detection([0, 0, 100, 100], confidence=0.5)], 1)
+    scheduler.adapt(tracker)
+    assert scheduler.interval == 4
+
+    tracker = IoUTracker(iou_threshold=0.1)
+    tracker.update([detection([0, 0, 100, 100])], 0)
+    tracker.update([detection([40, 0, 140, 100])], 1)       # 0.2 box widths per frame
+    scheduler.adapt(tracker)
+    assert scheduler.interval == 2
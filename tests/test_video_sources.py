@@ -0,0 +1,27 @@
+"""Source type detection (video_sources.open_reader)"""
+
+import cv2
+import numpy as np
+
+from video_sources import CaptureReader, ImageSequenceReader, open_reader
+
+def write_video(path, frames=3):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for _ in range(frames):
+        writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+    writer.release()
+
+def test_video_with_glob_characters_in_its_name_is_a_video(tmp_path):
+    path = tmp_path / "drive [1].avi"
+    write_video(path)
+    reader = open_reader(str(path))
+    assert isinstance(reader, CaptureReader) and not reader.live
+    reader.release()
+
+def test_folder_and_glob_are_image_sequences(tmp_path):
+    for name in ("b.png", "a.png"):
+        cv2.imwrite(str(tmp_path / name), np.zeros((8, 8, 3), dtype=np.uint8))
+    for source in (str(tmp_path), str(tmp_path / "*.png")):
+        reader = open_reader(source)
+        assert isinstance(reader, ImageSequenceReader)
+        assert [p[-5:] for p in reader.paths] == ["a.png", "b.png"]
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Lightweight Multi-Object Tracker
+=================================================
+Carries detector boxes forward between keyframes so the live overlay keeps moving
+at display rate while YOLO only runs every N frames.
+
+Tracks are matched to detections greedily by IoU (same model + label only) and
+extrapolated between keyframes with a constant-velocity model estimated from the
+last two observations.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+def box_iou(a, b) -> float:
+    """IoU of two [x1, y1, x2, y2] boxes"""
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, ix2 - ix1) * max(0.0, iy2 - iy1)
+    if inter <= 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / float(area_a + area_b - inter)
+
+class Track:
+    """One tracked object: last observed box plus a per-frame velocity"""
+
+    def __init__(self, track_id: int, detection: Dict, frame_index: int):
+        self.track_id = track_id
+        self.label = detection["label"]
+        self.model = detection.get("model")
+        self.confidence = detection["confidence"]
+        self.box = np.array(detection["box"], dtype=np.float32)
+        self.velocity = np.zeros(4, dtype=np.float32)
+        self.last_seen = frame_index
+        self.misses = 0
+        self.hits = 1
+
+    def predicted_box(self, frame_index: int) -> np.ndarray:
+        return self.box + self.velocity * (frame_index - self.last_seen)
+
+    def observe(self, detection: Dict, frame_index: int):
+        new_box = np.array(detection["box"], dtype=np.float32)
+        elapsed = max(frame_index - self.last_seen, 1)
+        # Smooth the velocity so one noisy keyframe doesn't fling the box across the frame
+        self.velocity = 0.5 * self.velocity + 0.5 * (new_box - self.box) / elapsed
+        self.box = new_box
+        self.confidence = detection["confidence"]
+        self.last_seen = frame_index
+        self.misses = 0
+        self.hits += 1
+
+    def motion(self) -> float:
+        """Per-frame center displacement relative to the box size"""
+        size = max(self.box[2] - self.box[0], self.box[3] - self.box[1], 1.0)
+        dx = (self.velocity[0] + self.velocity[2]) / 2
+        dy = (self.velocity[1] + self.velocity[3]) / 2
+        return float(np.hypot(dx, dy) / size)
+
+class IoUTracker:
+    """Greedy IoU tracker with constant-velocity extrapolation"""
+
+    def __init__(self, iou_threshold: float = 0.3, max_misses: int = 2):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.tracks: List[Track] = []
+        self._next_id = 1
+        self.last_update_changes = 0    # tracks born or lost at the last keyframe
+
+    def update(self, detections: List[Dict], frame_index: int) -> List[Dict]:
+        """Feed keyframe detections; returns the current tracks as detection dicts"""
+        candidates = []
+        for ti, track in enumerate(self.tracks):
+            predicted = track.predicted_box(frame_index)
+            for di, det in enumerate(detections):
+                if det["label"] != track.label or det.get("model") != track.model:
+                    continue
+                iou = box_iou(predicted, det["box"])
+                if iou >= self.iou_threshold:
+                    candidates.append((iou, ti, di))
+
+        matched_tracks, matched_dets = set(), set()
+        for iou, ti, di in sorted(candidates, reverse=True):
+            if ti in matched_tracks or di in matched_dets:
+                continue
+            self.tracks[ti].observe(detections[di], frame_index)
+            matched_tracks.add(ti)
+            matched_dets.add(di)
+
+        changes = 0
+        survivors = []
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.misses += 1
+                if track.misses > self.max_misses:
+                    changes += 1
+                    continue
+            survivors.append(track)
+        self.tracks = survivors
+
+        for di, det in enumerate(detections):
+            if di not in matched_dets:
+                self.tracks.append(Track(self._next_id, det, frame_index))
+                self._next_id += 1
+                changes += 1
+        self.last_update_changes = changes
+
+        return self.predict(frame_index)
+
+    def predict(self, frame_index: int) -> List[Dict]:
+        """Extrapolated boxes for every live track at frame_index"""
+        detections = []
+        for track in self.tracks:
+            if track.misses:
+                # Only draw tracks the detector confirmed at the last keyframe
+                continue
+            x1, y1, x2, y2 = track.predicted_box(frame_index)
+            det = {
+                "box": [int(x1), int(y1), int(x2), int(y2)],
+                "label": track.label,
+                "confidence": track.confidence,
+                "track_id": track.track_id,
+                "tracked": frame_index != track.last_seen,
+            }
+            if track.model is not None:
+                det["model"] = track.model
+            detections.append(det)
+        return detections
+
+    def mean_motion(self) -> float:
+        return float(np.mean([t.motion() for t in self.tracks])) if self.tracks else 0.0
+
+    def min_confidence(self) -> Optional[float]:
+        return min((t.confidence for t in self.tracks), default=None)
+
+class KeyframeScheduler:
+    """Decides which frames get full detector inference.
+
+    With adaptive=False every `interval`-th frame is a keyframe. With adaptive=True the
+    interval shrinks towards min_interval when objects move fast, appear/disappear or
+    have low confidence, and grows towards max_interval while the scene is stable.
+    """
+
+    def __init__(self, interval: int = 3, adaptive: bool = True, min_interval: int = 1,
+                 max_interval: int = 10, motion_threshold: float = 0.05, confidence_floor: float = 0.8):
+        self.interval = max(1, interval)
+        self.adaptive = adaptive
+        self.min_interval = max(1, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.motion_threshold = motion_threshold
+        self.confidence_floor = confidence_floor
+        self._since_keyframe = None
+
+    def is_keyframe(self) -> bool:
+        if self._since_keyframe is None or self._since_keyframe + 1 >= self.interval:
+            self._since_keyframe = 0
+            return True
+        self._since_keyframe += 1
+        return False
+
+    def adapt(self, tracker: IoUTracker):
+        if not self.adaptive:
+            return
+        min_conf = tracker.min_confidence()
+        unstable = (
+            tracker.last_update_changes > 0
+            or tracker.mean_motion() > self.motion_threshold
+            or (min_conf is not None and min_conf < self.confidence_floor)
+        )
+        if unstable:
+            self.interval = max(self.min_interval, self.interval // 2)
+        else:
+            self.interval = min(self.max_interval, self.interval + 1)
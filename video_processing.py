@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Offline Video Processing
+=========================================
+Runs the detectors over a recorded (dash-cam) video file and writes:
+
+    annotated.mp4       every frame with the detections drawn on it
+    detections.jsonl    one line per frame: {"frame", "timestamp", "detections": {model: [...]}}
+
+Frames are decoded on a background thread (video_sources.py), pushed through each
+model in batches of VIDEO_SETTINGS["batch_size"] and written out immediately, so
+memory use stays flat no matter how long the video is.
+
+Used by the "Video Processing" tab in app.py, and from the command line:
+
+    python video_processing.py drive.mp4 --models LTV_HTV Pedestrian --conf 0.4 --output results/
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import cv2
+
+from config import MODEL_FILES, PERFORMANCE, TRAFFIC_SIGN_TRANSLATIONS, VIDEO_SETTINGS
+from inference_api import detect_batch
+from video_sources import open_video_source
+
+# Overlay colors per model (BGR, same hues as the combined view in app.py)
+VIDEO_COLORS = {
+    "LTV_HTV": (0, 255, 0),
+    "Pedestrian": (0, 0, 255),
+    "TrafficLight": (255, 165, 0),
+    "TrafficSign": (255, 0, 255)
+}
+
+def load_models(names: Optional[List[str]] = None) -> Dict:
+    """Load the requested models (default: all) from MODEL_FILES"""
+    from ultralytics import YOLO
+
+    base_dir = Path(__file__).parent
+    models = {}
+    for name in names or list(MODEL_FILES):
+        if name not in MODEL_FILES:
+            raise ValueError(f"Unknown model '{name}' (choose from {', '.join(MODEL_FILES)})")
+        path = base_dir / MODEL_FILES[name]
+        if not path.exists():
+            raise FileNotFoundError(f"{name} model not found at {path}")
+        models[name] = YOLO(str(path))
+        print(f"✅ {name} model loaded")
+    return models
+
+def draw_frame_detections(frame, frame_detections: Dict[str, List[Dict]], colors: Dict[str, tuple]):
+    """Draw every model's detections onto a BGR frame in place"""
+    for model_name, detections in frame_detections.items():
+        color = colors.get(model_name, (0, 255, 0))
+        for det in detections:
+            x1, y1, x2, y2 = det["box"]
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 3)
+            cv2.putText(frame, f"{det['label']} {det['confidence']:.2f}", (x1, y1 - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2, cv2.LINE_AA)
+    return frame
+
+def process_video(video_path, models: Dict, output_dir,
+                  confidence_threshold: float = PERFORMANCE["static_confidence_threshold"],
+                  locks: Optional[Dict[str, threading.Lock]] = None,
+                  colors: Dict[str, tuple] = VIDEO_COLORS,
+                  batch_size: int = VIDEO_SETTINGS["batch_size"]) -> Iterator[Dict]:
+    """Stream a video through the given models.
+
+    Yields a progress dict at most every VIDEO_SETTINGS["progress_interval"] seconds and
+    a final one with "done": True and the output paths. Keys: frames, total_frames,
+    detections, elapsed, fps.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Native size, no pacing or looping: decode every frame as fast as inference consumes it
+    source = open_video_source(str(video_path), width=0, height=0, max_fps=0, loop=False,
+                               realtime=False, buffer_size=batch_size * 2)
+    if not source.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+
+    fps = source.get(cv2.CAP_PROP_FPS) or 30.0
+    total_frames = int(source.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+    video_out = output_dir / "annotated.mp4"
+    log_path = output_dir / "detections.jsonl"
+    writer = None
+
+    frames_done = 0
+    total_detections = 0
+    start_time = time.perf_counter()
+    last_report = start_time
+
+    def progress(done: bool = False) -> Dict:
+        elapsed = max(time.perf_counter() - start_time, 1e-6)
+        report = {"frames": frames_done, "total_frames": total_frames, "detections": total_detections,
+                  "elapsed": elapsed, "fps": frames_done / elapsed, "done": done}
+        if done:
+            report.update(video=str(video_out), log=str(log_path))
+        return report
+
+    try:
+        with open(log_path, "w", encoding="utf-8") as log:
+            finished = False
+            while not finished:
+                # Only one batch of decoded frames is held in memory at a time
+                batch = []
+                while len(batch) < batch_size:
+                    ret, frame = source.read()
+                    if not ret:
+                        finished = True
+                        break
+                    batch.append(frame)
+                if not batch:
+                    break
+
+                per_frame = [dict() for _ in batch]
+                for model_name, model in models.items():
+                    translate = (lambda label: TRAFFIC_SIGN_TRANSLATIONS.get(label, label)) if model_name == "TrafficSign" else None
+                    with locks[model_name] if locks else nullcontext():
+                        results = detect_batch(model, batch, confidence_threshold,
+                                               translate=translate, batch_size=batch_size)
+                    for frame_detections, detections in zip(per_frame, results):
+                        frame_detections[model_name] = detections
+
+                for frame, frame_detections in zip(batch, per_frame):
+                    if writer is None:
+                        height, width = frame.shape[:2]
+                        writer = cv2.VideoWriter(str(video_out), cv2.VideoWriter_fourcc(*VIDEO_SETTINGS["codec"]),
+                                                 fps, (width, height))
+                    writer.write(draw_frame_detections(frame, frame_detections, colors))
+                    log.write(json.dumps({
+                        "frame": frames_done,
+                        "timestamp": round(frames_done / fps, 3),
+                        "detections": frame_detections
+                    }) + "\n")
+                    total_detections += sum(len(d) for d in frame_detections.values())
+                    frames_done += 1
+
+                now = time.perf_counter()
+                if now - last_report >= VIDEO_SETTINGS["progress_interval"]:
+                    last_report = now
+                    yield progress()
+    finally:
+        source.release()
+        if writer is not None:
+            writer.release()
+
+    yield progress(done=True)
+
+def format_progress(report: Dict) -> str:
+    """Human readable one-liner for a progress dict"""
+    if report["total_frames"]:
+        percent = min(report["frames"] / report["total_frames"], 1.0)
+        position = f"{report['frames']}/{report['total_frames']} frames ({percent:.0%})"
+    else:
+        position = f"{report['frames']} frames"
+    return f"{position} | {report['fps']:.1f} FPS processed | {report['detections']} detections"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Autopilot Pro detectors over a video file")
+    parser.add_argument("video", help="input video file")
+    parser.add_argument("--models", nargs="+", default=list(MODEL_FILES), choices=list(MODEL_FILES),
+                        help="models to run (default: all)")
+    parser.add_argument("--conf", type=float, default=PERFORMANCE["static_confidence_threshold"],
+                        help="confidence threshold")
+    parser.add_argument("--output", default=None, help="output folder (default: <video name>_detections)")
+    parser.add_argument("--batch-size", type=int, default=VIDEO_SETTINGS["batch_size"])
+    args = parser.parse_args()
+
+    video_path = Path(args.video)
+    output_dir = Path(args.output) if args.output else video_path.with_name(f"{video_path.stem}_detections")
+    models = load_models(args.models)
+
+    print(f"🎬 Processing {video_path} with {', '.join(models)}...")
+    try:
+        for report in process_video(video_path, models, output_dir, args.conf, batch_size=args.batch_size):
+            print(f"\r⏳ {format_progress(report)}", end="", flush=True)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        return 1
+
+    print(f"\n✅ Done in {report['elapsed']:.1f}s")
+    print(f"🎞️  Annotated video: {report['video']}")
+    print(f"📝 Detection log:   {report['log']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
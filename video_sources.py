@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Autopilot Pro - Video Sources
+==============================
+One VideoCapture-compatible interface for everything the live pipeline can watch:
+
+    0, "1"                          local webcam index
+    "drive.mp4"                     video file (replayed at its native speed)
+    "Testing_images/LTV_HTV_Images" folder of images, played as a sequence
+    "Testing_images/*/*.jpg"        glob of images
+    "http://...", "rtsp://..."      network stream
+    "shared"                        the shared camera daemon ring (camera_daemon.py)
+
+Frames are decoded on a background thread into a small bounded buffer. Live sources
+(cameras, streams) drop the oldest buffered frame when the consumer falls behind;
+recorded sources (files, image folders) are paced to real time and never dropped.
+
+A local MJPEG test server is included so network-stream handling can be exercised
+without a real IP camera:
+
+    python video_sources.py serve --source Testing_images/LTV_HTV_Images --port 8090
+    # then use "http://127.0.0.1:8090/stream.mjpg" as a source
+"""
+
+import argparse
+import glob
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional, Union
+
+import cv2
+import numpy as np
+
+from config import VIDEO_SOURCE_SETTINGS
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+NETWORK_PREFIXES = ("http://", "https://", "rtsp://", "rtmp://", "udp://", "tcp://")
+
+# ============================================================================
+# FRAME READERS (synchronous, one per source type)
+# ============================================================================
+
+class CaptureReader:
+    """Wraps cv2.VideoCapture for cameras, files and network streams"""
+
+    def __init__(self, source: Union[int, str], live: bool):
+        self.source = source
+        self.live = live
+        self.cap = cv2.VideoCapture(source)
+        if live:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def is_opened(self) -> bool:
+        return self.cap.isOpened()
+
+    def native_fps(self) -> float:
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        return fps if fps and fps > 0 else 0.0
+
+    def read(self):
+        return self.cap.read()
+
+    def rewind(self) -> bool:
+        return self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def set(self, prop, value) -> bool:
+        return self.cap.set(prop, value)
+
+    def get(self, prop) -> float:
+        return self.cap.get(prop)
+
+    def release(self):
+        self.cap.release()
+
+class ImageSequenceReader:
+    """Plays a folder or glob of still images as a video"""
+
+    live = False
+
+    def __init__(self, paths: List[str], fps: float):
+        self.paths = paths
+        self.fps = fps
+        self.index = 0
+
+    def is_opened(self) -> bool:
+        return bool(self.paths)
+
+    def native_fps(self) -> float:
+        return self.fps
+
+    def read(self):
+        while self.index < len(self.paths):
+            frame = cv2.imread(self.paths[self.index])
+            self.index += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def rewind(self) -> bool:
+        self.index = 0
+        return True
+
+    def set(self, prop, value) -> bool:
+        return False
+
+    def get(self, prop) -> float:
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.paths))
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        return 0.0
+
+    def release(self):
+        self.paths = []
+
+class SyntheticCamera:
+    """Plays a recorded reader like a camera: it loops forever and is treated as live, so
+    VideoSource delivers it at a fixed rate and drops the frames the consumer misses"""
+
+    live = True
+
+    def __init__(self, reader, fps: float):
+        self.reader = reader
+        self.fps = fps
+
+    def is_opened(self) -> bool:
+        return self.reader.is_opened()
+
+    def native_fps(self) -> float:
+        return self.fps
+
+    def read(self):
+        ret, frame = self.reader.read()
+        if not ret and self.reader.rewind():
+            ret, frame = self.reader.read()
+        return ret, frame
+
+    def rewind(self) -> bool:
+        return False
+
+    def set(self, prop, value) -> bool:
+        return False
+
+    def get(self, prop) -> float:
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        return self.reader.get(prop)
+
+    def release(self):
+        self.reader.release()
+
+def list_images(spec: str) -> List[str]:
+    """Image files in a folder (non-recursive) or matching a glob, in name order"""
+    if os.path.isdir(spec):
+        candidates = [str(p) for p in Path(spec).iterdir()]
+    else:
+        candidates = glob.glob(spec)
+    return sorted(p for p in candidates if Path(p).suffix.lower() in IMAGE_EXTENSIONS)
+
+# ============================================================================
+# THREADED SOURCE
+# ============================================================================
+
+class VideoSource:
+    """Background-decoded, VideoCapture-compatible frame source.
+
+    width/height: resize every frame (None keeps the native size)
+    max_fps:      cap on delivered frames per second (0 = no cap)
+    loop:         restart recorded sources when they end
+    realtime:     pace recorded sources at their native FPS instead of as fast as possible
+    buffer_size:  decoded frames kept ahead of the consumer
+    """
+
+    def __init__(self, reader, width: Optional[int] = None, height: Optional[int] = None,
+                 max_fps: float = 0, loop: bool = False, realtime: bool = True, buffer_size: int = 4):
+        self.reader = reader
+        self.width, self.height = width, height
+        self.loop = loop
+        self.buffer = queue.Queue(maxsize=max(1, buffer_size))
+        self.frames_decoded = 0
+        self.frames_dropped = 0
+
+        native = reader.native_fps()
+        interval = 1.0 / native if realtime and native and not reader.live else 0.0
+        if max_fps:
+            interval = max(interval, 1.0 / max_fps)
+        self.frame_interval = interval
+
+        self._stop = threading.Event()
+        self._ended = threading.Event()
+        self._thread = None
+        if reader.is_opened():
+            if reader.live and width and height:
+                # Ask the device for the target size so it doesn't decode more pixels than needed
+                reader.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                reader.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            self._thread = threading.Thread(target=self._decode_loop, name="video-source", daemon=True)
+            self._thread.start()
+
+    def _decode_loop(self):
+        next_due = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                ret, frame = self.reader.read()
+                if not ret:
+                    if self.loop and not self.reader.live and self.reader.rewind():
+                        continue
+                    break
+                if self.width and self.height and (frame.shape[1] != self.width or frame.shape[0] != self.height):
+                    frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+                self.frames_decoded += 1
+
+                if self.frame_interval:
+                    delay = next_due - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_due = max(next_due + self.frame_interval, time.monotonic() - self.frame_interval)
+
+                if self.reader.live:
+                    # Live sources: never block the device, keep only the freshest frames
+                    while True:
+                        try:
+                            self.buffer.put_nowait(frame)
+                            break
+                        except queue.Full:
+                            try:
+                                self.buffer.get_nowait()
+                                self.frames_dropped += 1
+                            except queue.Empty:
+                                pass
+                else:
+                    # Recorded sources: back-pressure instead of dropping
+                    while not self._stop.is_set():
+                        try:
+                            self.buffer.put(frame, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+        finally:
+            self._ended.set()
+
+    def isOpened(self) -> bool:
+        return self._thread is not None
+
+    def read(self):
+        while True:
+            try:
+                return True, self.buffer.get(timeout=0.1)
+            except queue.Empty:
+                if self._ended.is_set() and self.buffer.empty():
+                    return False, None
+
+    def set(self, prop, value) -> bool:
+        return False    # size/FPS are fixed at construction
+
+    def get(self, prop) -> float:
+        if prop == cv2.CAP_PROP_FRAME_WIDTH and self.width:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT and self.height:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS and self.frame_interval:
+            return 1.0 / self.frame_interval
+        return self.reader.get(prop)
+
+    def release(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self.reader.release()
+
+def open_video_source(source=None, width: Optional[int] = None, height: Optional[int] = None,
+                      max_fps: Optional[float] = None, loop: Optional[bool] = None,
+                      realtime: bool = True, buffer_size: Optional[int] = None):
+    """Open any supported source; unset options fall back to VIDEO_SOURCE_SETTINGS"""
+    settings = VIDEO_SOURCE_SETTINGS
+    source = settings["source"] if source is None else source
+    width = settings["width"] if width is None else width
+    height = settings["height"] if height is None else height
+    max_fps = settings["max_fps"] if max_fps is None else max_fps
+    loop = settings["loop"] if loop is None else loop
+    buffer_size = settings["buffer_size"] if buffer_size is None else buffer_size
+
+    if source == "shared":
+        from camera_daemon import open_shared_camera
+        return open_shared_camera()
+
+    return VideoSource(open_reader(source), width, height, max_fps, loop, realtime, buffer_size)
+
+def open_reader(source):
+    """Frame reader for a camera index, stream URL, image folder/glob or video file"""
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    if isinstance(source, int):
+        return CaptureReader(source, live=True)
+    if source.lower().startswith(NETWORK_PREFIXES):
+        return CaptureReader(source, live=True)
+    # An existing file is a video even if its name has glob characters (e.g. "drive [1].mp4")
+    if os.path.isdir(source) or (not os.path.isfile(source) and any(ch in source for ch in "*?[")):
+        return ImageSequenceReader(list_images(source), VIDEO_SOURCE_SETTINGS["image_sequence_fps"])
+    return CaptureReader(source, live=False)
+
+def open_synthetic_camera(source, fps: float, width: Optional[int] = None, height: Optional[int] = None):
+    """A video file or image folder played as a fixed-rate camera (for benchmarks without a device).
+
+    Like a real driver it holds a single frame: when the consumer is slower than `fps`,
+    frames are dropped (counted in frames_dropped) rather than queued.
+    """
+    return VideoSource(SyntheticCamera(open_reader(source), fps), width, height, max_fps=fps, buffer_size=1)
+
+# ============================================================================
+# LOCAL MJPEG TEST SERVER
+# ============================================================================
+
+def serve_mjpeg(source, port: int = 8090, fps: float = 15, quality: int = 80):
+    """Serve any source as multipart MJPEG at http://127.0.0.1:<port>/stream.mjpg (looping)"""
+
+    class StreamHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/stream.mjpg":
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+
+            stream = open_video_source(source, max_fps=fps, loop=True)
+            try:
+                while True:
+                    ret, frame = stream.read()
+                    if not ret:
+                        break
+                    ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+                    if not ok:
+                        continue
+                    self.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\n")
+                    self.wfile.write(f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                    self.wfile.write(jpeg.tobytes())
+                    self.wfile.write(b"\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                stream.release()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StreamHandler)
+    print(f"📡 Serving {source!r} as MJPEG at http://127.0.0.1:{port}/stream.mjpg (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Autopilot Pro video source tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="serve a source as a local MJPEG network stream")
+    serve.add_argument("--source", default="Testing_images/LTV_HTV_Images")
+    serve.add_argument("--port", type=int, default=8090)
+    serve.add_argument("--fps", type=float, default=15)
+
+    probe = sub.add_parser("probe", help="read a source for a few seconds and report the delivered FPS")
+    probe.add_argument("source")
+    probe.add_argument("--seconds", type=float, default=5)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve_mjpeg(args.source, args.port, args.fps)
+    else:
+        stream = open_video_source(args.source)
+        if not stream.isOpened():
+            print(f"❌ Could not open source {args.source!r}")
+            return 1
+        frames, start = 0, time.monotonic()
+        while time.monotonic() - start < args.seconds:
+            ret, frame = stream.read()
+            if not ret:
+                break
+            frames += 1
+        elapsed = time.monotonic() - start
+        stream.release()
+        print(f"✅ {frames} frames in {elapsed:.1f}s ({frames / elapsed:.1f} FPS), last frame {np.shape(frame)}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())